@@ -4,7 +4,11 @@
 
 
 import argparse
+import random
 from src.bot import Bot
+from src.console import ConsoleRenderer
+from src.decks import DEFAULT_DECK, deck_names
+from src.events import EventSink
 from src.human import Human
 from src.monte_carlo_search_tree import MonteCarloSearchTreeBot
 from src.game import Game
@@ -21,18 +25,100 @@ def create_parser():
 		type=int,
 		help="list of 2 players - defaults 1 2 - 0: plays randomly, 1: mcst, 2: Human"
 	)
+	parser.add_argument(
+		"--decks",
+		default=[DEFAULT_DECK, DEFAULT_DECK],
+		nargs=2,
+		choices=deck_names(),
+		help="the decklist each of the 2 players plays, from src/decks - defaults {0} {0}".format(DEFAULT_DECK)
+	)
 	parser.add_argument(
 		"--starting_hit_points",
 		default=20,
 		type=int,
 		help="the amount of hp each player starts with"
 	)
+	parser.add_argument(
+		"--workers",
+		default=1,
+		type=int,
+		help="the number of processes each mcst bot searches in - defaults 1"
+	)
+	parser.add_argument(
+		"--parallelism",
+		default='root',
+		choices=['root', 'tree'],
+		help="with --workers, root: each process grows its own tree, tree: they grow one shared tree - defaults root"
+	)
+	parser.add_argument(
+		"--max_nodes",
+		default=1 << 18,
+		type=int,
+		help="the most nodes an mcst bot's search tree holds, past which its stalest, least visited subtrees are cut off - defaults 262144"
+	)
+	parser.add_argument(
+		"--cache_size",
+		default=100000,
+		type=int,
+		help="the most states whose legal moves each bot caches, which only --list_rollout_moves uses - defaults 100000"
+	)
+	parser.add_argument(
+		"--list_rollout_moves",
+		action="store_true",
+		help="make mcst rollouts pick from every legal move, cached per state, instead of sampling a RolloutPolicy"
+	)
+	parser.add_argument(
+		"--check_collisions",
+		action="store_true",
+		help="keep the state behind each of the last --cache_size fingerprints the legal moves caches see, and stop if two states share one"
+	)
+	parser.add_argument(
+		"--show_simulation_results",
+		action="store_true",
+		help="print the hit rate, evictions and size of each legal moves cache, and each move's stats, after each mcst search"
+	)
+	parser.add_argument(
+		"--max_playouts",
+		default=None,
+		type=int,
+		help="the playouts each mcst search runs, instead of searching for 2 seconds"
+	)
+	parser.add_argument(
+		"--seed",
+		default=None,
+		type=int,
+		help="the seed for shuffling the decks and for the mcst bots' searches"
+	)
+	parser.add_argument(
+		"--rollout_horizon",
+		default=None,
+		type=int,
+		help="the moves each mcst rollout makes before it is cut short and scored by a static evaluator"
+	)
+	parser.add_argument(
+		"--rave_k",
+		default=None,
+		type=int,
+		help="the visits to a move its RAVE stats are worth in the mcst search, which keeps none by default - not with --parallelism tree"
+	)
+	parser.add_argument(
+		"--widening_k",
+		default=None,
+		type=int,
+		help="the moves the mcst search tries first at each node, more as it visits it, instead of all of them - not with --parallelism tree"
+	)
+	parser.add_argument(
+		"--information_sets",
+		action="store_true",
+		help="make the mcst search deal the opponent's hand and the decks at random, instead of looking at them - not with --parallelism tree"
+	)
 	return parser
 
 
 def main():
 	"""Play two bots and print the results."""
-	args = create_parser().parse_args()
+	parser = create_parser()
+	args = parser.parse_args()
 	bots_types = [
 		'Bot',
 		'MonteCarloSearchTreeBot',
@@ -44,20 +130,39 @@ def main():
 		'Human': 'You'
 	}
 
+	if args.seed is not None:
+		random.seed(args.seed)
+
 	game_state = Game.new_game_state()
-	game_state = Game.set_print_moves(game_state, True)
+	game_state = Game.set_event_sink(game_state, EventSink(ConsoleRenderer()))
 
-	statcache = StatCache()
+	statcache = StatCache(check_collisions=args.check_collisions, max_cached_states=args.cache_size)
 	statcache.past_states.append(game_state)
 
-	for pid in args.players:
-		bot = eval("{}".format(bots_types[pid]))()
+	for pid, deck in zip(args.players, args.decks):
+		if bots_types[pid] == 'MonteCarloSearchTreeBot':
+			try:
+				bot = MonteCarloSearchTreeBot(
+					workers=args.workers, parallelism=args.parallelism, max_nodes=args.max_nodes,
+					max_playouts=args.max_playouts, seed=args.seed,
+					rollout_horizon=args.rollout_horizon, rave_k=args.rave_k,
+					widening_k=args.widening_k, information_sets=args.information_sets,
+					fast_rollouts=not args.list_rollout_moves, show_simulation_results=args.show_simulation_results)
+			except ValueError as error:
+				parser.error(error)
+		else:
+			bot = eval("{}".format(bots_types[pid]))()
 		statcache.bots.append(bot)
 
-		player_state = Game.new_player_state_object(hit_points=args.starting_hit_points, bot_type=bot_names[bots_types[pid]])		
+		player_state = Game.new_player_state_object(hit_points=args.starting_hit_points, bot_type=bot_names[bots_types[pid]], deck=deck)
 		game_state = Game.add_player(game_state, player_state)
 
-	Game.play_out(game_state, statcache)
+	try:
+		Game.play_out(game_state, statcache)
+	finally:
+		for bot in statcache.bots:
+			if isinstance(bot, MonteCarloSearchTreeBot):
+				bot.close()
 
 
 if __name__ == "__main__":
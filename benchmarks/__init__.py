@@ -0,0 +1 @@
+"""Benchmarks and experiments for the game engine and the search, run as python -m benchmarks.suite."""
@@ -0,0 +1,727 @@
+"""Time the rules engine and the search, write the times as JSON, and compare them with a baseline.
+
+Micro benchmarks time Game.legal_plays, Game.apply_move, Game.tap_lands_for_mana, Game.resolve_combat,
+
+decarded_state and the StaticEvaluator on recorded positions, each the state a seeded random game reaches
+
+after some moves. Macro benchmarks time random playouts of whole games, also with fingerprints kept up to date
+
+by copying GameStates and on a SimulationBoard, and MonteCarloSearchTreeBot decisions
+
+with fixed playout budgets, with full rollouts and with rollouts cut short at MCTS_HORIZON moves.
+
+Every benchmark is run --runs times, and its result is the median. With --baseline, a benchmark is flagged
+
+when even its fastest run is more than --threshold worse than the baseline's slowest, so a change has to
+
+stand out from the host's run to run noise, and the exit status is 1 if any are.
+
+The experiments compare ways of doing the same thing, such as search settings or parallel modes, and print
+
+what they find instead of recording it. Each is a subcommand, and they share the positions and timing helpers
+
+of the suite. Run python -m benchmarks.suite -h for the list.
+
+Usage: python -m benchmarks.suite [--runs 3] [--output results.json] [--baseline baseline.json] [--threshold 0.2]
+
+       python -m benchmarks.suite <experiment> [arguments]
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import sys
+import time
+import timeit
+from collections import OrderedDict
+from statistics import median
+from src.card import (
+	BurningTreeEmissary, Card, Creature, CreatureEnchantment, Fireball, HungerOfTheHowlpack,
+	Land, NestInvader, SkarrganPitSkulk, VinesOfVastwood, card_kind_ids, kind_card_types, play_behaviors,
+)
+from src.decks import decklists
+from src.evaluation import StaticEvaluator
+from src.game import Game
+from src.game_state import SimulationBoard
+from src.monte_carlo_search_tree import MonteCarloSearchTreeBot
+from src.rollout_policy import RolloutPolicy
+from src.statcache import StatCache
+from src.utils import decarded_state
+
+# the seed of the random game each position is from, and how many moves into it it is
+RECORDED_POSITIONS = OrderedDict([
+	('early', (1, 12)),
+	('midgame', (3, 60)),
+	('cluttered', (6, 565)),
+	('combat', (2, 402)),
+])
+
+# how many Mountains the big Fireball position adds to the cluttered one
+FIREBALL_MOUNTAINS = 10
+
+# the playouts each MonteCarloSearchTreeBot decision is timed with
+MCTS_BUDGETS = (50, 200)
+
+# the rollout_horizon of the decisions timed with rollouts cut short and scored by a StaticEvaluator
+MCTS_HORIZON = 20
+
+# the playout budgets the rave experiment searches with
+RAVE_BUDGETS = (25, 50, 100, 200)
+
+
+def new_random_game():
+	"""Return a new game between two random bots."""
+	state = Game.new_game_state()
+	for player in range(2):
+		state = Game.add_player(state, Game.new_player_state_object(hit_points=20, bot_type='random'))
+	return state
+
+
+def random_move(state):
+	"""Return a random legal move in state, picked from them sorted, so the games don't depend on PYTHONHASHSEED."""
+	return random.choice(sorted(Game.legal_plays(state), key=repr))
+
+
+def midgame_state(seed=3, moves=60):
+	"""Return the state after two players make moves random moves from a new game."""
+	random.seed(seed)
+	state = new_random_game()
+	for move in range(moves):
+		state = Game.apply_move(state, random_move(state))
+	return state
+
+
+def widest_states(games=10, count=5, min_deck=0):
+	"""Return the count states with the most legal moves, from games random games, with min_deck cards left in each deck."""
+	states = []
+	for seed in range(games):
+		random.seed(seed)
+		state = new_random_game()
+		while not Game.game_is_over(state):
+			legal = Game.legal_plays(state)
+			if all(not Game.deck_shuffled(player_state) or Game.library_size(player_state) >= min_deck for player_state in Game.get_player_states(state)):
+				states.append((len(legal), seed, len(states), state))
+			state = Game.apply_move(state, random_move(state))
+	return [state for moves, seed, index, state in sorted(states, reverse=True)[:count]]
+
+
+def best_time(function, repeat=5):
+	"""
+		Return the fastest of repeat runs of function, in microseconds per call, each run calling it
+
+		as many times as take at least 0.2 seconds, so the timer and the host's noise matter less.
+	"""
+	timer = timeit.Timer(function)
+	number, _ = timer.autorange()
+	return min(timer.repeat(number=number, repeat=repeat)) / number * 1e6
+
+
+def time_rollouts(bot, states, rollouts):
+	"""Return the seconds and moves it takes bot to play rollouts random games from each of states."""
+	random.seed(0)
+	statcache = StatCache()
+	seconds = 0
+	moves = 0
+	for state in states:
+		stats = statcache.bot_stats(Game.player_with_priority(state))
+		for rollout in range(rollouts):
+			board = SimulationBoard(state)
+			winner = Game.winner(board)
+			begin = time.perf_counter()
+			# one move at a time, to count them
+			for made in range(bot.max_moves):
+				if winner != -1:
+					break
+				bot.rollout(board, winner, bot.max_moves - 1, stats)
+				winner = Game.winner(board)
+				moves += 1
+			seconds += time.perf_counter() - begin
+	return seconds, moves
+
+
+def search(state, seconds, seed=1, **settings):
+	"""Return the root Node of a search from state for seconds with seed, and its playouts per second."""
+	random.seed(seed)
+	bot = MonteCarloSearchTreeBot(simulation_time=seconds, seed=seed, **settings)
+	root = bot.new_node(state, bot.legal_plays(state))
+	begin = time.perf_counter()
+	games = bot.run_search(root, state, StatCache())
+	return root, games / (time.perf_counter() - begin)
+
+
+def agreement(reference, root):
+	"""
+		Return whether root's best move is the best move of reference, a longer search from the same state,
+
+		and the regret: how much lower the win rate of root's best move is than the best one's, by reference.
+	"""
+	chosen = reference.moves.index(root.best_move())
+	best = reference.moves.index(reference.best_move())
+	return chosen == best, reference.win_rate(best) - reference.win_rate(chosen)
+
+
+def worker_counts():
+	"""Return 1, 2, 4 ... up to and including the number of CPUs."""
+	counts = [1]
+	while counts[-1] * 2 < multiprocessing.cpu_count():
+		counts.append(counts[-1] * 2)
+	if counts[-1] != multiprocessing.cpu_count():
+		counts.append(multiprocessing.cpu_count())
+	return counts
+
+
+def parallel_search(bot, state, parallelism='root'):
+	"""
+		Return the root Node, playouts and nodes of bot's second parallel search of state, with parallelism
+
+		root or tree, since the first starts the pool, and close the pool.
+	"""
+	legal = Game.legal_plays(state)
+	search = bot.run_tree_parallel_search if parallelism == 'tree' else bot.run_root_parallel_search
+	try:
+		search(state, legal)
+		return search(state, legal)
+	finally:
+		bot.close()
+
+
+def add_card(state, kind, owner, zone):
+	"""Return state with a new card of kind owned by owner in zone, 'hand' or 'lands'."""
+	card_id = Game.get_new_card_id(state)
+	state = Game.increment_new_card_id(state)
+	if zone == 'hand':
+		return Game.add_card_to_hand(state, Game.drawn_card_state(kind, owner, card_id))
+	return Game.add_land(state, Card.get_tuple(kind, owner, card_id, -1))
+
+
+def big_fireball_state(state):
+	"""
+		Return state with its acting player given a Fireball and FIREBALL_MOUNTAINS Mountains, and
+
+		casting the Fireball, so the legal moves are its every amount.
+	"""
+	player = Game.player_with_priority(state)
+	state = add_card(state, card_kind_ids['Fireball'], player, 'hand')
+	for mountain in range(FIREBALL_MOUNTAINS):
+		state = add_card(state, card_kind_ids['Mountain'], player, 'lands')
+	cast = [move for move in Game.legal_plays(state) if move[0] == 'card-cast-Fireball']
+	return Game.apply_move(state, cast[0])
+
+
+def positions():
+	"""Return a dict from the name of each recorded position, and the big Fireball one, to its state."""
+	states = OrderedDict(
+		(name, midgame_state(seed=seed, moves=moves)) for name, (seed, moves) in RECORDED_POSITIONS.items())
+	states['big_fireball'] = big_fireball_state(states['cluttered'])
+	return states
+
+
+def costliest_mana(state):
+	"""Return the most mana any legal move in state pays, or None if none pay any."""
+	costs = [
+		move[2] for move in Game.legal_plays(state)
+		if move[0].startswith(('card', 'ability', 'land_ability')) and not move[0].startswith('card-cast') and move[2]
+	]
+	if not costs:
+		return None
+	return max(sorted(costs, key=repr), key=lambda mana: len(mana[0]) + (mana[1] or 0))
+
+
+def micro_benchmarks(states):
+	"""Yield the name and microseconds per call of each micro benchmark, over states."""
+	evaluator = StaticEvaluator()
+	for name, state in states.items():
+		legal = sorted(Game.legal_plays(state), key=repr)
+		yield 'legal_plays/' + name, best_time(lambda: Game.legal_plays(state))
+		applied = best_time(lambda: [Game.apply_move(state, move) for move in legal])
+		yield 'apply_move/' + name, applied / len(legal)
+		mana = costliest_mana(state)
+		if mana is not None:
+			yield 'tap_lands_for_mana/' + name, best_time(lambda: Game.tap_lands_for_mana(state, mana))
+		if Game.get_phase(state) == 'combat_resolution':
+			player = Game.player_with_priority(state)
+			yield 'resolve_combat/' + name, best_time(lambda: Game.resolve_combat(state, player))
+		yield 'decarded_state/' + name, best_time(lambda: decarded_state(state))
+		yield 'win_probabilities/' + name, best_time(lambda: evaluator.win_probabilities(state))
+
+
+def random_playouts(games=20, board=None):
+	"""
+		Return the random games per second and moves per second of games played from new games.
+
+		With board False or True, each game's fingerprint is kept up to date, as the search's are, and
+
+		the game is played by copying GameStates, or on a SimulationBoard.
+	"""
+	seconds = 0
+	moves = 0
+	for seed in range(games):
+		random.seed(seed)
+		state = new_random_game()
+		if board is not None:
+			state.fingerprint
+			if board:
+				state = SimulationBoard(state)
+		begin = time.perf_counter()
+		while not Game.game_is_over(state):
+			state = Game.apply_move(state, random_move(state))
+			moves += 1
+		seconds += time.perf_counter() - begin
+	return games / seconds, moves / seconds
+
+
+def mcts_decision(state, max_playouts, **settings):
+	"""
+		Return the seconds a seeded MonteCarloSearchTreeBot made with settings takes to pick a move
+
+		in state with max_playouts.
+	"""
+	bot = MonteCarloSearchTreeBot(max_playouts=max_playouts, seed=1, reuse_tree=False, verbose=False, **settings)
+	statcache = StatCache()
+	statcache.past_states.append(state)
+	begin = time.perf_counter()
+	bot.get_play(statcache)
+	return time.perf_counter() - begin
+
+
+def macro_benchmarks(states):
+	"""Yield the name and value of each macro benchmark, searching from states."""
+	games_per_second, moves_per_second = random_playouts()
+	yield 'random_playouts/games', games_per_second
+	yield 'random_playouts/moves', moves_per_second
+	for board, name in ((False, 'copied'), (True, 'board')):
+		yield 'random_playouts/{}/moves'.format(name), random_playouts(board=board)[1]
+
+	bot = MonteCarloSearchTreeBot()
+	searched = [states[name] for name in ('early', 'midgame', 'cluttered')]
+	seconds, moves = time_rollouts(bot, searched, 20)
+	yield 'policy_rollouts/games', 20 * len(searched) / seconds
+
+	for budget in MCTS_BUDGETS:
+		seconds = [mcts_decision(state, budget) for state in searched]
+		yield 'mcts/{}/latency'.format(budget), 1000 * sum(seconds) / len(seconds)
+		yield 'mcts/{}/playouts'.format(budget), budget * len(seconds) / sum(seconds)
+
+	budget = MCTS_BUDGETS[-1]
+	seconds = [mcts_decision(state, budget, rollout_horizon=MCTS_HORIZON) for state in searched]
+	yield 'mcts/{}/horizon_{}/latency'.format(budget, MCTS_HORIZON), 1000 * sum(seconds) / len(seconds)
+	yield 'mcts/{}/horizon_{}/playouts'.format(budget, MCTS_HORIZON), budget * len(seconds) / sum(seconds)
+
+
+def units(name):
+	"""Return the unit of the benchmark called name, and whether lower values are better."""
+	if name.startswith(('random_playouts', 'policy_rollouts')) or name.endswith('/playouts'):
+		return 'per s', False
+	if name.endswith('/latency'):
+		return 'ms', True
+	return 'us', True
+
+
+def run(runs):
+	"""
+		Run every benchmark runs times, printing each result as it finishes, and return the results
+
+		to write as JSON, with each benchmark's runs and their median.
+	"""
+	states = positions()
+	values = OrderedDict()
+	for run_number in range(runs):
+		print("run {} of {}".format(run_number + 1, runs))
+		for benchmarks_of_kind in (micro_benchmarks(states), macro_benchmarks(states)):
+			for name, value in benchmarks_of_kind:
+				values.setdefault(name, []).append(value)
+				print("{:<40} {:12.2f} {}".format(name, value, units(name)[0]))
+				sys.stdout.flush()
+
+	benchmarks = OrderedDict()
+	for name, runs_values in values.items():
+		unit, lower_is_better = units(name)
+		value = median(runs_values)
+		benchmarks[name] = {
+			'value': value,
+			'runs': runs_values,
+			'unit': unit,
+			'lower_is_better': lower_is_better,
+		}
+	return OrderedDict([
+		('python', platform.python_version()),
+		('machine', platform.machine()),
+		('cpus', multiprocessing.cpu_count()),
+		('benchmarks', benchmarks),
+	])
+
+
+def slowdowns(before, after, lower_is_better):
+	"""
+		Return how many times longer the median of the runs after takes than that of the runs before,
+
+		and the least and most it could be, comparing the fastest run of one with the slowest of the other.
+	"""
+	if not lower_is_better:
+		before = [1 / value for value in before]
+		after = [1 / value for value in after]
+	return median(after) / median(before), min(after) / max(before), max(after) / min(before)
+
+
+def compare(results, baseline, threshold):
+	"""
+		Return lines comparing each benchmark in results with the same one in baseline, and how many
+
+		are worse by more than threshold, a fraction, even comparing their fastest run with the baseline's slowest.
+	"""
+	lines = []
+	regressions = 0
+	for name, result in results['benchmarks'].items():
+		if name not in baseline['benchmarks']:
+			lines.append("{:<40} new".format(name))
+			continue
+		before = baseline['benchmarks'][name]
+		slowdown = slowdowns(before['runs'], result['runs'], result['lower_is_better'])
+		flag = ''
+		if slowdown[1] > 1 + threshold:
+			flag = 'REGRESSION'
+			regressions += 1
+		elif slowdown[2] < 1 / (1 + threshold):
+			flag = 'faster'
+		lines.append("{:<40} {:12.2f} -> {:12.2f} {:<5} {:6.2f}x  ({:.2f}x - {:.2f}x)  {}".format(
+			name, before['value'], result['value'], result['unit'], slowdown[0], slowdown[1], slowdown[2], flag))
+	for name in baseline['benchmarks']:
+		if name not in results['benchmarks']:
+			lines.append("{:<40} missing".format(name))
+	return lines, regressions
+
+
+def chained_play(card_state):
+	"""Find the play function the way Card.play did before the registry, by comparing names."""
+	if Card.name(card_state) in ['Land', 'Forest', 'Mountain']:
+		return Land.play
+	elif Card.name(card_state) == 'VinesOfVastwood':
+		return VinesOfVastwood.play
+	elif Card.name(card_state) == 'HungerOfTheHowlpack':
+		return HungerOfTheHowlpack.play
+	elif Card.name(card_state) == 'Fireball':
+		return Fireball.play
+	elif Card.name(card_state) in [
+		'SilhanaLedgewalker',
+		'NettleSentinel',
+		'QuirionRanger',
+		'VaultSkirge']:
+		return Creature.play
+	elif Card.name(card_state) == 'BurningTreeEmissary':
+		return BurningTreeEmissary.play
+	elif Card.name(card_state) == 'SkarrganPitSkulk':
+		return SkarrganPitSkulk.play
+	elif Card.name(card_state) == 'NestInvader':
+		return NestInvader.play
+	elif Card.name(card_state) in ['Rancor', 'ElephantGuide']:
+		return CreatureEnchantment.play
+
+
+def chained_untap(card_state):
+	"""Card.adjust_for_untap_phase as it was before the registry."""
+	if Card.name(card_state) == 'QuirionRanger':
+		card_state = Card.set_activated_ability(card_state, False)
+
+	if Card.name(card_state) != 'NettleSentinel':
+		card_state = Card.set_tapped(card_state, False)
+	return card_state
+
+
+def registry_play(card_state):
+	return play_behaviors[Card.kind(card_state)]
+
+
+def sample_cards():
+	"""Return a card tuple for each card in the stompy deck."""
+	cards = []
+	for card_id, kind in enumerate(decklists()['stompy']):
+		if kind_card_types[kind] == 'creature':
+			cards.append(Creature.get_tuple(kind, 0, card_id, -1, False, False, False))
+		else:
+			cards.append(Card.get_tuple(kind, 0, card_id, -1))
+	return cards
+
+
+def dispatch_experiment(args):
+	"""Time finding a card's behavior by comparing names against looking it up in the registry."""
+	cards = sample_cards()
+	for label, before, after in [
+		('play', chained_play, registry_play),
+		('adjust_for_untap_phase', chained_untap, Card.adjust_for_untap_phase),
+	]:
+		assert [before(c) for c in cards] == [after(c) for c in cards]
+		before_ns = best_time(lambda: [before(c) for c in cards]) / len(cards) * 1000
+		after_ns = best_time(lambda: [after(c) for c in cards]) / len(cards) * 1000
+		print("{:<24} name chain {:7.1f} ns   registry {:7.1f} ns   {:.2f}x".format(
+			label, before_ns, after_ns, before_ns / after_ns))
+
+
+def rollouts_experiment(args):
+	"""
+		Time rollouts that list every legal move against rollouts that sample one from a RolloutPolicy,
+
+		and picking a move both ways from the states with the most legal moves in some random games.
+	"""
+	states = [midgame_state(seed=seed, moves=40) for seed in (1, 2, 3)]
+	for label, fast_rollouts in [('legal_plays', False), ('RolloutPolicy', True)]:
+		bot = MonteCarloSearchTreeBot(fast_rollouts=fast_rollouts)
+		seconds, moves = time_rollouts(bot, states, args.rollouts)
+		print("{:<14} {:7.2f} ms per rollout  {:6.1f} us per move".format(
+			label, 1000 * seconds / (args.rollouts * len(states)), 1e6 * seconds / moves))
+
+	policy = RolloutPolicy()
+	for state in widest_states():
+		listed = best_time(lambda: random.choice(Game.legal_plays(state)), repeat=3)
+		sampled = best_time(lambda: policy.sample(state), repeat=3)
+		print("{:5} legal moves in {:<16} legal_plays {:8.1f} us   RolloutPolicy {:6.1f} us".format(
+			len(Game.legal_plays(state)), Game.get_phase(state), listed, sampled))
+
+
+def truncated_rollouts_experiment(args):
+	"""
+		Trade rollout depth for playouts: search with rollouts cut short at different horizons.
+
+		For each horizon, search some midgame states for the same time, and report the playouts per second,
+
+		and how often the move chosen agrees with a search with full rollouts for four times as long, and its regret.
+	"""
+	seconds = args.seconds
+	horizons = [horizon or None for horizon in args.horizons] or [None, 50, 20, 10]
+	states = [
+		midgame_state(seed=seed, moves=moves)
+		for seed, moves in [(1, 40), (1, 45), (2, 45), (3, 45), (3, 70), (4, 80)]
+	]
+	references = [search(state, 4 * seconds)[0] for state in states]
+	print("{}s per search, compared with {}s of full rollouts, over {} states".format(
+		seconds, 4 * seconds, len(states)))
+
+	for horizon in horizons:
+		rates = []
+		agreed = 0
+		regret = 0
+		for state, reference in zip(states, references):
+			root, rate = search(state, seconds, rollout_horizon=horizon)
+			rates.append(rate)
+			agrees, move_regret = agreement(reference, root)
+			agreed += agrees
+			regret += move_regret
+		print("horizon {:>4} {:8.1f} playouts/s   agrees on {} / {}   mean regret {:.3f}".format(
+			horizon or 'none', sum(rates) / len(rates), agreed, len(states), regret / len(states)))
+
+
+def rave_experiment(args):
+	"""
+		Compare how fast searches with and without RAVE settle on a move, as their playout budget grows.
+
+		For each budget, search some midgame states for that many playouts with each rave_k, and report
+
+		how often the move chosen agrees with a search without RAVE with many more playouts, and its regret.
+	"""
+	rave_ks = [rave_k or None for rave_k in args.rave_ks] or [None, 100]
+	states = [
+		midgame_state(seed=seed, moves=moves)
+		for seed, moves in [(2, 90), (3, 70), (4, 90), (5, 40), (5, 50), (5, 70), (5, 80), (7, 80)]
+	]
+	# another seed, so the shorter searches without RAVE aren't just the start of the reference ones
+	references = [search(state, 0, seed=2, max_playouts=args.reference_playouts)[0] for state in states]
+	print("compared with {} playouts without RAVE, over {} states".format(args.reference_playouts, len(states)))
+
+	for playouts in RAVE_BUDGETS:
+		for rave_k in rave_ks:
+			agreed = 0
+			regret = 0
+			for state, reference in zip(states, references):
+				agrees, move_regret = agreement(reference, search(state, 0, max_playouts=playouts, rave_k=rave_k)[0])
+				agreed += agrees
+				regret += move_regret
+			print("{:>4} playouts  rave_k {:>4}   agrees on {} / {}   mean regret {:.3f}".format(
+				playouts, rave_k or 'none', agreed, len(states), regret / len(states)))
+
+
+def depths(root):
+	"""Return the depth of the deepest Node under root, and of the end of its most visited line."""
+	deepest = 0
+	nodes = [(root, 0)]
+	while nodes:
+		node, depth = nodes.pop()
+		deepest = max(deepest, depth)
+		nodes.extend((child, depth + 1) for child in node.children if child is not None)
+	line = 0
+	node = root
+	while node is not None and node.total_visits:
+		node = node.children[max(range(len(node.moves)), key=lambda i: node.visits[i])]
+		line += 1
+	return deepest, line
+
+
+def widening_experiment(args):
+	"""
+		Compare searches with and without progressive widening from the states with the most legal moves.
+
+		For each widening_k, search each state for the same number of playouts, and report how deep the tree
+
+		and its most visited line go, and how often the move chosen agrees with a search without widening
+
+		with many more playouts, and its regret.
+	"""
+	playouts = args.playouts
+	widening_ks = [widening_k or None for widening_k in args.widening_ks] or [None, 2, 4]
+	# with enough cards left that a playout doesn't run out
+	states = widest_states(count=8, min_deck=35)
+	# another seed, so the shorter searches without widening aren't just the start of the reference ones
+	references = [search(state, 0, seed=2, max_playouts=10 * playouts)[0] for state in states]
+	print("{} playouts per search, compared with {} without widening, over states with {} legal moves".format(
+		playouts, 10 * playouts, ", ".join(str(len(reference.moves)) for reference in references)))
+
+	for widening_k in widening_ks:
+		deepest = 0
+		lines = 0
+		agreed = 0
+		regret = 0
+		for state, reference in zip(states, references):
+			root = search(state, 0, max_playouts=playouts, widening_k=widening_k)[0]
+			depth, line = depths(root)
+			deepest += depth
+			lines += line
+			agrees, move_regret = agreement(reference, root)
+			agreed += agrees
+			regret += move_regret
+		print("widening_k {:>4}   depth {:5.1f}   most visited line {:5.1f}   agrees on {} / {}   mean regret {:.3f}".format(
+			widening_k or 'none', deepest / len(states), lines / len(states), agreed, len(states), regret / len(states)))
+
+
+def root_parallel_experiment(args):
+	"""Time root-parallel search with more and more worker processes, from the same midgame state."""
+	counts = args.workers or worker_counts()
+	state = midgame_state()
+	print("{} cpus, {} legal moves at the root, {}s per search".format(
+		multiprocessing.cpu_count(), len(Game.legal_plays(state)), args.simulation_time))
+
+	base_rate = None
+	for workers in counts:
+		bot = MonteCarloSearchTreeBot(simulation_time=args.simulation_time, workers=workers)
+		root, games, nodes = parallel_search(bot, state)
+		rate = games / args.simulation_time
+		base_rate = base_rate or rate
+		print("{:>3} workers {:9.1f} playouts/s   {:.2f}x   best {}".format(
+			workers, rate, rate / base_rate, root.best_move()))
+
+
+def tree_parallel_experiment(args):
+	"""
+		Compare tree-parallel and root-parallel search, with the same workers for the same wall-clock time.
+
+		The numbers given for it so far were measured on a single-core host, where the workers take turns on
+
+		one CPU, so they show what each mode costs, not how it scales. Compare search speed and quality on a host
+
+		with a core for each worker. Runs with more workers than CPUs are marked as sharing them.
+	"""
+	counts = args.workers or worker_counts()
+	# a state with 15 legal moves, so the workers have branches to spread across
+	state = midgame_state(seed=3, moves=70)
+	print("{} cpus, {} legal moves at the root, {}s per search".format(
+		multiprocessing.cpu_count(), len(Game.legal_plays(state)), args.simulation_time))
+
+	for workers in counts:
+		for parallelism in ['root', 'tree']:
+			bot = MonteCarloSearchTreeBot(simulation_time=args.simulation_time, workers=workers, parallelism=parallelism)
+			root, games, nodes = parallel_search(bot, state, parallelism)
+			best = root.moves.index(root.best_move())
+			print("{:>3} workers {:<4} {:9.1f} playouts/s {:7} nodes   best {} ({} visits){}".format(
+				workers, parallelism, games / args.simulation_time, nodes, root.best_move(), root.visits[best],
+				"   sharing {} cpus".format(multiprocessing.cpu_count()) if workers > multiprocessing.cpu_count() else ""))
+
+
+# each experiment's function, and the arguments its subcommand takes, as add_argument arguments
+EXPERIMENTS = OrderedDict([
+	('dispatch', (dispatch_experiment, [])),
+	('rollouts', (rollouts_experiment, [
+		('rollouts', dict(nargs='?', default=30, type=int, help="the rollouts from each state - defaults 30")),
+	])),
+	('truncated_rollouts', (truncated_rollouts_experiment, [
+		('seconds', dict(nargs='?', default=1, type=float, help="the seconds of each search - defaults 1")),
+		('horizons', dict(nargs='*', type=int, help="the horizons to compare, 0 for full rollouts - defaults 0 50 20 10")),
+	])),
+	('rave', (rave_experiment, [
+		('reference_playouts', dict(nargs='?', default=1000, type=int, help="the playouts of the reference searches - defaults 1000")),
+		('rave_ks', dict(nargs='*', type=int, help="the rave_k settings to compare, 0 for no RAVE - defaults 0 100")),
+	])),
+	('widening', (widening_experiment, [
+		('playouts', dict(nargs='?', default=200, type=int, help="the playouts of each search - defaults 200")),
+		('widening_ks', dict(nargs='*', type=int, help="the widening_k settings to compare, 0 for no widening - defaults 0 2 4")),
+	])),
+	('root_parallel', (root_parallel_experiment, [
+		('simulation_time', dict(nargs='?', default=2, type=float, help="the seconds of each search - defaults 2")),
+		('workers', dict(nargs='*', type=int, help="the worker counts to compare - defaults 1, 2, 4 ... up to the number of CPUs")),
+	])),
+	('tree_parallel', (tree_parallel_experiment, [
+		('simulation_time', dict(nargs='?', default=2, type=float, help="the seconds of each search - defaults 2")),
+		('workers', dict(nargs='*', type=int, help="the worker counts to compare - defaults 1, 2, 4 ... up to the number of CPUs")),
+	])),
+])
+
+
+def create_parser():
+	"""Create the argparse parser."""
+	parser = argparse.ArgumentParser(description="Time the rules engine and the search.")
+	parser.add_argument(
+		"--runs",
+		default=3,
+		type=int,
+		help="the times to run every benchmark, whose median is its result - defaults 3"
+	)
+	parser.add_argument(
+		"--output",
+		default=None,
+		help="the file to write the results to as JSON"
+	)
+	parser.add_argument(
+		"--baseline",
+		default=None,
+		help="a file of results written with --output to compare these with"
+	)
+	parser.add_argument(
+		"--threshold",
+		default=0.2,
+		type=float,
+		help="how much worse than the baseline's slowest run a benchmark's fastest run can be, as a fraction,"
+			" before it is flagged - defaults 0.2"
+	)
+	experiments = parser.add_subparsers(
+		dest="experiment",
+		metavar="experiment",
+		help="an experiment to run instead of the benchmarks, one of " + ", ".join(EXPERIMENTS)
+	)
+	for name, (function, arguments) in EXPERIMENTS.items():
+		summary = function.__doc__.strip().splitlines()[0]
+		experiment = experiments.add_parser(name, help=summary, description=summary)
+		for argument, settings in arguments:
+			experiment.add_argument(argument, **settings)
+	return parser
+
+
+def main():
+	args = create_parser().parse_args()
+	if args.experiment:
+		EXPERIMENTS[args.experiment][0](args)
+		return
+	results = run(args.runs)
+	if args.output:
+		with open(args.output, 'w') as output:
+			json.dump(results, output, indent=2)
+	if args.baseline:
+		with open(args.baseline) as baseline_file:
+			baseline = json.load(baseline_file)
+		lines, regressions = compare(results, baseline, args.threshold)
+		print("\ncompared with {}, with how many times longer each takes:".format(args.baseline))
+		print("\n".join(lines))
+		if regressions:
+			print("{} regressions of more than {:.0%}".format(regressions, args.threshold))
+			sys.exit(1)
+
+
+if __name__ == "__main__":
+	main()
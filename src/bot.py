@@ -3,13 +3,13 @@
 from src.constants import *
 from src.game import Game
 from random import choice
-from src.utils import decarded_state
 
 class Bot(object):
 
 	def play_move(self, game_state, statcache):
 		"""Play a random move in game."""
-		move = choice(list(Game.legal_plays(game_state)))
+		# sorted, so a seeded game doesn't depend on PYTHONHASHSEED
+		move = choice(sorted(Game.legal_plays(game_state), key=repr))
 		game_state = Game.apply_move(game_state, move)
 		statcache.past_states.append(game_state)
 		return move, game_state
@@ -1,7 +1,7 @@
 import sys
 from src.constants import *
+from random import choice, randrange
 from re import finditer
-from src.utils import decarded_state
 
 
 """Card encapsulates the actions of a fantasy card."""
@@ -15,24 +15,27 @@ class Card(object):
 		return class_map[name]
 
 	@staticmethod
-	def get_tuple(classname, owner, new_id, turn_played, card_type=None):
-		"""Return a hashable tuple representing the Card."""
+	def get_tuple(kind, owner, new_id, turn_played):
+		"""Return a hashable tuple representing the Card, kind being an id from card_kind_ids."""
 		return (
-			classname,
+			kind,
 			owner, 
 			new_id, 
 			False, # tapped 
 			turn_played, 
-			name_to_card_type[classname], 
 		)
 
+	@staticmethod
+	def kind(card_state):
+		return card_state[0]
+
 	@staticmethod
 	def owner(card_state):
 		return card_state[1]
 
 	@staticmethod
 	def name(card_state):
-		return card_state[0]
+		return card_kinds[card_state[0]]
 
 	@staticmethod
 	def id(card_state):
@@ -48,7 +51,7 @@ class Card(object):
 
 	@staticmethod
 	def card_type(card_state):
-		return card_state[5]
+		return kind_card_types[card_state[0]]
 
 	@staticmethod
 	def set_turn_played(card_state, current_turn):
@@ -58,7 +61,7 @@ class Card(object):
 
 	@staticmethod
 	def total_mana_cost(card_state):
-		return name_to_mana_cost[Card.name(card_state)]
+		return kind_mana_costs[card_state[0]]
 
 	@staticmethod
 	def ascii_image(card_state, show_back=False):
@@ -170,41 +173,34 @@ class Card(object):
 	@staticmethod
 	def set_temp_strength(card_state, strength):
 		mutable_tuple = list(card_state)
-		mutable_tuple[7] = strength
+		mutable_tuple[6] = strength
 		return tuple(mutable_tuple)
 
 	@staticmethod
 	def set_temp_hit_points(card_state, hit_points):
 		mutable_tuple = list(card_state)
-		mutable_tuple[8] = hit_points
+		mutable_tuple[7] = hit_points
 		return tuple(mutable_tuple)
 
 	@staticmethod
 	def set_temp_targettable(card_state, targettable):
 		mutable_tuple = list(card_state)
-		mutable_tuple[9] = targettable
+		mutable_tuple[8] = targettable
 		return tuple(mutable_tuple)
 
 	@staticmethod
 	def set_activated_ability(card_state, activated):
 		mutable_tuple = list(card_state)
-		mutable_tuple[10] = activated
+		mutable_tuple[9] = activated
 		return tuple(mutable_tuple)
 
 	@staticmethod
 	def adjust_for_untap_phase(card_state):
-		if Card.name(card_state) == 'QuirionRanger':
-			card_state = Card.set_activated_ability(card_state, False)
-
-		if Card.name(card_state) != 'NettleSentinel':
-			card_state = Card.set_tapped(card_state, False)
-		return card_state
+		return untap_phase_behaviors[card_state[0]](card_state)
 
 	@staticmethod
 	def react_to_spell(game_state, reacting_card, spell, Game):
-		if Card.name(reacting_card) == "NettleSentinel":
-			return NettleSentinel.react_to_spell(game_state, reacting_card, spell, Game)
-		return game_state
+		return react_to_spell_behaviors[reacting_card[0]](game_state, reacting_card, spell, Game)
 
 	@staticmethod
 	def adjust_for_end_turn(card_state):
@@ -222,73 +218,28 @@ class Card(object):
 
 	@staticmethod
 	def activate_ability(card_state, game_state, mana_to_use, target_creature_id, target_land_id, card_in_play, Game):
-		if Card.name(card_state) == 'QuirionRanger':
-			game_state = QuirionRanger.activate_ability(card_state, game_state, mana_to_use, target_creature_id, target_land_id, card_in_play, Game)
-		elif Card.name(card_state) == 'EldraziSpawnToken':
-			game_state = EldraziSpawnToken.activate_ability(card_state, game_state, mana_to_use, target_creature_id, target_land_id, card_in_play, Game)
-		return game_state
+		return activate_ability_behaviors[card_state[0]](
+			card_state, game_state, mana_to_use, target_creature_id, target_land_id, card_in_play, Game)
 
 	@staticmethod
 	def pay_for_activate_ability(card_state, game_state, mana_to_use, target_creature_id, target_land_id, card_in_play, Game):
-		if Card.name(card_state) == 'QuirionRanger':
-			game_state = QuirionRanger.pay_for_activate_ability(card_state, game_state, mana_to_use, target_creature_id, target_land_id, card_in_play, Game)
-		elif Card.name(card_state) == 'EldraziSpawnToken':
-			game_state = EldraziSpawnToken.pay_for_activate_ability(card_state, game_state, mana_to_use, target_creature_id, target_land_id, card_in_play, Game)
-		return game_state
+		return pay_for_activate_ability_behaviors[card_state[0]](
+			card_state, game_state, mana_to_use, target_creature_id, target_land_id, card_in_play, Game)
 
 	@staticmethod
 	def play(card_state, game_state, mana_to_use, target_creature_id, Game):
-		"""Returns [] if the player doesn't have enough mana, other returns the action to play the card."""
-		if Card.name(card_state) in ['Land', 'Forest', 'Mountain']:
-			return Land.play(card_state, game_state, mana_to_use, target_creature_id, Game)
-		elif Card.name(card_state) == 'VinesOfVastwood':
-			return VinesOfVastwood.play(card_state, game_state, mana_to_use, target_creature_id, Game)
-		elif Card.name(card_state) == 'HungerOfTheHowlpack':
-			return HungerOfTheHowlpack.play(card_state, game_state, mana_to_use, target_creature_id, Game)
-		elif Card.name(card_state) == 'Fireball':
-			return Fireball.play(card_state, game_state, mana_to_use, target_creature_id, Game)
-		elif Card.name(card_state) in [
-			'SilhanaLedgewalker', 
-			'NettleSentinel',
-			'QuirionRanger',
-			'VaultSkirge']:
-			return Creature.play(card_state, game_state, mana_to_use, target_creature_id, Game)
-		elif Card.name(card_state) == 'BurningTreeEmissary':
-			return BurningTreeEmissary.play(card_state, game_state, mana_to_use, target_creature_id, Game)
-		elif Card.name(card_state) == 'SkarrganPitSkulk':
-			return SkarrganPitSkulk.play(card_state, game_state, mana_to_use, target_creature_id, Game)
-		elif Card.name(card_state) == 'NestInvader':
-			return NestInvader.play(card_state, game_state, mana_to_use, target_creature_id, Game)
-		elif Card.name(card_state) in ['Rancor', 'ElephantGuide']:
-			return CreatureEnchantment.play(card_state, game_state, mana_to_use, target_creature_id, Game)
-
+		"""Play the card from its owner's hand and return the new game state."""
+		return play_behaviors[card_state[0]](card_state, game_state, mana_to_use, target_creature_id, Game)
 
 	@staticmethod
 	def possible_moves(card_state, game_state, Game):
 		"""Returns [] if the player doesn't have enough mana, other returns the action to play the card."""
-		if Card.name(card_state) in ['Land', 'Forest', 'Mountain']:
-			return Land.possible_moves(card_state, game_state, Game)
-		elif Card.name(card_state) == 'VinesOfVastwood':
-			return VinesOfVastwood.possible_moves(card_state, game_state, Game)
-		elif Card.name(card_state) == 'HungerOfTheHowlpack':
-			return HungerOfTheHowlpack.possible_moves(card_state, game_state, Game)
-		elif Card.name(card_state) == 'Fireball':
-			return Fireball.possible_moves(card_state, game_state, Game)
-		elif Card.name(card_state) in [
-			'SilhanaLedgewalker', 
-			'NettleSentinel',
-			'QuirionRanger',
-			'SkarrganPitSkulk',
-			'NestInvader']:
-			return Creature.possible_moves(card_state, game_state, Game)
-		elif Card.name(card_state) == 'VaultSkirge':
-			return VaultSkirge.possible_moves(card_state, game_state, Game)
-		elif Card.name(card_state) == 'BurningTreeEmissary':
-			return BurningTreeEmissary.possible_moves(card_state, game_state, Game)
-		elif Card.name(card_state) == 'ElephantGuide':
-			return CreatureEnchantment.possible_moves(card_state, game_state, Game)
-		elif Card.name(card_state) == 'Rancor':
-			return Rancor.possible_moves(card_state, game_state, Game)
+		return possible_moves_behaviors[card_state[0]](card_state, game_state, Game)
+
+	@staticmethod
+	def sample_move(card_state, game_state, Game):
+		"""Return one of possible_moves at random, or None if there are none."""
+		return sample_move_behaviors[card_state[0]](card_state, game_state, Game)
 
 	@staticmethod
 	def display_name(card_state, display_stats=True):
@@ -336,16 +287,9 @@ class Card(object):
 		return casting_cost
 
 	@staticmethod
-	def cast_moves(card_state, game_state, card_index, Game):
-		if len(Card.possible_moves(card_state, game_state, Game)) > 0:
-			return [('card-cast-{}'.format(
-				Card.name(card_state)), 
-				card_index, 
-				(), 
-				None,
-				None,
-				Game.player_with_priority(game_state))]
-		return []
+	def cast_move(card_state, card_index, player):
+		"""Return the move that puts the card on the stack, to pick its targets and amount after."""
+		return ('card-cast-{}'.format(Card.name(card_state)), card_index, (), None, None, player)
 
 	@staticmethod
 	def on_graveyard(card_state, game_state, Game):
@@ -354,7 +298,7 @@ class Card(object):
 		elif Card.name(card_state) == 'ElephantGuide':
 			pwp = Card.owner(card_state)
 			token_state = Creature.get_tuple(
-				'ElephantToken', 
+				card_kind_ids['ElephantToken'], 
 				pwp, 
 				Game.get_new_card_id(game_state), 
 				Game.get_current_turn(game_state)
@@ -388,14 +332,13 @@ class Land(Card):
 	def play(land_state, game_state, mana_to_use, target_creature_id, Game):
 		"""Remove this from the player's hand and add it to game_state lands."""
 		pwp = Game.player_with_priority(game_state)
-		player = Game.get_player_states(game_state)[pwp]
 		game_state = Game.remove_card_from_hand(game_state, pwp, land_state)
 
 		land_state = Card.set_turn_played(land_state, Game.get_current_turn(game_state))
 		game_state = Game.add_land(game_state, land_state)
-		if Game.print_moves(game_state):
-			print("> {} played a {}." \
-				.format(Game.player_display_name(player, pwp), Card.name(land_state), Card.owner(land_state), ))
+		sink = Game.event_sink(game_state)
+		if sink.enabled:
+			sink.emit('played_land', game_state, player=pwp, card=land_state)
 		return game_state
 
 	@staticmethod
@@ -426,24 +369,18 @@ class Land(Card):
 		pwp = Game.player_with_priority(game_state)
 		game_state = Game.set_land_tapped(game_state, card_state, True)
 		game_state = Game.add_temp_mana(game_state, pwp, Land.mana_provided_list(card_state))
-		if Game.print_moves(game_state):
-			player_state = Game.get_player_states(game_state)[pwp]
-			print("> {} tapped {} for {}, has {} floating." \
-				.format(
-					Game.player_display_name(player_state, pwp), 
-					Card.name(card_state), 
-					Land.mana_provided_list(card_state),
-					Game.temp_mana(player_state),
-				))
+		sink = Game.event_sink(game_state)
+		if sink.enabled:
+			sink.emit('tapped_for_mana', game_state, player=pwp, card=card_state, mana=Land.mana_provided_list(card_state))
 		return game_state
 
 	@staticmethod
 	def mana_provided(land_state):
-		return mana_provided_map[Card.name(land_state)]
+		return kind_mana_provided[land_state[0]]
 
 	@staticmethod
 	def mana_provided_list(land_state):
-		return mana_provided_list_map[Card.name(land_state)]
+		return kind_mana_provided_lists[land_state[0]]
 
 class Forest(Land):
 	"""A card that produces green mana."""
@@ -502,49 +439,25 @@ class VinesOfVastwood(Card):
 		"""Pump a creature based on how much mana is used."""
 		target_creature_state = Game.creature_with_id(game_state, target_creature_id)
 		if not target_creature_state:  # it died
-			if Game.print_moves(game_state):
-				print("VinesOfVastwood fizzled, no creature with id {}.".format(target_creature_id))
+			sink = Game.event_sink(game_state)
+			if sink.enabled:
+				sink.emit('fizzled', game_state, card=card_state, target_id=target_creature_id)
 			return
 
 		target_creature_state = Card.set_temp_targettable(target_creature_state, False)
 		game_state = Game.set_creature_with_id(game_state, target_creature_state, target_creature_id)
 
-		new_creatures = []
-		for creature_state in Game.get_creatures(game_state):
-			if Card.id(creature_state) == Card.id(target_creature_state):
-				new_creatures.append(target_creature_state)
-			else:
-				new_creatures.append(creature_state)
-		game_state = Game.set_creatures(game_state, tuple(new_creatures))
-
 		if mana_to_use == ('G', 'G'):
 			target_creature_state = Creature.increment_temp_strength(target_creature_state, 4)
 			target_creature_state = Creature.increment_temp_hit_points(target_creature_state, 4)
 			game_state = Game.set_creature_with_id(game_state, target_creature_state, target_creature_id)
 
-			new_creatures = []
-			for creature_state in Game.get_creatures(game_state):
-				if Card.id(creature_state) == Card.id(target_creature_state):
-					new_creatures.append(target_creature_state)
-				else:
-					new_creatures.append(creature_state)
-			game_state = Game.set_creatures(game_state, tuple(new_creatures))
-
 		pwp = Card.owner(card_state)
 		game_state = Game.remove_card_from_hand(game_state, pwp, card_state)
-		if Game.print_moves(game_state):
-			caster_state = Game.get_player_states(game_state)[pwp]
-			if mana_to_use == ('G', ):
-				print("> {} played VinesOfVastwood on {}." \
-					.format(
-						BoGamet.player_display_name(caster_state, pwp), 
-						Creature.name(target_creature_state)))
-			else:
-				print("> {} played kicked VinesOfVastwood on {}, total power now {}." \
-					.format(
-						Game.player_display_name(caster_state, pwp), 
-						Creature.name(target_creature_state),
-						Creature.total_damage(target_creature_state)))
+		sink = Game.event_sink(game_state)
+		if sink.enabled:
+			sink.emit('cast', game_state, 
+				player=pwp, card=card_state, target=target_creature_state, kicked=mana_to_use == ('G', 'G'))
 		return game_state
 
 
@@ -597,29 +510,15 @@ class HungerOfTheHowlpack(Card):
 				target_creature_state = Creature.increment_hit_point_counters(target_creature_state, 2)
 			game_state = Game.set_creature_with_id(game_state, target_creature_state, target_creature_id)
 
-		new_creatures = []
-		for creature_state in Game.get_creatures(game_state):
-			if target_creature_state and Card.id(creature_state) == Card.id(target_creature_state):
-				new_creatures.append(target_creature_state)
-			else:
-				new_creatures.append(creature_state)
-		game_state = Game.set_creatures(game_state,new_creatures)
-
 		game_state = Game.remove_card_from_hand(game_state, Game.player_with_priority(game_state), card_state)
 
-		if Game.print_moves(game_state):
-			format_str = None
-			if Game.creature_died_this_turn(game_state):
-				format_str = "> Player {} played {} on {}, with morbid, total stats now {}/{}.."
-			else:
-				format_str = "> Player {} played {} on {}, total stats now {}/{}."
-			print(format_str.format( 
-				Card.owner(card_state), 
-				Card.name(card_state),
-				Card.name(target_creature_state),
-				Creature.total_damage(target_creature_state),
-				Creature.total_hit_points(target_creature_state),
-			))
+		sink = Game.event_sink(game_state)
+		if sink.enabled:
+			sink.emit('cast', game_state, 
+				player=Card.owner(card_state), 
+				card=card_state, 
+				target=target_creature_state, 
+				morbid=Game.creature_died_this_turn(game_state))
 		return game_state
 
 
@@ -637,7 +536,8 @@ class Fireball(Card):
 		total_mana = 0
 		for color, count in available_mana.items():
 			total_mana += count
-			if 'R' in color:
+			# Eldrazi Spawn's colorless mana is an int
+			if type(color) == str and 'R' in color:
 				has_red = True
 
 		if has_red and total_mana > 1:
@@ -662,6 +562,28 @@ class Fireball(Card):
 							pwp))
 		return possible_moves
 
+	@staticmethod
+	def sample_move(card_state, game_state, Game):
+		"""Return one of possible_moves at random, drawing the target and amount without listing them all."""
+		available_mana = Game.available_mana(game_state)
+		pwp = Game.player_with_priority(game_state)
+		total_mana = sum(available_mana.values())
+		if total_mana <= 1 or not any(type(color) == str and 'R' in color for color in available_mana):
+			return None
+
+		targets = [None]
+		for creature_state in Game.get_creatures(game_state):
+			if Creature.hexproof(creature_state) and Card.owner(creature_state) != pwp:
+				continue
+			if Creature.targettable(creature_state) and Creature.temp_targettable(creature_state):
+				targets.append(Card.id(creature_state))
+		target = choice(targets)
+		mana = randrange(2, total_mana + 1)
+		card_index = Game.get_hand(game_state, pwp).index(card_state)
+		if target is None:
+			return ('card-fireball', card_index, (('R', ), mana-1), None, None, pwp)
+		return ('card-fireball-creature', card_index, (('R', ), mana-1), target, None, pwp)
+
 	@staticmethod
 	def play(card_state, game_state, mana_to_use, target_creature_id, Game):
 		"""Decrement hit_points equal to blaster's mana from blastee."""
@@ -672,10 +594,10 @@ class Fireball(Card):
 		colorless = 0
 		if mana_to_use[1] != None:
 			colorless = mana_to_use[1]
-		if target_creature_id:
+		if target_creature_id is not None:
 			creature = Game.creature_with_id(game_state, target_creature_id)
 			if (colorless) >= Creature.total_hit_points(creature):
-				if creature.id in Game.get_attackers(game_state):
+				if Card.id(creature) in Game.get_attackers(game_state):
 					game_state = Game.remove_attacker(game_state, Card.id(creature))
 				for e in Creature.enchantments(creature):
 					game_state = Card.on_graveyard(e, game_state, Game)
@@ -683,26 +605,22 @@ class Fireball(Card):
 				game_state = Game.remove_creature(game_state, creature)
 				game_state = Game.set_creature_died_this_turn(game_state, True)
 			else:
-				target_creature_state = Creature.increment_temp_hit_points(creature, colorless)
-				new_creatures = []
-				for creature_state in Game.get_creatures(game_state):
-					if Card.id(creature_state) == Card.id(target_creature_state):
-						new_creatures.append(target_creature_state)
-					else:
-						new_creatures.append(creature_state)
-				game_state = Game.set_creatures(game_state, new_creatures)
-
-			if Game.print_moves(game_state):
-				print("> {} fireballed {} for {} damage." \
-				.format(bot.display_name(blaster, pwp), Card.name(creature), colorless))
+				# damage that isn't lethal lowers the creature's hit points
+				target_creature_state = Creature.increment_temp_hit_points(creature, -colorless)
+				game_state = Game.set_creature_with_id(game_state, target_creature_state, Card.id(creature))
+
+			sink = Game.event_sink(game_state)
+			if sink.enabled:
+				sink.emit('damaged', game_state, player=pwp, card=card_state, target=creature, amount=colorless)
 		else:
-			blastee = Game.opponent(game_state, blaster)
-			game_state = Game.increment_hit_points(game_state, Game.get_player_states(game_state).index(blastee), -colorless)
-			game_state = Game.increment_damage_to_player(game_state, Game.get_player_states(game_state).index(blastee), colorless)
+			# find the blastee before its hit_points change, since index compares player states
+			blastee = Game.get_player_states(game_state).index(Game.opponent(game_state, blaster))
+			game_state = Game.increment_hit_points(game_state, blastee, -colorless)
+			game_state = Game.increment_damage_to_player(game_state, blastee, colorless)
 
-			if Game.print_moves(game_state):
-				print("> {} fireballed for {} damage." \
-				.format(Game.player_display_name(blaster, pwp), colorless))
+			sink = Game.event_sink(game_state)
+			if sink.enabled:
+				sink.emit('damaged', game_state, player=pwp, card=card_state, target=None, amount=colorless)
 
 		return game_state
 
@@ -711,18 +629,17 @@ class Creature(Card):
 	"""A fantasy creature card instance."""
 
 	@staticmethod
-	def get_tuple(classname, owner, new_id, turn_played, 
+	def get_tuple(kind, owner, new_id, turn_played, 
 		flying=False,
 		hexproof=False,
 		lifelink=False):
-		"""Return a hashable tuple representing the Card."""
+		"""Return a hashable tuple representing the Card, kind being an id from card_kind_ids."""
 		return (
-			classname,
+			kind,
 			owner, 
 			new_id, 
 			False, # tapped 
 			turn_played, 
-			name_to_card_type[classname], 
 			False, #targettable, 
 			0, # temp_strength, 
 			0, # temp_hit_points,
@@ -749,14 +666,40 @@ class Creature(Card):
 		enchantment_damage = 0
 		for e_state in Creature.enchantments(card_state):
 			enchantment_damage += CreatureEnchantment.attack_bonus(e_state)
-		return name_to_stats[Card.name(card_state)][0] + Creature.temp_strength(card_state) + Creature.strength_counters(card_state) + enchantment_damage
+		return kind_strengths[card_state[0]] + Creature.temp_strength(card_state) + Creature.strength_counters(card_state) + enchantment_damage
 
 	@staticmethod
 	def total_hit_points(card_state):
 		enchantment_hit_points = 0
 		for e_state in Creature.enchantments(card_state):
 			enchantment_hit_points += CreatureEnchantment.defense_bonus(e_state)
-		return name_to_stats[Card.name(card_state)][1] + Creature.temp_hit_points(card_state) + Creature.hit_point_counters(card_state) + enchantment_hit_points
+		return kind_hit_points[card_state[0]] + Creature.temp_hit_points(card_state) + Creature.hit_point_counters(card_state) + enchantment_hit_points
+
+	@staticmethod
+	def interchangeable_key(card_state):
+		"""
+			Return a key that is equal for creatures that only differ by id and turn played,
+
+			so choosing one of them to attack or block is the same as choosing another.
+		"""
+		enchantment_kinds = tuple(sorted(Card.kind(e) for e in Creature.enchantments(card_state)))
+		return (
+			Card.kind(card_state),
+			Card.owner(card_state),
+			Card.tapped(card_state),
+			Creature.targettable(card_state),
+			Creature.temp_strength(card_state),
+			Creature.temp_hit_points(card_state),
+			Creature.temp_targettable(card_state),
+			Creature.activated_ability(card_state),
+			Creature.activated_ability_type(card_state),
+			Creature.strength_counters(card_state),
+			Creature.hit_point_counters(card_state),
+			Creature.flying(card_state),
+			Creature.hexproof(card_state),
+			Creature.lifelink(card_state),
+			enchantment_kinds,
+		)
 
 	@staticmethod
 	def can_attack(card_state, game_state, Game):
@@ -770,32 +713,20 @@ class Creature(Card):
 		game_state = Game.remove_card_from_hand(game_state, pwp, card_state)
 		card_state = Card.set_turn_played(card_state, Game.get_current_turn(game_state))
 		game_state = Game.add_creature(card_state, game_state)
-		if Game.print_moves(game_state):
-			summoner = Game.get_player_states(game_state)[pwp]
-			print("> {} summoned a {}." \
-				.format(
-					Game.player_display_name(summoner, pwp), 
-					Card.name(card_state)
-				))
+		sink = Game.event_sink(game_state)
+		if sink.enabled:
+			sink.emit('summoned', game_state, player=pwp, card=card_state)
 		return game_state
 
 	@staticmethod
 	def possible_ability_moves(card_state, game_state, Game):
-		if Card.name(card_state) == 'QuirionRanger':
-			return QuirionRanger.possible_ability_moves(card_state, game_state, Game)
-		elif Card.name(card_state) == 'EldraziSpawnToken':
-			return EldraziSpawnToken.possible_ability_moves(card_state, game_state, Game)
-		return []
+		return ability_moves_behaviors[card_state[0]](card_state, game_state, Game)
 
 	@staticmethod
 	def can_be_blocked_by(card_state, creature):
 		if Creature.flying(card_state) and not Creature.flying(creature):
 			return False
-		elif Creature.name(card_state) == 'SkarrganPitSkulk':
-			return SkarrganPitSkulk.can_be_blocked_by(card_state, creature)
-		elif Creature.name(card_state) == 'SilhanaLedgewalker':
-			return SilhanaLedgewalker.can_be_blocked_by(card_state, creature)
-		return True
+		return blockable_behaviors[card_state[0]](card_state, creature)
 
 	@staticmethod
 	def creature_types(card_state):
@@ -806,13 +737,9 @@ class Creature(Card):
 		if Creature.lifelink(card_state):
 			pwp = Card.owner(card_state)
 			game_state = Game.increment_hit_point(game_state, pwp, Creature.total_damage(card_state))
-			if Game.print_moves(game_state):
-				print("> {} gained {} life from {}." \
-					.format(
-						Game.player_display_name(owner, pwp), 
-						Creature.total_damage(card_state), 
-						Card.name(card_state)
-					))
+			sink = Game.event_sink(game_state)
+			if sink.enabled:
+				sink.emit('life_changed', game_state, player=pwp, amount=Creature.total_damage(card_state), card=card_state)
 		return game_state
 
 	@staticmethod
@@ -856,82 +783,82 @@ class Creature(Card):
 
 	@staticmethod
 	def targettable(card_state):
-		return card_state[6]
+		return card_state[5]
 
 	@staticmethod
 	def temp_strength(card_state):
-		return card_state[7]
+		return card_state[6]
 
 	@staticmethod
 	def temp_hit_points(card_state):
-		return card_state[8]
+		return card_state[7]
 
 	@staticmethod
 	def temp_targettable(card_state):
-		return card_state[9]
+		return card_state[8]
 
 	@staticmethod
 	def activated_ability(card_state):
-		return card_state[10]
+		return card_state[9]
 
 	@staticmethod
 	def activated_ability_type(card_state):
-		return card_state[11]
+		return card_state[10]
 
 	@staticmethod
 	def strength_counters(card_state):
-		return card_state[12]
+		return card_state[11]
 
 	@staticmethod
 	def hit_point_counters(card_state):
-		return card_state[13]
+		return card_state[12]
 
 	@staticmethod
 	def flying(card_state):
-		return card_state[14]
+		return card_state[13]
 
 	@staticmethod
 	def hexproof(card_state):
-		return card_state[15]
+		return card_state[14]
 
 	@staticmethod
 	def lifelink(card_state):
-		return card_state[16]
+		return card_state[15]
 
 	@staticmethod
 	def enchantments(card_state):
-		return card_state[17]
+		return card_state[16]
 
 	@staticmethod
 	def increment_temp_strength(card_state, increment):
 		mutable_tuple = list(card_state)
-		mutable_tuple[7] += increment
+		mutable_tuple[6] += increment
 		return tuple(mutable_tuple)
 
 	@staticmethod
 	def increment_temp_hit_points(card_state, increment):
 		mutable_tuple = list(card_state)
-		mutable_tuple[8] += increment
+		mutable_tuple[7] += increment
 		return tuple(mutable_tuple)
 
 	@staticmethod
 	def increment_strength_counters(card_state, increment):
 		mutable_tuple = list(card_state)
-		mutable_tuple[12] += increment
+		mutable_tuple[11] += increment
 		return tuple(mutable_tuple)
 
 	@staticmethod
 	def increment_hit_point_counters(card_state, increment):
 		mutable_tuple = list(card_state)
-		mutable_tuple[13] += increment
+		mutable_tuple[12] += increment
 		return tuple(mutable_tuple)
 
 	@staticmethod
 	def add_enchantment(target, new_enchantment):
 		mutable_tuple = list(target)
-		mutable_tuple[17] = list(mutable_tuple[17])
-		mutable_tuple[17].append(new_enchantment)
-		mutable_tuple[17] = tuple(mutable_tuple[17])
+		mutable_tuple[16] = list(mutable_tuple[16])
+		mutable_tuple[16].append(new_enchantment)
+		mutable_tuple[16] = tuple(mutable_tuple[16])
 		return tuple(mutable_tuple)
 
 
@@ -942,6 +869,10 @@ class NettleSentinel(Creature):
 		Whenever you cast a green spell, you may untap Nettle Sentinel.
 	"""
 
+	@staticmethod
+	def adjust_for_untap_phase(card_state):
+		return card_state
+
 	@staticmethod
 	def react_to_spell(game_state, reacting_self, spell, Game):
 		total_mana_cost = Card.total_mana_cost(spell)
@@ -975,15 +906,18 @@ class QuirionRanger(Creature):
 	def action_word(card_state):
 		return "Untap"
 
+	@staticmethod
+	def adjust_for_untap_phase(card_state):
+		card_state = Card.set_activated_ability(card_state, False)
+		return Card.set_tapped(card_state, False)
+
 	@staticmethod
 	def possible_ability_moves(card_state, game_state, Game):
 		if Creature.activated_ability(card_state):
 			return []
 		untapped_forest = None
 		tapped_forest = None
-		for land_state in Game.get_lands(game_state):
-			if Card.owner(land_state) != Card.owner(card_state):
-				continue
+		for land_state in Game.get_player_lands(game_state, Card.owner(card_state)):
 			if Card.name(land_state) == "Forest" and Card.tapped(land_state):
 				tapped_forest = land_state
 
@@ -996,40 +930,31 @@ class QuirionRanger(Creature):
 			different_forest_targets.append(untapped_forest)
 		possible_moves = []
 		for land_state in different_forest_targets:
-				for creature_state in Game.get_creatures(game_state):
-					if Card.owner(creature_state) == Card.owner(card_state):
-						possible_moves.append(
-							(
-								'ability-{}'.format(Card.name(card_state)), 
-								Game.get_creatures(game_state).index(card_state), 
-								((), None), 
-								Card.id(creature_state), 
-								Card.id(land_state),
-								Game.player_with_priority(game_state),
-								card_state, 
-
-							)
+				for creature_state in Game.get_player_creatures(game_state, Card.owner(card_state)):
+					possible_moves.append(
+						(
+							'ability-{}'.format(Card.name(card_state)), 
+							Game.get_creatures(game_state).index(card_state), 
+							((), None), 
+							Card.id(creature_state), 
+							Card.id(land_state),
+							Game.player_with_priority(game_state),
+							card_state, 
+
 						)
+					)
 		return possible_moves
 
 	@staticmethod
 	def activate_ability(card_state, game_state, mana_to_use, target_creature_id, target_land_id, card_in_play, Game):
 		"""Return a forest to player's hand and untap a creature."""
-		for creature_state in Game.get_creatures(game_state):
-			if Card.id(creature_state) == target_creature_id:
-				creature_state = Creature.set_tapped(creature_state, False)
-				break
+		creature_state = Creature.set_tapped(Game.creature_with_id(game_state, target_creature_id), False)
 		game_state = Game.set_creature_with_id(game_state, creature_state, target_creature_id)
 
-		if Game.print_moves(game_state):
-			pwp = Game.player_with_priority(game_state)
-			player = Game.get_player_states(game_state)[pwp]
-			print("> {} untapped {} with {}." \
-				.format(
-					Game.player_display_name(player, pwp), 
-					Card.name(creature_state), 
-					Card.name(card_state),
-				))
+		sink = Game.event_sink(game_state)
+		if sink.enabled:
+			sink.emit('activated', game_state, 
+				player=Game.player_with_priority(game_state), card=card_state, target=creature_state)
 
 		return game_state
 
@@ -1038,22 +963,13 @@ class QuirionRanger(Creature):
 		"""Return a forest to player's hand and untap a creature."""
 		card_state = Creature.set_activated_ability(card_state, True)
 
-		land_to_return = None
-		for land_state in Game.get_lands(game_state):
-			if Card.id(land_state) == target_land_id:
-				land_to_return = land_state
-				break
+		land_to_return = Game.land_with_id(game_state, target_land_id)
 		game_state = Land.return_to_hand(game_state, land_to_return, Game)
 
-		if Game.print_moves(game_state):
-			pwp = Game.player_with_priority(game_state)
-			player = Game.get_player_states(game_state)[pwp]
-			print("> {} used to {} return {}." \
-				.format(
-					Game.player_display_name(player, pwp), 
-					Card.name(card_state), 
-					Card.name(land_to_return),
-				))
+		sink = Game.event_sink(game_state)
+		if sink.enabled:
+			sink.emit('returned_land', game_state, 
+				player=Game.player_with_priority(game_state), card=card_state, land=land_to_return)
 
 		return game_state
 
@@ -1090,17 +1006,10 @@ class SkarrganPitSkulk(Creature):
 
 		if Game.opponent_was_dealt_damage(game_state):
 			mutable_tuple = list(card_state)
+			mutable_tuple[11] += 1
 			mutable_tuple[12] += 1
-			mutable_tuple[13] += 1
 			card_state = tuple(mutable_tuple)
-
-			new_creatures = []
-			for c_state in Game.get_creatures(game_state):
-				if Card.id(c_state) == Card.id(card_state):
-					new_creatures.append(card_state)
-				else:
-					new_creatures.append(c_state)
-			game_state = Game.set_creatures(game_state, new_creatures)			
+			game_state = Game.set_creature_with_id(game_state, card_state, Card.id(card_state))
 		return game_state
 
 	@staticmethod
@@ -1125,7 +1034,7 @@ class NestInvader(Creature):
 		game_state = Creature.play(card_state, game_state, mana_to_use, target_creature_id, Game)
 		pwp = Card.owner(card_state)
 		token_state = Creature.get_tuple(
-			'EldraziSpawnToken', 
+			card_kind_ids['EldraziSpawnToken'], 
 			pwp, 
 			Game.get_new_card_id(game_state), 
 			Game.get_current_turn(game_state)
@@ -1188,26 +1097,20 @@ class EldraziSpawnToken(Creature):
 		if block_where_blocking:
 			game_state = Game.remove_from_block(game_state, card_state, block_where_blocking)
 
-		for c_state in Game.get_creatures(game_state):
-			if Card.id(c_state) == Creature.id(card_state):
-				game_state = Game.remove_creature(game_state, c_state)
-				break
+		c_state = Game.creature_with_id(game_state, Creature.id(card_state))
+		if c_state:
+			game_state = Game.remove_creature(game_state, c_state)
 
 		pwp = Game.player_with_priority(game_state)
-		acting_player = Game.get_player_states(game_state)[pwp]
 		game_state = Game.add_temp_mana(game_state, pwp, (1, ))
-		acting_player = Game.get_player_states(game_state)[pwp]
 		game_state = Game.set_creature_died_this_turn(game_state, True)
 		game_state = Card.on_graveyard(card_state, game_state, Game)
 		for e in Creature.enchantments(card_state):
 			game_state = Card.on_graveyard(e, game_state, Card)
 		
-		if Game.print_moves(card_state):
-			print("> {} sacrificed {}." \
-				.format(
-					Game.player_display_name(player, pwp), 
-					Card.name(card_state), 
-				))
+		sink = Game.event_sink(game_state)
+		if sink.enabled:
+			sink.emit('sacrificed', game_state, player=pwp, card=card_state)
 		return game_state
 
 	@staticmethod
@@ -1266,17 +1169,16 @@ class CreatureEnchantment(Card):
 
 	@staticmethod
 	def attack_bonus(card_state):
-		return attack_bonus_map[Card.name(card_state)]
+		return kind_attack_bonuses[card_state[0]]
 
 	@staticmethod
 	def defense_bonus(card_state):
-		return defense_bonus_map[Card.name(card_state)]
+		return kind_defense_bonuses[card_state[0]]
 
 	@staticmethod
 	def play(card_state, game_state, mana_to_use, target_creature_id, Game):
 		"""Summon the enchantment for the player_with_priority."""
 		pwp = Game.player_with_priority(game_state)
-		summoner = Game.get_player_states(game_state)[pwp]
 		game_state = Game.remove_card_from_hand(game_state, pwp, card_state)
 		card_state = Card.set_turn_played(card_state, Game.get_current_turn(game_state))
 		
@@ -1286,20 +1188,10 @@ class CreatureEnchantment(Card):
 		target_creature_state = Game.creature_with_id(game_state, target_creature_id)
 		if target_creature_state: # if it didn't die
 			target_creature_state = Creature.add_enchantment(target_creature_state, state)
-			new_creatures = []
-			for creature_state in Game.get_creatures(game_state):
-				if Card.id(creature_state) == Card.id(target_creature_state):
-					new_creatures.append(target_creature_state)
-				else:
-					new_creatures.append(creature_state)
-			game_state = Game.set_creatures(game_state, new_creatures)
-		if Game.print_moves(game_state):
-			print("> {} played a {} on {}." \
-				.format(
-					Game.player_display_name(summoner, pwp), 
-					Card.name(card_state),
-					Card.name(target_creature_state)
-				))
+			game_state = Game.set_creature_with_id(game_state, target_creature_state, target_creature_id)
+		sink = Game.event_sink(game_state)
+		if sink.enabled:
+			sink.emit('cast', game_state, player=pwp, card=card_state, target=target_creature_state)
 		return game_state
 
 
@@ -1362,8 +1254,10 @@ card_classes = [
 			EldraziSpawnToken,
 			ElephantGuide,
 			ElephantToken,
+			Fireball,
 			Forest,
 			HungerOfTheHowlpack,
+			Mountain,
 			NestInvader,
 			NettleSentinel,			
 			QuirionRanger,
@@ -1377,6 +1271,69 @@ class_map = {}
 for c in card_classes:
 	class_map[c.__name__] = c
 
+# a card's kind is the index of its class in card_classes, and card tuples and decks carry it instead of the name
+card_kinds = tuple(c.__name__ for c in card_classes)
+card_kind_ids = {name: kind for kind, name in enumerate(card_kinds)}
+
+
+def untap(card_state):
+	return Card.set_tapped(card_state, False)
+
+
+def ignore_spell(game_state, reacting_card, spell, Game):
+	return game_state
+
+
+def no_ability(card_state, game_state, mana_to_use, target_creature_id, target_land_id, card_in_play, Game):
+	return game_state
+
+
+def no_ability_moves(card_state, game_state, Game):
+	return []
+
+
+def always_blockable(card_state, creature):
+	return True
+
+
+def sample_possible_move(card_state, game_state, Game):
+	possible_moves = Card.possible_moves(card_state, game_state, Game)
+	return choice(possible_moves) if possible_moves else None
+
+
+def behavior_table(behavior, dispatchers, default=None):
+	"""
+		Return a tuple of the function that implements behavior for each card kind.
+
+		That's the function the card's class inherits, looking no further up than 
+
+		the classes in dispatchers that look the card up in this table, else default.
+	"""
+	table = []
+	for card_class in card_classes:
+		function = default
+		for klass in card_class.__mro__:
+			if klass in dispatchers:
+				break
+			if behavior in vars(klass):
+				function = getattr(klass, behavior)
+				break
+		table.append(function)
+	return tuple(table)
+
+
+# each card kind's behaviors, so Card and Creature dispatch with one index instead of comparing names
+play_behaviors = behavior_table('play', (Card, ))
+possible_moves_behaviors = behavior_table('possible_moves', (Card, ))
+sample_move_behaviors = behavior_table('sample_move', (Card, ), sample_possible_move)
+# Land.activate_ability taps for mana, and is called directly rather than through Card
+activate_ability_behaviors = behavior_table('activate_ability', (Card, Land), no_ability)
+pay_for_activate_ability_behaviors = behavior_table('pay_for_activate_ability', (Card, ), no_ability)
+react_to_spell_behaviors = behavior_table('react_to_spell', (Card, ), ignore_spell)
+untap_phase_behaviors = behavior_table('adjust_for_untap_phase', (Card, ), untap)
+ability_moves_behaviors = behavior_table('possible_ability_moves', (Creature, ), no_ability_moves)
+blockable_behaviors = behavior_table('can_be_blocked_by', (Creature, ), always_blockable)
+
 
 name_to_mana_cost = {
 			'NestInvader':(('G', ), 1),
@@ -1389,6 +1346,7 @@ name_to_mana_cost = {
 			'BurningTreeEmissary': (('RG', 'RG', ), None),
 			'SkarrganPitSkulk': (('G', ), None),
 			'Rancor': (('G', ), None),
+			'Fireball': (('R', ), None),
 			'EldraziSpawnToken': ((), 0),
 			'ElephantGuide': (('G', ), 2),	
 			'ElephantToken': ((), 0),	
@@ -1451,3 +1409,19 @@ defense_bonus_map = {
 	'ElephantGuide': 3,
 	'Rancor': 0,
 }
+
+
+def kind_table(attributes, default=None):
+	"""Return a tuple of each card kind's value in attributes, a dict keyed by card name."""
+	return tuple(attributes.get(name, default) for name in card_kinds)
+
+
+# static card data, indexed by card kind
+kind_mana_costs = kind_table(name_to_mana_cost)
+kind_card_types = kind_table(name_to_card_type)
+kind_strengths = tuple(stats[0] for stats in kind_table(name_to_stats, (0, 0)))
+kind_hit_points = tuple(stats[1] for stats in kind_table(name_to_stats, (0, 0)))
+kind_mana_provided_lists = kind_table(mana_provided_list_map)
+kind_mana_provided = kind_table(mana_provided_map)
+kind_attack_bonuses = kind_table(attack_bonus_map, 0)
+kind_defense_bonuses = kind_table(defense_bonus_map, 0)
@@ -0,0 +1,125 @@
+"""ConsoleRenderer prints the events of a game being played to the terminal."""
+
+from src.card import Card, Creature
+from src.game import Game
+
+
+class ConsoleRenderer(object):
+	"""An event subscriber that prints a line for each move, and the board at each turn and combat."""
+
+	def __call__(self, kind, game_state, fields):
+		getattr(self, 'on_' + kind)(game_state, **fields)
+
+	@staticmethod
+	def player_name(game_state, player):
+		return Game.player_display_name(Game.get_player_states(game_state)[player], player)
+
+	def on_drew(self, game_state, player, card):
+		if Game.get_phase(game_state) == 'setup':
+			return
+		player_state = Game.get_player_states(game_state)[player]
+		if Game.is_human_playing(game_state) and Game.get_bot_type(player_state) != "human":
+			print("> {} drew a card in phase {}." \
+				.format(self.player_name(game_state, player), Game.get_phase(game_state)))
+		else:
+			print("> {} drew {} in phase {}." \
+				.format(self.player_name(game_state, player), Card.display_name(card), Game.get_phase(game_state)))
+
+	def on_turn_started(self, game_state, turn):
+		if not Game.is_human_playing(game_state):
+			Game.print_board(game_state)
+		print("# TURN {} ################################################".format(turn + 1))
+
+	def on_played_land(self, game_state, player, card):
+		print("> {} played a {}.".format(self.player_name(game_state, player), Card.name(card)))
+
+	def on_tapped_for_mana(self, game_state, player, card, mana):
+		player_state = Game.get_player_states(game_state)[player]
+		print("> {} tapped {} for {}, has {} floating." \
+			.format(self.player_name(game_state, player), Card.name(card), mana, Game.temp_mana(player_state)))
+
+	def on_cast(self, game_state, player, card, target, kicked=False, morbid=False):
+		if target is None:
+			print("> {} played a {}.".format(self.player_name(game_state, player), Card.name(card)))
+			return
+		extra = ""
+		if kicked:
+			extra = " kicked"
+		if morbid:
+			extra = " with morbid"
+		print("> {} played{} {} on {}, total stats now {}/{}." \
+			.format(
+				self.player_name(game_state, player),
+				extra,
+				Card.name(card),
+				Card.name(target),
+				Creature.total_damage(target),
+				Creature.total_hit_points(target),
+			))
+
+	def on_fizzled(self, game_state, card, target_id):
+		print("{} fizzled, no creature with id {}.".format(Card.name(card), target_id))
+
+	def on_summoned(self, game_state, player, card):
+		print("> {} summoned a {}.".format(self.player_name(game_state, player), Card.name(card)))
+
+	def on_activated(self, game_state, player, card, target):
+		print("> {} untapped {} with {}." \
+			.format(self.player_name(game_state, player), Card.name(target), Card.name(card)))
+
+	def on_returned_land(self, game_state, player, card, land):
+		print("> {} used {} to return {}." \
+			.format(self.player_name(game_state, player), Card.name(card), Card.name(land)))
+
+	def on_sacrificed(self, game_state, player, card):
+		print("> {} sacrificed {}.".format(self.player_name(game_state, player), Card.name(card)))
+
+	def on_damaged(self, game_state, player, card, target, amount):
+		target_name = "the opponent" if target is None else Card.name(target)
+		print("> {} cast {} at {} for {} damage." \
+			.format(self.player_name(game_state, player), Card.name(card), target_name, amount))
+
+	def on_life_changed(self, game_state, player, amount, card):
+		hit_points = Game.hit_points(Game.get_player_states(game_state)[player])
+		if card is None:
+			print("> {} lost {} life from casting a Phyrexian, now at {}." \
+				.format(self.player_name(game_state, player), -amount, hit_points))
+		else:
+			print("> {} gained {} life from {}, now at {}." \
+				.format(self.player_name(game_state, player), amount, Card.name(card), hit_points))
+
+	def on_declared_attackers(self, game_state, player, attackers):
+		print("> {} declared attackers {}." \
+			.format(self.player_name(game_state, player), ", ".join([Card.display_name(c) for c in attackers])))
+
+	def on_blocked(self, game_state, player, attacker, blockers):
+		print("> {} blocked {} with {}." \
+			.format(
+				self.player_name(game_state, player),
+				Card.display_name(attacker),
+				", ".join([Card.display_name(c) for c in blockers])
+			))
+
+	def on_finished_blocking(self, game_state, player):
+		print("> {} finished blocking.".format(self.player_name(game_state, player)))
+
+	def on_announced_attack(self, game_state, player):
+		print("> {} announced attack.".format(self.player_name(game_state, player)))
+
+	def on_attacked(self, game_state, player, damage, killed):
+		dead_names = ", ".join([Card.display_name(c) for c in killed])
+		if len(killed) == 0:
+			dead_names = "nothing"
+		if damage > 0:
+			print("> {} attacked for {} (killed: {}).".format(self.player_name(game_state, player), damage, dead_names))
+		else:
+			print("> {} attacked, (killed: {})".format(self.player_name(game_state, player), dead_names))
+		if not Game.is_human_playing(game_state):
+			Game.print_board(game_state)
+
+	def on_game_over(self, game_state, winner, winning_hp, losing_hp):
+		if winner is None:
+			print("Game Over - Draw")
+		else:
+			print("Game Over - {} wins! Final hit points are {} to {}." \
+				.format(self.player_name(game_state, winner), winning_hp, losing_hp))
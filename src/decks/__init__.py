@@ -0,0 +1,52 @@
+"""The decklists players can play, each a JSON file in this directory, loaded once per process."""
+
+import json
+import os
+from functools import lru_cache
+from random import shuffle
+
+from src.card import card_kind_ids
+
+DECK_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DECK = 'stompy'
+
+# cards that are only ever made by other cards, never put in a deck
+TOKENS = ('EldraziSpawnToken', 'ElephantToken')
+
+
+@lru_cache(maxsize=None)
+def decklists(directory=DECK_DIRECTORY):
+	"""
+		Return a dict from the name of each decklist in directory, its file name without .json,
+
+		to a tuple of the kinds of its cards, checking that each is a card that can be put in a deck.
+	"""
+	decks = {}
+	for file_name in sorted(os.listdir(directory)):
+		name, extension = os.path.splitext(file_name)
+		if extension != '.json':
+			continue
+		with open(os.path.join(directory, file_name)) as json_data:
+			cards = json.load(json_data)['cards']
+		for card_name in cards:
+			if card_name not in card_kind_ids or card_name in TOKENS:
+				raise ValueError("{} in the {} deck isn't a card that can be put in a deck".format(card_name, name))
+		if not cards:
+			raise ValueError("the {} deck has no cards".format(name))
+		decks[name] = tuple(card_kind_ids[card_name] for card_name in cards)
+	return decks
+
+
+def deck_names():
+	"""Return the names of the decklists, sorted."""
+	return sorted(decklists())
+
+
+def shuffled_deck(name):
+	"""Return the kinds of the cards of the decklist called name, in a random order."""
+	decks = decklists()
+	if name not in decks:
+		raise ValueError("{} isn't one of {}".format(name, ", ".join(sorted(decks))))
+	cards = list(decks[name])
+	shuffle(cards)
+	return tuple(cards)
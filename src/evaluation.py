@@ -0,0 +1,52 @@
+"""StaticEvaluator scores a position without playing it out, to end rollouts early."""
+
+from math import exp
+
+from src.card import Creature
+from src.game import Game
+
+# what each thing a player has is worth, and how sharply a lead in worth turns into a win probability
+DEFAULT_WEIGHTS = {
+	'life': 1.0,
+	'power': 1.5,
+	'toughness': 1.0,
+	'hand': 1.0,
+	'untapped_mana': 0.5,
+	'scale': 0.1,
+}
+
+
+class StaticEvaluator(object):
+	"""
+		Guesses each player's chance of winning from their life, the total power and toughness of
+
+		their creatures, the cards in their hand and their untapped lands, each times its weight.
+
+		The chances are a logistic function of the difference in the players' totals, times the scale weight.
+	"""
+
+	def __init__(self, weights=None):
+		"""weights replaces some of DEFAULT_WEIGHTS."""
+		self.weights = dict(DEFAULT_WEIGHTS)
+		for name, weight in (weights or {}).items():
+			if name not in self.weights:
+				raise ValueError("{} isn't one of {}".format(name, ", ".join(DEFAULT_WEIGHTS)))
+			self.weights[name] = float(weight)
+
+	def worth(self, state, player):
+		"""Return the weighted total of what player has."""
+		weights = self.weights
+		creatures = Game.get_player_creatures(state, player)
+		return (
+			weights['life'] * Game.hit_points(Game.get_player_states(state)[player])
+			+ weights['power'] * sum(Creature.total_damage(c) for c in creatures)
+			+ weights['toughness'] * sum(Creature.total_hit_points(c) for c in creatures)
+			+ weights['hand'] * len(Game.get_hand(state, player))
+			+ weights['untapped_mana'] * len(Game.untapped_lands(state, player))
+		)
+
+	def win_probabilities(self, state):
+		"""Return the chance each of the two players wins from state."""
+		lead = self.weights['scale'] * (self.worth(state, 0) - self.worth(state, 1))
+		first_wins = 1 / (1 + exp(-max(min(lead, 50), -50)))
+		return (first_wins, 1 - first_wins)
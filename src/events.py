@@ -0,0 +1,56 @@
+"""Sinks for the events the rules emit as moves are played.
+
+Each event has a kind, the game state just after it happened, and some fields.
+These are the kinds and their fields:
+
+	drew: player, card
+	turn_started: turn
+	played_land: player, card
+	tapped_for_mana: player, card, mana
+	cast: player, card, target (a creature or None), kicked, morbid
+	fizzled: card, target_id
+	summoned: player, card
+	activated: player, card, target
+	returned_land: player, card, land
+	sacrificed: player, card
+	damaged: player, card, target (a creature, or None for the opponent), amount
+	life_changed: player, amount, card (None for Phyrexian mana)
+	declared_attackers: player, attackers
+	blocked: player, attacker, blockers
+	finished_blocking: player
+	announced_attack: player
+	attacked: player, damage, killed
+	game_over: winner (None for a draw), winning_hp, losing_hp
+
+The rules check a sink's enabled flag before building an event, so playouts, which use
+NULL_SINK, never pay for them.
+"""
+
+
+class NullSink(object):
+	"""A sink that drops every event."""
+
+	enabled = False
+
+	def emit(self, kind, game_state, **fields):
+		pass
+
+
+NULL_SINK = NullSink()
+
+
+class EventSink(object):
+	"""A sink that passes each event to its subscribers, as subscriber(kind, game_state, fields)."""
+
+	enabled = True
+
+	def __init__(self, *subscribers):
+		self.subscribers = list(subscribers)
+
+	def subscribe(self, subscriber):
+		self.subscribers.append(subscriber)
+
+	def emit(self, kind, game_state, **fields):
+		for subscriber in self.subscribers:
+			subscriber(kind, game_state, fields)
+
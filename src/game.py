@@ -2,13 +2,12 @@
 
 import collections
 import itertools
-import json
-import pickle
-from src.card import Card, Creature, Land
+from src.card import Card, Creature, Land, kind_card_types
 from src.constants import *
-from random import choice, shuffle
+from src.decks import DEFAULT_DECK, shuffled_deck
+from src.game_state import GameState, PlayerState
+from random import choice
 from src.statcache import StatCache
-from src.utils import decarded_state
 
 
 class Game():
@@ -18,33 +17,27 @@ class Game():
 		"""Set the list of players, and set the current_player to the first player."""
 		pass
 		
-	# whether to print each move, typically False during simulation, but true for a real game
+	# where the rules report each move, NULL_SINK during simulation, but a renderer for a real game
 	@staticmethod
-	def print_moves(game_state):
-		return game_state[14]
+	def event_sink(game_state):
+		return game_state.event_sink
 
 	@staticmethod
-	def set_print_moves(game_state, print_moves):
-		mutable = list(game_state)
-		mutable[14] = print_moves
-		return tuple(mutable)
+	def set_event_sink(game_state, event_sink):
+		return game_state.replace(_event_sink=event_sink)
 
 	@staticmethod
 	def add_player(game_state, player_state):
-		mutable = list(game_state)
-		mutable_players = list(mutable[4])
-		mutable_players.append(player_state)
-		mutable[4] = tuple(mutable_players)
-		return tuple(mutable)
+		return game_state.replace(player_states=game_state.player_states + (player_state,))
 	
 	@staticmethod
-	def new_player_state_object(hit_points=0, bot_type="random"):
-		return (
+	def new_player_state_object(hit_points=0, bot_type="random", deck=DEFAULT_DECK):
+		return PlayerState(
 			hit_points, 
 			(), #hand
 			(), #temp_mana
 			bot_type, #TODO name from subclasses
-			-1, # deck
+			deck, # the decklist's name, until the first draw shuffles it
 		)
 
 	@staticmethod
@@ -87,11 +80,11 @@ class Game():
 
 	@staticmethod 
 	def hit_points(game_state):
-		return game_state[0]
+		return game_state.hit_points
 
 	@staticmethod 
 	def temp_mana(player_state):
-		return player_state[2]
+		return player_state.temp_mana
 
 	@staticmethod
 	def print_bot_board(player_state, game_state, show_hand=True):
@@ -140,7 +133,8 @@ class Game():
 
 	@staticmethod
 	def new_game_state():
-		return (0, #current_turn
+		return GameState(
+				0, #current_turn
 				0, #player_with_priority
 				0, #new_card_id
 				'setup', #phase
@@ -154,170 +148,145 @@ class Game():
 				(), #stack
 				False, #creature_died_this_turn
 				None, #current_spell_move,
-				False #print_moves
 		)
 
 	@staticmethod
 	def clear_damage_to_players(game_state):
-		mutable = list(game_state)
-		mutable[10] = (0, 0,)
-		return tuple(game_state)
+		return game_state.replace(damage_to_players=(0, 0))
 
 	@staticmethod
 	def get_damage_to_players(game_state):
-		return game_state[10]
+		return game_state.damage_to_players
 
 	@staticmethod
 	def increment_damage_to_player(game_state, player_index, damage_to_player):
-		dtp_list = list (game_state[10])
+		dtp_list = list(game_state.damage_to_players)
 		dtp_list[player_index] += damage_to_player
-		mutable = list(game_state)
-		mutable[10] = tuple(dtp_list)
-		return tuple(mutable)
+		return game_state.replace(damage_to_players=tuple(dtp_list))
 
 	@staticmethod
 	def get_creature_died_this_turn(game_state):
-		return game_state[12]
+		return game_state.creature_died_this_turn
 
 	@staticmethod
 	def set_creature_died_this_turn(game_state, creature_died_this_turn):
-		mutable = list(game_state)
-		mutable[12] = creature_died_this_turn
-		return tuple(mutable)
+		return game_state.replace(creature_died_this_turn=creature_died_this_turn)
 
 	@staticmethod
 	def get_stack(game_state):
-		return game_state[11]
+		return game_state.stack
 
 	@staticmethod
 	def set_stack(game_state, stack):
-		mutable = list(game_state)
-		mutable[11] = stack
-		return tuple(mutable)
+		return game_state.replace(stack=stack)
 
 	@staticmethod
 	def get_new_card_id(game_state):
-		return game_state[2]
+		return game_state.new_card_id
 
 	@staticmethod
 	def increment_new_card_id(game_state):
-		mutable = list(game_state)
-		mutable[2] += 1
-		return tuple(mutable)
+		return game_state.replace(new_card_id=game_state.new_card_id + 1)
 
 	@staticmethod
 	def get_current_spell_move(game_state):
-		return game_state[13]
+		return game_state.current_spell_move
 
 	@staticmethod
 	def set_current_spell_move(game_state, current_spell_move):
-		mutable = list(game_state)
-		mutable[13] = current_spell_move
-		return tuple(mutable)
+		return game_state.replace(current_spell_move=current_spell_move)
 
 	@staticmethod
 	def set_blocks(game_state, blocks):
-		mutable = list(game_state)
-		mutable[9] = tuple(blocks)
-		return tuple(mutable)
+		return game_state.replace(blocks=tuple(blocks))
 
 	@staticmethod
 	def add_block(game_state, block):
-		mutable = list(game_state)
-		mutable_blocks = list(game_state[9])
-		mutable_blocks.append(block)
-		mutable[9] = tuple(mutable_blocks)
-		return tuple(mutable)
+		return game_state.replace(blocks=game_state.blocks + (block,))
 
 	@staticmethod
 	def set_blockers(game_state, blockers):
-		mutable = list(game_state)
-		mutable[8] = tuple(blockers)
-		return tuple(mutable)
+		return game_state.replace(blockers=tuple(blockers))
 
 	@staticmethod
 	def add_blocker(game_state, blocker):
-		mutable = list(game_state)
-		mutable_blockers = list(game_state[8])
-		mutable_blockers.append(blocker)
-		mutable[8] = tuple(mutable_blockers)
-		return tuple(mutable)
+		return game_state.replace(blockers=game_state.blockers + (blocker,))
 
 	@staticmethod
 	def add_attacker(game_state, attacker):
-		mutable = list(game_state)
-		mutable_attackers = list(game_state[7])
-		mutable_attackers.append(attacker)
-		mutable[7] = tuple(mutable_attackers)
-		return tuple(mutable)
+		return game_state.replace(attackers=game_state.attackers + (attacker,))
 
 	@staticmethod
 	def set_attackers(game_state, attackers):
-		mutable = list(game_state)
-		mutable[7] = tuple(attackers)
-		return tuple(mutable)
+		return game_state.replace(attackers=tuple(attackers))
 
 	@staticmethod
 	def get_attackers(game_state):
-		return game_state[7]
+		return game_state.attackers
 
 	@staticmethod
 	def get_blockers(game_state):
-		return game_state[8]
+		return game_state.blockers
 
 	@staticmethod
 	def get_blocks(game_state):
-		return game_state[9]
+		return game_state.blocks
 
 	@staticmethod
 	def get_lands(game_state):
-		return game_state[6]
+		return game_state.lands
 
 	@staticmethod
 	def set_land(game_state, new_land_state, land_index):
-		lands = list(game_state[6])
-		lands[land_index] = new_land_state
-		mutable = list(game_state)
-		mutable[6] = tuple(lands)
-		return tuple(mutable)
+		return game_state.replace_in_zone('lands', land_index, new_land_state)
 		
 	@staticmethod
 	def get_creatures(game_state):
-		return game_state[5]
+		return game_state.creatures
+
+	@staticmethod
+	def get_player_creatures(game_state, player_index):
+		return game_state.zone_for_owner('creatures', player_index)
+
+	@staticmethod
+	def get_player_lands(game_state, player_index):
+		return game_state.zone_for_owner('lands', player_index)
+
+	@staticmethod
+	def untapped_lands(game_state, player_index):
+		"""Return the lands player_index controls that aren't tapped."""
+		return [land_state for land_state in Game.get_player_lands(game_state, player_index) if not Card.tapped(land_state)]
+
+	@staticmethod
+	def attack_ready_creatures(game_state, player_index):
+		"""Return the creatures player_index controls that can attack this turn."""
+		return [c for c in Game.get_player_creatures(game_state, player_index) if Creature.can_attack(c, game_state, Game)]
 		
 	@staticmethod
 	def add_creature(creature_state, game_state):
-		mutable_creatures = list(game_state[5])
-		mutable_creatures.append(creature_state)
-		mutable = list(game_state)
-		mutable[5] = tuple(mutable_creatures)
-		return tuple(mutable)
+		return game_state.append_to_zone('creatures', creature_state)
 
 	@staticmethod
 	def get_player_states(game_state):
-		return game_state[4]
+		return game_state.player_states
 		
 	@staticmethod
 	def set_player_state(state, new_player_state, player_index):
-		players = list(state[4])
+		players = list(state.player_states)
 		players[player_index] = new_player_state
-		mutable = list(state)
-		mutable[4] = tuple(players)
-		return tuple(mutable)
+		return state.replace(player_states=tuple(players))
 
 	@staticmethod
 	def get_phase(state):
-		return state[3]
+		return state.phase
 
 	@staticmethod
 	def set_phase(state, phase):
-		mutable = list(state)
-		mutable[3] = phase
-		return tuple(mutable)
+		return state.replace(phase=phase)
 
 	@staticmethod
 	def player_with_priority(state):
-		return state[1]
+		return state.player_with_priority
 
 	@staticmethod
 	def play_out(game_state, statcache):
@@ -328,14 +297,12 @@ class Game():
 			move, game_state = bot.play_move(game_state, statcache)
 
 		winner, winning_hp, losing_hp = Game.winning_player(game_state)
-		if Game.print_moves(game_state):
-			if Game.game_is_drawn(game_state):
-				print("Game Over - Draw")
-			else:
-				print("Game Over - {} wins! Final hit points are {} to {}." \
-					.format(Game.player_display_name(winner, Game.get_player_states(game_state).index(winner)),
-							winning_hp, 
-							losing_hp))
+		sink = Game.event_sink(game_state)
+		if sink.enabled:
+			winner_index = None
+			if winner is not None:
+				winner_index = Game.get_player_states(game_state).index(winner)
+			sink.emit('game_over', game_state, winner=winner_index, winning_hp=winning_hp, losing_hp=losing_hp)
 		return winner
 
 	@staticmethod
@@ -399,7 +366,7 @@ class Game():
 	@staticmethod
 	def acting_player(state):
 		"""Return the player_number of the player due to make move in state."""
-		return state[1]
+		return state.player_with_priority
 
 	@staticmethod
 	def apply_move(state, move):
@@ -423,220 +390,112 @@ class Game():
 
 	@staticmethod 
 	def increment_hit_points(game_state, player_index, increment):
-
-		mutable_player = list(game_state[4][player_index])
-		mutable_player[0] += increment
-
-		mutable_player_list = list(game_state[4])
-		mutable_player_list[player_index] = tuple(mutable_player)
-
-		mutable_game_state = list(game_state)
-		mutable_game_state[4] = tuple(mutable_player_list)
-
-		return tuple(mutable_game_state)
+		hit_points = game_state.player_states[player_index].hit_points + increment
+		return game_state.replace_player(player_index, hit_points=hit_points)
 
 	@staticmethod 
 	def add_temp_mana(state, player_index, mana_to_add):
-		mutable_temp_mana = list(state[4][player_index][2])
-		for m in mana_to_add:
-			mutable_temp_mana.append(m)
-
-		mutable_player = list(state[4][player_index])
-		mutable_player[2] = tuple(mutable_temp_mana)
-
-		mutable_player_list = list(state[4])
-		mutable_player_list[player_index] = tuple(mutable_player)
-
-		mutable_state = list(state)
-		mutable_state[4] = tuple(mutable_player_list)
-		
-		return tuple(mutable_state)
+		temp_mana = state.player_states[player_index].temp_mana + tuple(mana_to_add)
+		return state.replace_player(player_index, temp_mana=temp_mana)
 
 	@staticmethod 
 	def remove_temp_mana(state, player_index, index_to_remove):
-		mutable_temp_mana = list(state[4][player_index][2])
-		del mutable_temp_mana[index_to_remove]
-
-		mutable_player = list(state[4][player_index])
-		mutable_player[2] = tuple(mutable_temp_mana)
-
-		mutable_player_list = list(state[4])
-		mutable_player_list[player_index] = tuple(mutable_player)
-
-		mutable_state = list(state)
-		mutable_state[4] = tuple(mutable_player_list)
-		
-		return tuple(mutable_state)
+		temp_mana = state.player_states[player_index].temp_mana
+		temp_mana = temp_mana[:index_to_remove] + temp_mana[index_to_remove + 1:]
+		return state.replace_player(player_index, temp_mana=temp_mana)
 
 	@staticmethod 
 	def clear_temp_mana(state, player_index):
-		mutable_player = list(state[4][player_index])
-		mutable_player[2] = ()
-
-		mutable_player_list = list(state[4])
-		mutable_player_list[player_index] = tuple(mutable_player)
-
-		mutable_state = list(state)
-		mutable_state[4] = tuple(mutable_player_list)
-
-		return tuple(mutable_state)
+		if not state.player_states[player_index].temp_mana:
+			return state
+		return state.replace_player(player_index, temp_mana=())
 
 	@staticmethod
 	def set_land_tapped(game_state, land_state, tapped):
-		land_index = game_state[6].index(land_state)
-		tapped_state = Card.set_tapped(land_state, tapped)
-
-		mutable_lands = list(game_state[6])
-		mutable_lands[land_index] = tapped_state
-		
-		mutable_state = list(game_state)
-		mutable_state[6] = tuple(mutable_lands)
-
-		return tuple(mutable_state)
+		land_index = game_state.zone_index('lands')[Card.id(land_state)]
+		return Game.set_land(game_state, Card.set_tapped(land_state, tapped), land_index)
 
 	@staticmethod
 	def add_to_stack(state, move):
 		# TODO handle costs diff
 		if move[0].startswith('ability'):
 			state = Game.pay_ability_costs(state, move)
-		stack = list(Game.get_stack(state))
-		stack.append(move)
-		return Game.set_stack(state, tuple(stack))
+		return Game.set_stack(state, Game.get_stack(state) + (move,))
 
 	@staticmethod
 	def set_priority(state, player_index):
-		mutable = list(state)
-		mutable[1] = player_index
-		return tuple(mutable)
+		return state.replace(player_with_priority=player_index)
 
 	@staticmethod
 	def remove_card_from_hand(game_state, player_index, card_state):
 		pwp = Card.owner(card_state)
-		mutable_hand = list(game_state[4][pwp][1])
+		mutable_hand = list(game_state.player_states[pwp].hand)
 		mutable_hand.remove(card_state)
-
-		mutable_player = list(game_state[4][pwp])
-		mutable_player[1] = tuple(mutable_hand)
-
-		mutable_player_list = list(game_state[4])
-		mutable_player_list[pwp] =  tuple(mutable_player)
-
-		mutable_game_state = list(game_state)
-		mutable_game_state[4] = tuple(mutable_player_list)
-
-		return tuple(mutable_game_state)
+		return game_state.replace_player(pwp, hand=tuple(mutable_hand))
 
 	@staticmethod
 	def add_card_to_hand(game_state, card_state):
 		pwp = Card.owner(card_state)
-
-		mutable_hand = list(game_state[4][pwp][1])
-		mutable_hand.append(card_state)
-
-		mutable_player = list(game_state[4][pwp])
-		mutable_player[1] = tuple(mutable_hand)
-		tuple_player = tuple(mutable_player)
-
-		mutable_player_list = list(game_state[4])
-		mutable_player_list[pwp] = tuple_player
-		tuple_player_list = tuple(mutable_player_list)
-
-		mutable_game_state = list(game_state)
-		mutable_game_state[4] = tuple_player_list
-		game_state = tuple(mutable_game_state)
-
-		return game_state
+		hand = game_state.player_states[pwp].hand + (card_state,)
+		return game_state.replace_player(pwp, hand=hand)
 
 	@staticmethod
 	def remove_attacker(game_state, creature_id):
-		mutable_attackers = list(game_state[7])
+		mutable_attackers = list(game_state.attackers)
 		mutable_attackers.remove(creature_id)
-		mutable_state = list(game_state)
-		mutable_state[7] = tuple(mutable_attackers)
-		return tuple(mutable_state)
+		return game_state.replace(attackers=tuple(mutable_attackers))
 
 	@staticmethod
 	def remove_blocker(game_state, creature_id):
-		mutable_blockers = list(game_state[8])
+		mutable_blockers = list(game_state.blockers)
 		mutable_blockers.remove(creature_id)
-		mutable_state = list(game_state)
-		mutable_state[8] = tuple(mutable_blockers)
-		return tuple(mutable_state)
+		return game_state.replace(blockers=tuple(mutable_blockers))
 
 	@staticmethod
 	def remove_block(game_state, block_tuple):
-		mutable_blocks = list(game_state[9])
+		mutable_blocks = list(game_state.blocks)
 		mutable_blocks.remove(block_tuple)
-		mutable_state = list(game_state)
-		mutable_state[9] = tuple(mutable_blocks)
-		return tuple(mutable_state)
+		return game_state.replace(blocks=tuple(mutable_blocks))
 
 	@staticmethod
 	def remove_from_block(game_state, creature_to_remove, block):
-		mutable_blocks = list(game_state[9])
+		mutable_blocks = list(game_state.blocks)
 		mutable_blocks.remove(block)
 
-		mutable_block = list(block)
-		mutable_blocker_list = list(mutable_block[1])
+		mutable_blocker_list = list(block[1])
 		mutable_blocker_list.remove(Card.id(creature_to_remove))
-		mutable_block[1] = tuple(mutable_blocker_list)
-
-		mutable_blocks.append(tuple(mutable_block))
+		mutable_blocks.append((block[0], tuple(mutable_blocker_list)))
 		
-		mutable_state = list(game_state)
-		mutable_state[9] = tuple(mutable_blocks)
-		return tuple(mutable_state)
+		return game_state.replace(blocks=tuple(mutable_blocks))
 
 	@staticmethod
 	def add_land(game_state, land_state):
-		lands = list(game_state[6])
-		lands.append(land_state)
-		mutable_state = list(game_state)
-		mutable_state[6] = tuple(lands)
-		return tuple(mutable_state)
+		return game_state.append_to_zone('lands', land_state)
 
 	@staticmethod
 	def set_creature_with_id(game_state, target_creature_state, target_creature_id):
-		index = 0
-		for c in game_state[5]:
-			if Card.id(c) == target_creature_id:
-				break
-			index += 1
-		if Card.name(c) != Card.name(target_creature_state):
+		index = game_state.zone_index('creatures').get(target_creature_id)
+		if index is None or Card.name(game_state.creatures[index]) != Card.name(target_creature_state):
 			exit(0)
-		mutable_creatures = list(game_state[5])
-		mutable_creatures[index] = target_creature_state
-		mutable_state = list(game_state)
-		mutable_state[5] = tuple(mutable_creatures)
-		return tuple(mutable_state)
+		return game_state.replace_in_zone('creatures', index, target_creature_state)
 
 	@staticmethod
 	def remove_creature(game_state, card_state):
-		mutable_creatures = list(game_state[5])
-		mutable_creatures.remove(card_state)
-		mutable_game_state = list(game_state)
-		mutable_game_state[5] = tuple(mutable_creatures)
-		return tuple(mutable_game_state)
+		index = game_state.zone_index('creatures')[Card.id(card_state)]
+		return game_state.remove_from_zone('creatures', index)
 
 	@staticmethod
 	def remove_land(game_state, card_state):
-		mutable_lands = list(game_state[6])
-		mutable_lands.remove(card_state)
-		mutable_game_state = list(game_state)
-		mutable_game_state[6] = tuple(mutable_lands)
-		return tuple(mutable_game_state)
+		index = game_state.zone_index('lands')[Card.id(card_state)]
+		return game_state.remove_from_zone('lands', index)
 
 	@staticmethod
 	def set_creatures(game_state, new_creatures):
-		mutable_state = list(game_state)
-		mutable_state[5] = tuple(new_creatures)
-		return tuple(mutable_state)
+		return game_state.replace(creatures=tuple(new_creatures))
 
 	@staticmethod
 	def set_lands(game_state, new_lands):
-		mutable_state = list(game_state)
-		mutable_state[6] = tuple(new_lands)
-		return tuple(mutable_state)
+		return game_state.replace(lands=tuple(new_lands))
 
 	@staticmethod
 	def tap_lands_for_mana(state, mana_to_tap):
@@ -650,13 +509,9 @@ class Game():
 		for mana in mana_to_tap[0]:
 			if mana.startswith("L"):
 				state = Game.increment_hit_points(state, pwp, -1 * int(mana[1:]))
-				if Game.print_moves(state):
-					print("> {} lost {} life from casting a Phyrexian, now at {}." \
-						.format(
-							Game.player_display_name(caster_state, Game.player_with_priority(state)), 
-							int(mana[1:]),
-							Game.hit_points(caster_state)
-						))
+				sink = Game.event_sink(state)
+				if sink.enabled:
+					sink.emit('life_changed', state, player=pwp, amount=-int(mana[1:]), card=None)
 			else:
 				colored.append(mana)
 
@@ -680,17 +535,15 @@ class Game():
 
 
 			used_land = False
-			for land_state in Game.get_lands(state):
-				if Card.owner(land_state) == pwp and not Card.tapped(land_state):
-					used_land = False
-					for c in mana:
-						if c in Land.mana_provided(land_state):
-							colored.pop(0)
-							used_land = True
-							state = Game.set_land_tapped(state, land_state, True)
-							break
-					if used_land:
+			for land_state in Game.untapped_lands(state, pwp):
+				for c in mana:
+					if c in Land.mana_provided(land_state):
+						colored.pop(0)
+						used_land = True
+						state = Game.set_land_tapped(state, land_state, True)
 						break
+				if used_land:
+					break
 
 
 		while colorless > 0:
@@ -722,10 +575,9 @@ class Game():
 				caster_state = Game.get_player_states(state)[pwp]
 				continue
 
-			for land_state in Game.get_lands(state):
-				if Card.owner(land_state) == pwp and not Card.tapped(land_state):
-					state = Game.set_land_tapped(state, land_state, True)
-					colorless -= 1
+			for land_state in Game.untapped_lands(state, pwp):
+				state = Game.set_land_tapped(state, land_state, True)
+				colorless -= 1
 
 		return state
 
@@ -737,9 +589,8 @@ class Game():
 		"""
 		mana = collections.Counter()
 		pwp = Game.player_with_priority(state)
-		for land_state in Game.get_lands(state):
-			if Card.owner(land_state) == pwp and not Card.tapped(land_state):
-				mana.update(Land.mana_provided(land_state))
+		for land_state in Game.untapped_lands(state, pwp):
+			mana.update(Land.mana_provided(land_state))
 
 		mana_dict = dict(mana)
 
@@ -762,7 +613,7 @@ class Game():
 			# lands don't go on stack
 			card_index = move[1]
 			card_state = Game.get_hand(game_state, pwp)[card_index]
-			if card_state[5] == 'land':				
+			if Card.card_type(card_state) == 'land':				
 				return Game.play_card_move_from_stack(game_state, move)
 
 		game_state = Game.add_to_stack(game_state, move)
@@ -774,9 +625,9 @@ class Game():
 
 	@staticmethod
 	def play_next_on_stack(state):
-		stack_list = list(Game.get_stack(state))
-		move = stack_list.pop()
-		state = Game.set_stack(state, tuple(stack_list))
+		stack = Game.get_stack(state)
+		move = stack[-1]
+		state = Game.set_stack(state, stack[:-1])
 		if move[0].startswith('card'):
 			state = Game.play_card_move_from_stack(state, move)
 		elif move[0].startswith('ability'):
@@ -894,7 +745,7 @@ class Game():
 		possible_moves = Game.add_cast_actions(game_state, set())
 		possible_moves = Game.add_instant_creature_abilities(game_state, possible_moves)
 		possible_moves = Game.add_land_abilities(game_state, possible_moves)
-		if phase == "precombat" and len(Game.add_attack_actions(game_state, set())) > 0:
+		if phase == "precombat" and Game.can_announce_attackers(game_state):
 			possible_moves.add(('declare_attack', pwp, 0))			
 		elif phase == "combat_resolution":
 			possible_moves.add(('resolve_combat', pwp, 0),)
@@ -909,8 +760,8 @@ class Game():
 		"""Returns True if the player_with_priority has played a land this turn."""
 		pwp = Game.player_with_priority(game_state)
 		curr_turn = Game.get_current_turn(game_state)
-		for land_state in Game.get_lands(game_state):
-			if Card.owner(land_state) == pwp and Card.turn_played(land_state) == curr_turn:
+		for land_state in Game.get_player_lands(game_state, pwp):
+			if Card.turn_played(land_state) == curr_turn:
 				return True
 
 		for card_state in Game.get_hand(game_state, pwp):
@@ -920,23 +771,28 @@ class Game():
 
 	@staticmethod
 	def add_cast_actions(game_state, possible_moves):
-		"""Return a list of possible cast actions based on the player_with_priority's hand."""
-		card_types_added = []
+		"""
+			Return a list of possible cast actions based on the player_with_priority's hand.
+
+			Copies of a card can all be cast or none can, so only the first of each kind is tried,
+
+			and its possible_moves are only found once.
+		"""
+		kinds_tried = set()
 		pwp = Game.player_with_priority(game_state)
 		hand = Game.get_hand(game_state, pwp) 
-		for card_state in hand:
-			if Card.name(card_state) not in card_types_added:
-				if Game.get_phase(game_state) in ['attack_step', 'combat_resolution']:
-					if Card.card_type(card_state) != 'instant':
-						continue
-				cast_moves = Card.cast_moves(card_state, game_state, hand.index(card_state), Game)
-				if len(cast_moves) > 0:
-					actions = Game.card_actions(game_state, move=cast_moves[0])
-					if len(actions) == 1:
-						possible_moves.add(actions[0])				
-					else:
-						[possible_moves.add(m) for m in Card.cast_moves(card_state, game_state, hand.index(card_state), Game)]
-					card_types_added.append(Card.name(card_state))
+		for card_index, card_state in enumerate(hand):
+			if Card.kind(card_state) in kinds_tried:
+				continue
+			kinds_tried.add(Card.kind(card_state))
+			if Game.get_phase(game_state) in ['attack_step', 'combat_resolution']:
+				if Card.card_type(card_state) != 'instant':
+					continue
+			actions = set(Card.possible_moves(card_state, game_state, Game))
+			if len(actions) == 1:
+				possible_moves.update(actions)
+			elif len(actions) > 1:
+				possible_moves.add(Card.cast_move(card_state, card_index, pwp))
 		return possible_moves
 
 
@@ -954,40 +810,73 @@ class Game():
 	@staticmethod
 	def add_instant_creature_abilities(game_state, possible_moves):
 		"""Return a list of possible actions based on the player_with_priority's hand."""
-		for creature_state in Game.get_creatures(game_state):
-			if Card.owner(creature_state) == Game.player_with_priority(game_state):
-				if Game.get_phase(game_state) in ['attack_step', 'combat_resolution']:
-					if Creature.activated_ability_type(creature_state) != 'instant':
-						continue
-				[possible_moves.add(m) for m in Creature.possible_ability_moves(creature_state, game_state, Game)]
+		for creature_state in Game.get_player_creatures(game_state, Game.player_with_priority(game_state)):
+			if Game.get_phase(game_state) in ['attack_step', 'combat_resolution']:
+				if Creature.activated_ability_type(creature_state) != 'instant':
+					continue
+			[possible_moves.add(m) for m in Creature.possible_ability_moves(creature_state, game_state, Game)]
 		return possible_moves
 
 	@staticmethod
 	def add_land_abilities(game_state, possible_moves):
 		"""Return a list of possible actions based on the player_with_priority's lands."""
 		land_types_added = set()
-		for land_state in Game.get_lands(game_state):
+		for land_state in Game.get_player_lands(game_state, Game.player_with_priority(game_state)):
 			if Card.name(land_state) not in land_types_added:
-				if Card.owner(land_state) == Game.player_with_priority(game_state):
-					[possible_moves.add(m) for m in Land.possible_ability_moves(land_state, game_state, Game)]
-					land_types_added.add(Card.name(land_state))
+				[possible_moves.add(m) for m in Land.possible_ability_moves(land_state, game_state, Game)]
+				land_types_added.add(Card.name(land_state))
 		return possible_moves
 
 	@staticmethod
 	def add_attack_actions(game_state, possible_moves):
 		"""Return a list of possible actions based on the player_with_priority's creatures."""
-		available_attackers = []
-		for creature_state in Game.get_creatures(game_state):
-			if Card.owner(creature_state) == Game.player_with_priority(game_state) and Creature.can_attack(creature_state, game_state, Game):
-				available_attackers.append(Card.id(creature_state))
-		
-		if len(available_attackers) > 0 and len(Game.get_attackers(game_state)) == 0:
-			for L in range(0, len(available_attackers)+1):
-				for subset in itertools.combinations(available_attackers, L):
-					if len(subset) > 0:
-						possible_moves.add(('announce_attackers', subset, 0))
+		if len(Game.get_attackers(game_state)) == 0:
+			for subset in Game.attack_subsets(game_state):
+				possible_moves.add(('announce_attackers', subset, 0))
 		return possible_moves
 
+	@staticmethod
+	def can_announce_attackers(game_state):
+		if len(Game.get_attackers(game_state)) > 0:
+			return False
+		return len(Game.attack_ready_creatures(game_state, Game.player_with_priority(game_state))) > 0
+
+	@staticmethod
+	def attack_subsets(game_state):
+		"""
+			Yield each distinct set of creature ids the player_with_priority could attack with.
+
+			Interchangeable creatures are grouped, and only one subset is yielded for each 
+
+			number of attackers taken from each group.
+		"""
+		attackers = Game.attack_ready_creatures(game_state, Game.player_with_priority(game_state))
+		return Game.interchangeable_subsets(attackers, Game.interchangeable_groups(attackers))
+
+	@staticmethod
+	def interchangeable_groups(creatures):
+		"""Split creatures into lists of interchangeable creatures, keeping their order."""
+		groups = collections.OrderedDict()
+		for creature_state in creatures:
+			groups.setdefault(Creature.interchangeable_key(creature_state), []).append(creature_state)
+		return list(groups.values())
+
+	@staticmethod
+	def interchangeable_subsets(creatures, groups):
+		"""Yield a tuple of creature ids for each count of creatures to take from each of groups, skipping the empty subset."""
+		for counts in itertools.product(*[range(len(group) + 1) for group in groups]):
+			subset = Game.interchangeable_subset(creatures, groups, counts)
+			if subset:
+				yield subset
+
+	@staticmethod
+	def interchangeable_subset(creatures, groups, counts):
+		"""Return the ids of the first count creatures of each of groups, in the order of creatures."""
+		chosen = set()
+		for group, count in zip(groups, counts):
+			chosen.update(Card.id(c) for c in group[:count])
+		return tuple(Card.id(c) for c in creatures if Card.id(c) in chosen)
+
 	@staticmethod
 	def initial_draw(game_state, moving_player):
 		"""Add some cards to each player's hand."""
@@ -1010,27 +899,25 @@ class Game():
 
 	@staticmethod
 	def get_bot_type(player_state):
-		return player_state[3]
+		return player_state.bot_type
 
 	@staticmethod
 	def increment_current_turn(state):
-		mutable = list(state)
-		mutable[0] += 1
-		return tuple(mutable)
+		return state.replace(current_turn=state.current_turn + 1)
 
 	@staticmethod
 	def get_current_turn(state):
-		return state[0]
+		return state.current_turn
 
 	@staticmethod
 	def current_turn_player(state):
 		"""The index in players for the player whose turn it is. """
-		return state[0] % 2
+		return state.current_turn % 2
 
 	@staticmethod
 	def not_current_turn_player(state):
 		"""The index in players for the player whose turn it isn't. """
-		return int(state[0] + 1) % 2
+		return int(state.current_turn + 1) % 2
 
 	@staticmethod
 	def draw_card(game_state, moving_player):
@@ -1040,50 +927,27 @@ class Game():
 		current_player = p_states[moving_player]
 		deck, current_player = Game.deck(current_player)
 		game_state = Game.set_player_state(game_state, current_player, moving_player)
+		if Game.library_size(current_player) == 0:
+			# a player who has to draw from an empty deck loses
+			return game_state.replace_player(moving_player, hit_points=0)
 
-		new_card_class, game_state = Game.draw_card_for_player(game_state, moving_player, deck)
+		new_card_kind, game_state = Game.draw_card_for_player(game_state, moving_player, deck)
 		nci = Game.get_new_card_id(game_state)
 		curr_turn = Game.get_current_turn(game_state)
-		if new_card_class in [
-				'SilhanaLedgewalker', 
-				'NettleSentinel',
-				'QuirionRanger',
-				'NestInvader',
-				'SkarrganPitSkulk',
-				'VaultSkirge',
-				'ElephantToken',
-				'BurningTreeEmissary',
-				'EldraziSpawnToken',
-			]:
-			new_card_state = Creature.get_tuple(new_card_class, moving_player, nci, -1, False, False, False)
-		elif new_card_class in [
-				'VaultSkirge',
-			]:
-			new_card_state = Creature.get_tuple(new_card_class, moving_player, nci, -1, True, False, True)
-		else:
-			new_card_state = Card.get_tuple(new_card_class, moving_player, nci, -1)
+		new_card_state = Game.drawn_card_state(new_card_kind, moving_player, nci)
 
 		game_state = Game.add_card_to_hand(game_state, new_card_state)
 		game_state = Game.increment_new_card_id(game_state)
 
+		sink = Game.event_sink(game_state)
 		if Game.get_phase(game_state) == "draw":
-			if Game.print_moves(game_state) and not Game.is_human_playing(game_state):
-				Game.print_board(game_state);
-			elif current_player.__class__.__name__ == "Human":
-				Game.print_board(game_state);
-			if Game.print_moves(game_state):
-				print("# TURN {} ################################################".format(Game.get_current_turn(game_state) + 1))
+			if sink.enabled:
+				sink.emit('turn_started', game_state, turn=Game.get_current_turn(game_state))
 			game_state = Game.clear_temp_mana(game_state, 0)
 			game_state = Game.clear_temp_mana(game_state, 1)
 		
-		if Game.print_moves(game_state) and Game.get_phase(game_state) != 'setup':			
-			if Game.is_human_playing(game_state) and current_player.__class__.__name__ != "Human":
-				print("> {} drew a card in phase {}." \
-					.format(Game.player_display_name(current_player, moving_player), Game.get_phase(game_state)))	 		
-			else:
-				print("> {} drew {} in phase {}." \
-					.format(Game.player_display_name(current_player, moving_player),
-							Card.display_name(new_card_state), Game.get_phase(game_state)))	 		
+		if sink.enabled:
+			sink.emit('drew', game_state, player=moving_player, card=new_card_state)
 
 		if Game.get_phase(game_state) == "draw":
 			game_state = Game.set_phase(game_state, "precombat")
@@ -1091,34 +955,41 @@ class Game():
 		return game_state
 
 	@staticmethod
-	def draw_card_for_player(game_state, moving_player, deck):
-		mutable_deck = list(deck)
-		card = mutable_deck.pop()
-		mutable_player = list(game_state[4][moving_player])
-		mutable_player[4] = tuple(mutable_deck)
-		tuple_player = tuple(mutable_player)
+	def drawn_card_state(kind, owner, card_id):
+		"""Return the state of a card of kind that owner just drew, with id card_id."""
+		if kind_card_types[kind] == 'creature':
+			return Creature.get_tuple(kind, owner, card_id, -1, False, False, False)
+		return Card.get_tuple(kind, owner, card_id, -1)
 
-		mutable_player_list = list(game_state[4])
-		mutable_player_list[moving_player] = tuple_player
-		tuple_player_list = tuple(mutable_player_list)
+	@staticmethod
+	def draw_card_for_player(game_state, moving_player, deck):
+		"""Return the next card of moving_player's deck, and game_state with it drawn."""
+		drawn = Game.get_player_states(game_state)[moving_player].drawn
+		card = deck[len(deck) - 1 - drawn]
+		game_state = game_state.replace_player(moving_player, drawn=drawn + 1)
+		return card, game_state
 
-		mutable_game_state = list(game_state)
-		mutable_game_state[4] = tuple_player_list
-		game_state = tuple(mutable_game_state)
+	@staticmethod
+	def library(player_state):
+		"""Return the cards left in player_state's shuffled deck, the next one to draw last."""
+		return player_state.deck[:Game.library_size(player_state)]
 
-		return card, game_state
+	@staticmethod
+	def library_size(player_state):
+		"""Return how many cards are left in player_state's shuffled deck."""
+		return len(player_state.deck) - player_state.drawn
 
 	@staticmethod
 	def deck(bot_state):
-		mutable = bot_state
-		if bot_state[4] == -1:
-			with open('src/stompy.json') as json_data:
-			    d = json.load(json_data)
-			    mutable = list (bot_state)
-			    mutable[4] = d['cards']
-			    shuffle(mutable[4])
-			    mutable[4] = tuple(mutable[4])
-		return mutable[4], mutable
+		"""Return bot_state's shuffled deck, and bot_state with it, shuffling its decklist if it hasn't been yet."""
+		if not Game.deck_shuffled(bot_state):
+			bot_state = bot_state.replace(deck=shuffled_deck(bot_state.deck))
+		return bot_state.deck, bot_state
+
+	@staticmethod
+	def deck_shuffled(player_state):
+		"""Return whether player_state's deck has been shuffled, or is still the name of its decklist."""
+		return not isinstance(player_state.deck, str)
 		
 
 	@staticmethod
@@ -1133,11 +1004,11 @@ class Game():
 				creature_state = Card.set_tapped(creature_state, True)
 				game_state = Game.set_creature_with_id(game_state, creature_state,  Card.id(creature_state))
 
-		if Game.print_moves(game_state):
-			pwp = Game.player_with_priority(game_state)
-			current_player = Game.get_player_states(game_state)[pwp]
-			print("> {} declared attackers {}.".format(Game.player_display_name(current_player, pwp),
-				", ".join([Card.display_name(Game.creature_with_id(game_state, cid)) for cid in attackers])))
+		sink = Game.event_sink(game_state)
+		if sink.enabled:
+			sink.emit('declared_attackers', game_state, 
+				player=Game.player_with_priority(game_state), 
+				attackers=[Game.creature_with_id(game_state, cid) for cid in attackers])
 		game_state = Game.set_priority(game_state, Game.not_current_turn_player(game_state))
 		game_state = Game.set_phase(game_state, "declare_blockers")
 		return game_state
@@ -1149,24 +1020,20 @@ class Game():
 		for blocker in block_tuple[1]:
 			game_state = Game.add_blocker(game_state, blocker)
 
-		if Game.print_moves(game_state):
-			pwp = Game.player_with_priority(game_state)
-			current_player = Game.get_player_states(game_state)[pwp]
-			print("> {} blocked {} with {}." \
-				.format(Game.player_display_name(current_player, pwp), 
-					Card.display_name(Game.creature_with_id(game_state, block_tuple[0])), 
-					", ".join([Card.display_name(Game.creature_with_id(game_state, cid)) for cid in block_tuple[1]])
-				))
+		sink = Game.event_sink(game_state)
+		if sink.enabled:
+			sink.emit('blocked', game_state, 
+				player=Game.player_with_priority(game_state), 
+				attacker=Game.creature_with_id(game_state, block_tuple[0]),
+				blockers=[Game.creature_with_id(game_state, cid) for cid in block_tuple[1]])
 		return game_state
 
 	@staticmethod
 	def finish_blocking(game_state, player_number):
 		"""Shift priority to the defending player and update the phase."""
-		if Game.print_moves(game_state):
-			pwp = Game.player_with_priority(game_state)
-			current_player = Game.get_player_states(game_state)[pwp]
-			print("> {} finished blocking." \
-				.format(Game.player_display_name(current_player, pwp)))
+		sink = Game.event_sink(game_state)
+		if sink.enabled:
+			sink.emit('finished_blocking', game_state, player=Game.player_with_priority(game_state))
 		game_state = Game.set_phase(game_state, 'combat_resolution')
 		game_state = Game.set_priority(game_state, Game.current_turn_player(game_state))		
 		return game_state
@@ -1174,11 +1041,9 @@ class Game():
 	@staticmethod
 	def declare_attack(game_state, player_number):
 		"""Shift priority to the defending player and update the phase."""
-		if Game.print_moves(game_state):
-			pwp = Game.player_with_priority(game_state)
-			current_player = Game.get_player_states(game_state)[pwp]
-			print("> {} announced attack." \
-				.format(Game.player_display_name(current_player, pwp)))
+		sink = Game.event_sink(game_state)
+		if sink.enabled:
+			sink.emit('announced_attack', game_state, player=Game.player_with_priority(game_state))
 		game_state = Game.set_phase(game_state, 'attack_step')
 		game_state = Game.set_priority(game_state, Game.not_current_turn_player(game_state))
 		return game_state
@@ -1239,20 +1104,9 @@ class Game():
 
 		game_state = Game.increment_damage_to_player(game_state, opponent_index, total_attack)
 
-		if Game.print_moves(game_state):
-			dead_names = ", ".join([Card.display_name(Game.creature_with_id(game_state, d)) for d in dead_creatures])
-			if len(dead_creatures) == 0:
-				dead_names = "nothing"
-			pwp = Game.player_with_priority(game_state)
-			if total_attack > 0:
-				print("> {} attacked for {} (killed: {})." \
-					.format(Game.player_display_name(current_player, pwp),
-							total_attack,
-							dead_names))
-			else:
-				print("> {} attacked, (killed: {})" \
-					.format(Game.player_display_name(current_player, pwp), 
-							dead_names))
+		sink = Game.event_sink(game_state)
+		if sink.enabled:
+			killed = [Game.creature_with_id(game_state, d) for d in dead_creatures]
 
 		if len(dead_creatures) > 0:
 			game_state = Game.set_creature_died_this_turn(game_state, True)
@@ -1271,8 +1125,8 @@ class Game():
 			if Card.id(creature_state) not in dead_creatures:
 				new_creatures.append(creature_state)
 		game_state = Game.set_creatures(game_state, new_creatures)
-		if Game.print_moves(game_state) and not Game.is_human_playing(game_state):
-			Game.print_board(game_state);
+		if sink.enabled:
+			sink.emit('attacked', game_state, player=player_number, damage=total_attack, killed=killed)
 
 		return game_state
 
@@ -1286,9 +1140,12 @@ class Game():
 	@staticmethod
 	def creature_with_id(game_state, creature_id):
 		"""Return the creature in creatures with id equal to creature_id."""
-		for creature_state in Game.get_creatures(game_state):
-			if Card.id(creature_state) == creature_id:
-				return creature_state
+		return game_state.card_with_id('creatures', creature_id)
+
+	@staticmethod
+	def land_with_id(game_state, land_id):
+		"""Return the land in lands with id equal to land_id."""
+		return game_state.card_with_id('lands', land_id)
 
 	@staticmethod
 	def pass_priority_as_attacker(game_state, moving_player):
@@ -1310,25 +1167,22 @@ class Game():
 		new_creatures = []
 		for creature_state in Game.get_creatures(game_state):
 			new_creatures.append(Creature.adjust_for_end_turn(creature_state))
-		game_state = Game.set_creatures(game_state, new_creatures)
+		game_state = game_state.update_zone('creatures', new_creatures)
 
 		new_lands = []
 		for land_state in Game.get_lands(game_state):
 			new_lands.append(Card.adjust_for_end_turn(land_state))
-		game_state = Game.set_lands(game_state, new_lands)
-
-		for idx, card_list in enumerate([Game.get_creatures(game_state), Game.get_lands(game_state)]):
-			new_card_list = []
-			for card_state in card_list:
-				if Card.owner(card_state) == Game.player_with_priority(game_state):
-					new_card_state = Card.adjust_for_untap_phase(card_state)
-					new_card_list.append(new_card_state)
-				else:
-					new_card_list.append(card_state)				
-			if idx == 0:
-				game_state = Game.set_creatures(game_state, new_card_list)
-			else:
-				game_state = Game.set_lands(game_state, new_card_list)
+		game_state = game_state.update_zone('lands', new_lands)
+
+		pwp = Game.player_with_priority(game_state)
+		for zone in ['creatures', 'lands']:
+			untapped = {}
+			for card_state in game_state.zone_for_owner(zone, pwp):
+				new_card_state = Card.adjust_for_untap_phase(card_state)
+				if new_card_state != card_state:
+					untapped[Card.id(card_state)] = new_card_state
+			if untapped:
+				game_state = game_state.update_zone(zone, [untapped.get(Card.id(c), c) for c in getattr(game_state, zone)])
 
 		game_state = Game.clear_damage_to_players(game_state)
 		game_state = Game.set_creature_died_this_turn(game_state, False)
@@ -1344,39 +1198,42 @@ class Game():
 		"""
 		pwp = Game.player_with_priority(game_state)
 		possible_moves = [('finish_blocking', pwp, 0)]
-
-		blockers = []
-		for c_state in Game.get_creatures(game_state):
-			if Card.owner(c_state) == pwp:
-				if Card.id(c_state) not in Game.get_blockers(game_state):
-					blockers.append(Card.id(c_state))
-		if len(blockers) == 0:
-			return possible_moves
-		
-		blocker_combos = []
-		for i in range(1,len(blockers)+1):
-			blocker_combos += itertools.combinations(blockers, i)
-
-		possible_blocks = itertools.product(Game.get_attackers(game_state), blocker_combos)
-		for block in possible_blocks:
-			if Game.block_is_legal(game_state, block):
-				possible_moves.append(('assign_blockers', block, 0))
-
+		for block in Game.block_assignments(game_state):
+			possible_moves.append(('assign_blockers', block, 0))
 		return possible_moves
 
 	@staticmethod
-	def block_is_legal(game_state, block):
-		attacker_state = Game.creature_with_id(game_state, block[0])
-		blockers = [Game.creature_with_id(game_state, x) for x in block[1]]
+	def block_assignments(game_state):
+		"""
+			Yield each distinct (attacker id, blocker ids) block the player_with_priority could assign.
+
+			Each attacker's legal blockers are found once, so illegal blockers never get combined, 
+
+			and interchangeable blockers are grouped, so only one block is yielded for each 
 
-		for blocker_state in blockers:
-			if not Creature.can_be_blocked_by(attacker_state, blocker_state):
-				return False
-		return True
+			number of blockers taken from each group.
+		"""
+		for attacker_id, eligible in Game.eligible_blockers(game_state):
+			for subset in Game.interchangeable_subsets(eligible, Game.interchangeable_groups(eligible)):
+				yield (attacker_id, subset)
+
+	@staticmethod
+	def eligible_blockers(game_state):
+		"""Yield each attacker id with the player_with_priority's creatures that could still block it."""
+		blocking = set(Game.get_blockers(game_state))
+		blockers = [
+			c for c in Game.get_player_creatures(game_state, Game.player_with_priority(game_state))
+			if Card.id(c) not in blocking
+		]
+		if len(blockers) == 0:
+			return
+		for attacker_id in Game.get_attackers(game_state):
+			attacker_state = Game.creature_with_id(game_state, attacker_id)
+			yield attacker_id, [c for c in blockers if Creature.can_be_blocked_by(attacker_state, c)]
 
 	@staticmethod
 	def opponent_was_dealt_damage(game_state):
-		return game_state[10][Game.not_current_turn_player(game_state)] > 0
+		return game_state.damage_to_players[Game.not_current_turn_player(game_state)] > 0
 
 	@staticmethod
 	def move_display_string(game_state, move):
@@ -1429,19 +1286,10 @@ class Game():
 				action_string = "{} {} {} with {}".format(Card.action_word(card_state), pronoun, Card.display_name(card_in_play), Card.display_name(card_state))
 
 			target_land_id = move[4]
-			land_to_return = None
-			tapped_string = None
-			for land_state in Game.get_lands(game_state):
-				if Card.id(land_state) == target_land_id:
-					land_to_return = land_state
-					if Card.tapped(land_state):
-						tapped_string = "tapped"
-					else:
-						tapped_string = "untapped"
-					break
-			land_string = None
+			land_to_return = Game.land_with_id(game_state, target_land_id)
 			if land_to_return:
-				action_string += ", returning {} {}".format(tapped_string, Card.display_name(land_state))
+				tapped_string = "tapped" if Card.tapped(land_to_return) else "untapped"
+				action_string += ", returning {} {}".format(tapped_string, Card.display_name(land_to_return))
 
 			return action_string
 		elif move_type.startswith('land_ability'):
@@ -0,0 +1,483 @@
+"""GameState and PlayerState are the compact, hashable states that Game's rules operate on."""
+
+from functools import lru_cache
+from hashlib import blake2b
+from src.card import Card
+from src.events import NULL_SINK
+
+# the key of the keyed hash zobrist_key draws from, so each feature gets the same key in every process
+ZOBRIST_SEED = b'CardAI zobrist'
+
+# the slots caching, for each battlefield zone, an id -> position index and the zone split by owner
+ZONE_CACHES = {
+	'creatures': ('_creatures_index', '_creatures_by_owner'),
+	'lands': ('_lands_index', '_lands_by_owner'),
+}
+
+
+@lru_cache(maxsize=1 << 16)
+def zobrist_key(*feature):
+	"""
+		Return the 64-bit Zobrist key for a feature of a state, such as a card at a position in a zone.
+
+		It is drawn from a keyed hash of the feature's repr, not hash(feature), so features that Python hashes
+
+		alike, like -1 and -2, get different keys, and the keys don't change with PYTHONHASHSEED.
+	"""
+	digest = blake2b(repr(feature).encode(), digest_size=8, key=ZOBRIST_SEED).digest()
+	return int.from_bytes(digest, 'little')
+
+
+def field_fingerprint(field, value):
+	"""XOR of the keys of a field's value, one key per position for tuple fields."""
+	if type(value) is not tuple:
+		return zobrist_key(field, value)
+	fingerprint = 0
+	for position, item in enumerate(value):
+		fingerprint ^= zobrist_key(field, position, item)
+	return fingerprint
+
+
+def field_fingerprint_delta(field, old, new):
+	"""Return what to XOR into a fingerprint when field changes from old to new."""
+	if type(old) is not tuple or type(new) is not tuple:
+		return field_fingerprint(field, old) ^ field_fingerprint(field, new)
+	old_length = len(old)
+	new_length = len(new)
+	# appending or popping the last item is the common case
+	if new_length == old_length + 1 and new[:-1] == old:
+		return zobrist_key(field, old_length, new[-1])
+	if old_length == new_length + 1 and old[:-1] == new:
+		return zobrist_key(field, new_length, old[-1])
+	delta = 0
+	for position in range(max(old_length, new_length)):
+		old_item = old[position] if position < old_length else None
+		new_item = new[position] if position < new_length else None
+		if old_item is new_item:
+			continue
+		if position < old_length:
+			delta ^= zobrist_key(field, position, old_item)
+		if position < new_length:
+			delta ^= zobrist_key(field, position, new_item)
+	return delta
+
+
+class PlayerState(object):
+	"""The state of one player: hit points, hand, mana pool, bot type, deck, and how many cards were drawn from it.
+
+	Treat it as immutable, and use replace to derive a changed copy. The deck is shuffled once
+	and shared by every state of the game, drawing from the end only counts up drawn.
+	"""
+
+	fields = (
+		'hit_points',
+		'hand',
+		'temp_mana',
+		'bot_type',
+		'deck',
+		'drawn',
+	)
+	__slots__ = fields + ('_field_fingerprints',)
+
+	def __init__(self, hit_points, hand, temp_mana, bot_type, deck, drawn=0):
+		self.hit_points = hit_points
+		self.hand = hand
+		self.temp_mana = temp_mana
+		self.bot_type = bot_type
+		self.deck = deck
+		self.drawn = drawn
+		self._field_fingerprints = None
+
+	def replace(self, **changes):
+		"""Return a copy of this PlayerState with the given fields changed."""
+		new = PlayerState(self.hit_points, self.hand, self.temp_mana, self.bot_type, self.deck, self.drawn)
+		field_fingerprints = self._field_fingerprints
+		if field_fingerprints is not None:
+			field_fingerprints = list(field_fingerprints)
+		for name, value in changes.items():
+			if field_fingerprints is not None:
+				index = PlayerState.fields.index(name)
+				field_fingerprints[index] ^= field_fingerprint_delta(name, getattr(self, name), value)
+			setattr(new, name, value)
+		if field_fingerprints is not None:
+			new._field_fingerprints = tuple(field_fingerprints)
+		return new
+
+	def values(self):
+		return (self.hit_points, self.hand, self.temp_mana, self.bot_type, self.deck, self.drawn)
+
+	def field_fingerprints(self):
+		if self._field_fingerprints is None:
+			self._field_fingerprints = tuple(
+				field_fingerprint(name, value) for name, value in zip(PlayerState.fields, self.values())
+			)
+		return self._field_fingerprints
+
+	@property
+	def fingerprint(self):
+		"""A 64-bit Zobrist fingerprint of this PlayerState, kept up to date by replace."""
+		hit_points, hand, temp_mana, bot_type, deck, drawn = self.field_fingerprints()
+		return hit_points ^ hand ^ temp_mana ^ bot_type ^ deck ^ drawn
+
+	def __getitem__(self, index):
+		return getattr(self, PlayerState.fields[index])
+
+	def __hash__(self):
+		return self.fingerprint
+
+	def __eq__(self, other):
+		if self is other:
+			return True
+		if not isinstance(other, PlayerState) or self.fingerprint != other.fingerprint:
+			return False
+		return self.values() == other.values()
+
+	def __ne__(self, other):
+		return not self == other
+
+	def __getstate__(self):
+		return self.values()
+
+	def __setstate__(self, values):
+		self.__init__(*values)
+
+	def __repr__(self):
+		return "PlayerState{}".format(self.values())
+
+
+def player_key(player_index, player_fingerprint):
+	return zobrist_key('player_states', player_index, player_fingerprint)
+
+
+class GameState(object):
+	"""The state of a game, with a named slot for each of its fields.
+
+	Treat it as immutable, and use replace to derive a changed copy. The copy shares
+	every field that didn't change, and updates the fingerprint by XORing out the old
+	keys of the changed fields and XORing in the new ones.
+
+	The event sink the rules report moves to rides along in a slot that isn't one of the
+	fields, so it doesn't affect equality or the fingerprint.
+	"""
+
+	fields = (
+		'current_turn',
+		'player_with_priority',
+		'new_card_id',
+		'phase',
+		'player_states',
+		'creatures',
+		'lands',
+		'attackers',
+		'blockers',
+		'blocks',
+		'damage_to_players',
+		'stack',
+		'creature_died_this_turn',
+		'current_spell_move',
+	)
+	__slots__ = fields + (
+		'_fingerprint',
+		'_creatures_index',
+		'_creatures_by_owner',
+		'_lands_index',
+		'_lands_by_owner',
+		'_event_sink',
+	)
+
+	def __init__(self, current_turn, player_with_priority, new_card_id, phase, player_states,
+		creatures, lands, attackers, blockers, blocks, damage_to_players, stack,
+		creature_died_this_turn, current_spell_move):
+		self.current_turn = current_turn
+		self.player_with_priority = player_with_priority
+		self.new_card_id = new_card_id
+		self.phase = phase
+		self.player_states = player_states
+		self.creatures = creatures
+		self.lands = lands
+		self.attackers = attackers
+		self.blockers = blockers
+		self.blocks = blocks
+		self.damage_to_players = damage_to_players
+		self.stack = stack
+		self.creature_died_this_turn = creature_died_this_turn
+		self.current_spell_move = current_spell_move
+		self._fingerprint = None
+		self._creatures_index = None
+		self._creatures_by_owner = None
+		self._lands_index = None
+		self._lands_by_owner = None
+		self._event_sink = NULL_SINK
+
+	def replace(self, **changes):
+		"""Return a copy of this GameState with the given fields changed."""
+		new = GameState(
+			self.current_turn,
+			self.player_with_priority,
+			self.new_card_id,
+			self.phase,
+			self.player_states,
+			self.creatures,
+			self.lands,
+			self.attackers,
+			self.blockers,
+			self.blocks,
+			self.damage_to_players,
+			self.stack,
+			self.creature_died_this_turn,
+			self.current_spell_move,
+		)
+		new._creatures_index = self._creatures_index
+		new._creatures_by_owner = self._creatures_by_owner
+		new._lands_index = self._lands_index
+		new._lands_by_owner = self._lands_by_owner
+		new._event_sink = self._event_sink
+		fingerprint = self._fingerprint
+		for name, value in changes.items():
+			if name[0] != '_':
+				for cache_name in ZONE_CACHES.get(name, ()):
+					if cache_name not in changes:
+						setattr(new, cache_name, None)
+				if fingerprint is not None:
+					fingerprint ^= self.fingerprint_delta(name, getattr(self, name), value)
+			setattr(new, name, value)
+		new._fingerprint = fingerprint
+		return new
+
+	def replace_player(self, player_index, **changes):
+		"""Return a copy of this GameState with the given fields of one PlayerState changed."""
+		players = list(self.player_states)
+		players[player_index] = players[player_index].replace(**changes)
+		return self.replace(player_states=tuple(players))
+
+	@property
+	def event_sink(self):
+		return self._event_sink
+
+	def fill_cache(self, cache_name, value):
+		"""Set the zone cache called cache_name to value, built from the zone as it is now."""
+		setattr(self, cache_name, value)
+
+	def zone_index(self, zone):
+		"""Return a dict from card id to position in zone, built at most once per zone."""
+		index_name = ZONE_CACHES[zone][0]
+		index = getattr(self, index_name)
+		if index is None:
+			index = {Card.id(card): position for position, card in enumerate(getattr(self, zone))}
+			self.fill_cache(index_name, index)
+		return index
+
+	def zone_by_owner(self, zone):
+		"""Return zone split into one tuple of cards per player, built at most once per zone."""
+		by_owner_name = ZONE_CACHES[zone][1]
+		by_owner = getattr(self, by_owner_name)
+		if by_owner is None:
+			owned = [[] for player_state in self.player_states]
+			for card in getattr(self, zone):
+				owned[Card.owner(card)].append(card)
+			by_owner = tuple(tuple(cards) for cards in owned)
+			self.fill_cache(by_owner_name, by_owner)
+		return by_owner
+
+	def zone_for_owner(self, zone, owner):
+		"""Return the cards in zone owned by the player with index owner."""
+		return self.zone_by_owner(zone)[owner]
+
+	def card_with_id(self, zone, card_id):
+		"""Return the card in zone with id card_id, or None."""
+		position = self.zone_index(zone).get(card_id)
+		if position is None:
+			return None
+		return getattr(self, zone)[position]
+
+	def append_to_zone(self, zone, card):
+		"""Return a copy of this GameState with card added to the end of zone."""
+		cards = getattr(self, zone)
+		index_name, by_owner_name = ZONE_CACHES[zone]
+		index = getattr(self, index_name)
+		if index is not None:
+			index = dict(index)
+			index[Card.id(card)] = len(cards)
+		by_owner = getattr(self, by_owner_name)
+		if by_owner is not None:
+			owner = Card.owner(card)
+			by_owner = by_owner[:owner] + (by_owner[owner] + (card,),) + by_owner[owner + 1:]
+		return self.replace(**{zone: cards + (card,), index_name: index, by_owner_name: by_owner})
+
+	def replace_in_zone(self, zone, position, card):
+		"""Return a copy of this GameState with the card at position in zone replaced by card, with the same id."""
+		cards = getattr(self, zone)
+		index_name, by_owner_name = ZONE_CACHES[zone]
+		by_owner = getattr(self, by_owner_name)
+		if by_owner is not None:
+			owner = Card.owner(card)
+			owned = by_owner[owner]
+			owned_position = owned.index(cards[position])
+			owned = owned[:owned_position] + (card,) + owned[owned_position + 1:]
+			by_owner = by_owner[:owner] + (owned,) + by_owner[owner + 1:]
+		return self.replace(**{
+			zone: cards[:position] + (card,) + cards[position + 1:],
+			index_name: getattr(self, index_name),
+			by_owner_name: by_owner,
+		})
+
+	def update_zone(self, zone, cards):
+		"""Return a copy of this GameState with new versions of zone's cards, each keeping its id and position."""
+		cards = tuple(cards)
+		if cards == getattr(self, zone):
+			return self
+		index_name = ZONE_CACHES[zone][0]
+		return self.replace(**{zone: cards, index_name: getattr(self, index_name)})
+
+	def remove_from_zone(self, zone, position):
+		"""Return a copy of this GameState without the card at position in zone."""
+		cards = getattr(self, zone)
+		return self.replace(**{zone: cards[:position] + cards[position + 1:]})
+
+	@staticmethod
+	def fingerprint_delta(name, old, new):
+		if name != 'player_states':
+			return field_fingerprint_delta(name, old, new)
+		delta = 0
+		for player_index in range(max(len(old), len(new))):
+			old_player = old[player_index] if player_index < len(old) else None
+			new_player = new[player_index] if player_index < len(new) else None
+			if old_player is new_player:
+				continue
+			if old_player is not None:
+				delta ^= player_key(player_index, old_player.fingerprint)
+			if new_player is not None:
+				delta ^= player_key(player_index, new_player.fingerprint)
+		return delta
+
+	@property
+	def fingerprint(self):
+		"""A 64-bit Zobrist fingerprint of this GameState, kept up to date by replace."""
+		if self._fingerprint is None:
+			fingerprint = 0
+			for name, value in zip(GameState.fields, self.values()):
+				if name == 'player_states':
+					fingerprint ^= GameState.fingerprint_delta(name, (), value)
+				else:
+					fingerprint ^= field_fingerprint(name, value)
+			self._fingerprint = fingerprint
+		return self._fingerprint
+
+	def freeze(self):
+		"""Return an immutable GameState with the same values, which is self for a GameState."""
+		return self
+
+	def values(self):
+		return (
+			self.current_turn,
+			self.player_with_priority,
+			self.new_card_id,
+			self.phase,
+			self.player_states,
+			self.creatures,
+			self.lands,
+			self.attackers,
+			self.blockers,
+			self.blocks,
+			self.damage_to_players,
+			self.stack,
+			self.creature_died_this_turn,
+			self.current_spell_move,
+		)
+
+	def __getitem__(self, index):
+		return getattr(self, GameState.fields[index])
+
+	def __hash__(self):
+		return self.fingerprint
+
+	def __eq__(self, other):
+		if self is other:
+			return True
+		if not isinstance(other, GameState) or self.fingerprint != other.fingerprint:
+			return False
+		return self.values() == other.values()
+
+	def __ne__(self, other):
+		return not self == other
+
+	def __getstate__(self):
+		return self.values()
+
+	def __setstate__(self, values):
+		self.__init__(*values)
+
+	def __repr__(self):
+		return "GameState{}".format(self.values())
+
+
+class SimulationBoard(GameState):
+	"""A mutable GameState for playouts, that the Game rules change in place.
+
+	replace sets the changed fields on the board itself and returns it, so Game.apply_move
+	and every card's play function make their move on the board instead of copying the
+	state. Each change is logged, and undo(mark) unmakes every move made since mark().
+	Boards aren't hashable, use freeze() or the fingerprint where a key is needed.
+	Boards always start with NULL_SINK, so playouts emit no events.
+
+	Making moves in place saves the copy and little else: with fingerprints kept up to date
+	on both, a board plays random games only about 10-20% faster than GameState.replace does,
+	because most of a move's time goes to generating the legal moves, not to the state.
+	"""
+
+	__slots__ = ('undo_log',)
+
+	def __init__(self, state):
+		super(SimulationBoard, self).__init__(*state.values())
+		self._fingerprint = state.fingerprint
+		self.undo_log = []
+
+	def replace(self, **changes):
+		"""Change the given fields on this board, log the old values, and return the board."""
+		undo_log = self.undo_log
+		for name, value in changes.items():
+			old = getattr(self, name)
+			if old is value:
+				continue
+			fingerprint = self._fingerprint
+			undo_log.append((name, old, fingerprint))
+			setattr(self, name, value)
+			if name[0] != '_':
+				self._fingerprint = fingerprint ^ GameState.fingerprint_delta(name, old, value)
+				for cache_name in ZONE_CACHES.get(name, ()):
+					cache = getattr(self, cache_name)
+					if cache is not None and cache_name not in changes:
+						undo_log.append((cache_name, cache, fingerprint))
+						setattr(self, cache_name, None)
+		return self
+
+	def fill_cache(self, cache_name, value):
+		"""Set a zone cache through replace, so undo clears it with the zone it was built from."""
+		self.replace(**{cache_name: value})
+
+	def mark(self):
+		"""Return a mark to pass to undo, to return the board to how it is now."""
+		return len(self.undo_log)
+
+	def undo(self, mark=0):
+		"""Unmake every change made since mark."""
+		undo_log = self.undo_log
+		while len(undo_log) > mark:
+			name, old, fingerprint = undo_log.pop()
+			setattr(self, name, old)
+			self._fingerprint = fingerprint
+
+	def freeze(self):
+		"""Return an immutable GameState with the board's current values."""
+		state = GameState(*self.values())
+		state._fingerprint = self._fingerprint
+		state._creatures_index = self._creatures_index
+		state._creatures_by_owner = self._creatures_by_owner
+		state._lands_index = self._lands_index
+		state._lands_by_owner = self._lands_by_owner
+		return state
+
+	__hash__ = None
+
+	def __repr__(self):
+		return "SimulationBoard{}".format(self.values())
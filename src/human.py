@@ -3,7 +3,6 @@
 from src.bot import Bot
 from src.card import Card
 from src.game import Game
-from src.utils import decarded_state
 
 
 class Human(Bot):
@@ -0,0 +1,92 @@
+"""Information set MCTS: search over what a player can see, playing each playout out on a guess at the rest."""
+
+from array import array
+from math import log, sqrt
+from random import choice, shuffle
+
+from src.card import Card
+from src.game import Game
+from src.mcts_node import Node
+
+
+def determinize(state, observer):
+	"""
+		Return a copy of state with what observer can't see dealt at random: the order of both decks,
+
+		and the opponent's hand, drawn from the cards in it and their deck. Cards in the opponent's hand
+
+		that have been cast and are still in it, or aren't as they were drawn, have been seen, and are kept.
+	"""
+	# spells on the stack, and the one being cast, are still in their caster's hand
+	cast = set()
+	for move in Game.get_stack(state) + (Game.get_current_spell_move(state),):
+		if move is not None and move[0].startswith('card'):
+			cast.add((move[5], move[1]))
+	player_states = list(Game.get_player_states(state))
+	for player, player_state in enumerate(player_states):
+		if not Game.deck_shuffled(player_state):
+			# not shuffled yet, so drawing from it shuffles it anyway
+			continue
+		unseen = list(Game.library(player_state))
+		hidden = []
+		if player != observer:
+			for position, card_state in enumerate(player_state.hand):
+				if (player, position) in cast:
+					continue
+				if card_state == Game.drawn_card_state(Card.kind(card_state), player, Card.id(card_state)):
+					hidden.append(position)
+					unseen.append(Card.kind(card_state))
+		shuffle(unseen)
+		hand = list(player_state.hand)
+		for position in hidden:
+			card_state = hand[position]
+			hand[position] = Game.drawn_card_state(unseen.pop(), player, Card.id(card_state))
+		player_states[player] = player_state.replace(hand=tuple(hand), deck=tuple(unseen), drawn=0)
+	return state.replace(player_states=tuple(player_states))
+
+
+class InformationSetNode(Node):
+	"""
+		A Node for everything a player can't tell apart after the same moves, so its moves are
+
+		those legal in any of the determinizations searched through it, added as playouts find them.
+
+		A move is picked by UCT, counting the playouts it was legal in rather than all of the Node's.
+	"""
+
+	__slots__ = ('indexes', 'availability')
+
+	def __init__(self, player, moves=()):
+		Node.__init__(self, player, ())
+		self.moves = []
+		self.children = []
+		self.indexes = {}
+		self.availability = array('l')
+		for move in moves:
+			self.index(move)
+
+	def index(self, move):
+		"""Return the index of move, adding it if no playout has found it legal before."""
+		index = self.indexes.get(move)
+		if index is None:
+			index = self.indexes[move] = len(self.moves)
+			self.moves.append(move)
+			self.children.append(None)
+			self.visits.append(0)
+			self.wins.append(0)
+			self.availability.append(0)
+		return index
+
+	def select(self, C, legal):
+		"""Return the index of the move to make next out of legal, a random untried one if any are left, else the best by UCT."""
+		available = [self.index(move) for move in legal]
+		visits, wins, availability = self.visits, self.wins, self.availability
+		for index in available:
+			availability[index] += 1
+		untried = [index for index in available if not visits[index]]
+		if untried:
+			return choice(untried)
+		return max(
+			available,
+			key=lambda i: wins[i] / visits[i] + C * sqrt(log(availability[i]) / visits[i])
+		)
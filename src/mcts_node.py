@@ -0,0 +1,214 @@
+"""Node is a state in a Monte Carlo search tree, with the statistics of the moves made from it."""
+
+from array import array
+from math import log, sqrt
+from random import random, randrange
+from src.utils import deep_size
+
+
+class Node(object):
+	"""
+		A state in the search tree, where player chooses one of moves.
+
+		The statistics of each move are kept in arrays indexed like moves: how many playouts
+
+		made the move, how many of those player won, counting a playout that was cut short as
+
+		the chance the evaluator gave player of winning it, and the Node the move leads to, which
+
+		is None until a playout first makes the move.
+
+		Given keys, a key for each move, a Node also keeps RAVE statistics: for each move, how many
+
+		playouts through the Node had player make a move with its key at any point after, and their wins.
+
+		Given priors, a guess at how good each move is, the untried moves are tried best first.
+
+		generation is the number of the last search a playout went through the Node in, for TreeBudget.
+	"""
+
+	__slots__ = (
+		'player', 'moves', 'children', 'visits', 'wins', 'total_visits', 'untried', 'keys', 'rave_visits', 'rave_wins',
+		'generation',
+	)
+
+	def __init__(self, player, moves, keys=None, priors=None):
+		self.player = player
+		self.moves = tuple(moves)
+		self.children = [None] * len(self.moves)
+		self.visits = array('l', [0]) * len(self.moves)
+		self.wins = array('d', [0]) * len(self.moves)
+		self.total_visits = 0
+		self.generation = 0
+		# indexes of the moves no playout has made yet
+		self.untried = list(range(len(self.moves)))
+		if priors is not None:
+			# popped from the end, so the best first, and the first of equally good ones
+			self.untried.sort(key=lambda i: (priors[i], -i))
+		self.keys = keys
+		if keys is not None:
+			self.rave_visits = array('l', [0]) * len(self.moves)
+			self.rave_wins = array('d', [0]) * len(self.moves)
+
+	def select(self, C, rave_k=None, widening=None):
+		"""
+			Return the index of the move to make next, a random untried move if any are left, else the best by UCT.
+
+			With rave_k and keys, the untried move with the best RAVE win rate is made first, and each
+
+			move's win rate is blended with its RAVE win rate, which counts for half once it has rave_k visits.
+
+			With widening, a pair (k, alpha), only about k * visits ** alpha moves are tried, the untried
+
+			moves in order, and the search picks among those it has tried until it has visited this Node more.
+		"""
+		untried = self.untried
+		if untried and widening is not None:
+			k, alpha = widening
+			# with nothing tried yet, there are no stats to pick by, so try one
+			if len(self.moves) - len(untried) < max(1, k * (self.total_visits + 1) ** alpha):
+				return untried.pop()
+		elif untried:
+			if rave_k is not None and self.keys is not None:
+				position = max(range(len(untried)), key=lambda p: (self.rave_rate(untried[p]), random()))
+			else:
+				position = randrange(len(untried))
+			untried[position], untried[-1] = untried[-1], untried[position]
+			return untried.pop()
+		visits, wins = self.visits, self.wins
+		log_total = log(self.total_visits)
+		tried = [i for i in range(len(visits)) if visits[i]] if untried else range(len(visits))
+		if rave_k is None or self.keys is None:
+			return max(
+				tried,
+				key=lambda i: wins[i] / visits[i] + C * sqrt(log_total / visits[i])
+			)
+		rave_visits = self.rave_visits
+		def value(i):
+			win_rate = wins[i] / visits[i]
+			if rave_visits[i]:
+				beta = sqrt(rave_k / (3 * visits[i] + rave_k))
+				win_rate = (1 - beta) * win_rate + beta * self.rave_rate(i)
+			return win_rate + C * sqrt(log_total / visits[i])
+		return max(tried, key=value)
+
+	def update(self, index, scores):
+		"""Record a playout that made the move at index, and scored scores, each player's win or chance of one."""
+		self.visits[index] += 1
+		self.total_visits += 1
+		self.wins[index] += scores[self.player]
+
+	def update_rave(self, keys_played, score):
+		"""Record a playout through this Node, in which player made moves with keys_played, and scored score."""
+		for index, key in enumerate(self.keys):
+			if key in keys_played:
+				self.rave_visits[index] += 1
+				self.rave_wins[index] += score
+
+	def rave_rate(self, index):
+		"""Return the RAVE win rate of the move at index, 1 if no playout has made a move like it."""
+		if not self.rave_visits[index]:
+			return 1.0
+		return self.rave_wins[index] / self.rave_visits[index]
+
+	def win_rate(self, index):
+		return self.wins[index] / max(self.visits[index], 1)
+
+	def best_move(self):
+		"""Return the move with the highest win rate."""
+		return self.moves[max(range(len(self.moves)), key=self.win_rate)]
+
+	def size(self):
+		"""Return the number of nodes in the tree under and including this one."""
+		size = 0
+		nodes = [self]
+		while nodes:
+			node = nodes.pop()
+			size += 1
+			nodes.extend(child for child in node.children if child is not None)
+		return size
+
+
+class TreeBudget(object):
+	"""
+		Keeps a search tree of Nodes to at most max_nodes. When a playout would add a Node past that,
+
+		whole subtrees are cut off until the tree is back under low_water of max_nodes, the stalest first,
+
+		the ones no playout has gone through since the oldest search, and of those, the least visited.
+
+		The cut off subtrees' moves keep their stats in their parents, so a later playout can grow them again.
+
+		It counts its hits, the steps of playouts into a Node the tree has, and misses, the steps that add
+
+		one, and how many Nodes it evicted, to tune max_nodes by.
+	"""
+
+	def __init__(self, max_nodes, low_water=0.9):
+		self.max_nodes = max_nodes
+		self.low_water = low_water
+		self.nodes = 0
+		self.generation = 0
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def start(self, root):
+		"""Start a new generation, for a search growing the tree under root."""
+		self.generation += 1
+		self.nodes = root.size()
+		root.generation = self.generation
+
+	def visit(self, node):
+		"""Count a playout's step into node, a Node the tree has."""
+		self.hits += 1
+		node.generation = self.generation
+
+	def add(self, root, path, node):
+		"""
+			Count node, new to the tree, and return it, first evicting subtrees of root to make room
+
+			for it if the tree is full, but none with a Node on path, the (Node, index) steps that reach it.
+		"""
+		self.misses += 1
+		if self.nodes >= self.max_nodes:
+			self.evict(root, set(id(parent) for parent, index in path))
+		self.nodes += 1
+		node.generation = self.generation
+		return node
+
+	def evict(self, root, kept):
+		"""Cut off the stalest, least visited subtrees of root until it is under low_water of max_nodes, keeping the Nodes in kept."""
+		edges = []
+		nodes = [(root, 0)]
+		while nodes:
+			node, depth = nodes.pop()
+			for index, child in enumerate(node.children):
+				if child is not None:
+					nodes.append((child, depth + 1))
+					if id(child) not in kept:
+						edges.append((child.generation, child.total_visits, -depth, node, index))
+		# children are never fresher or more visited than their parents, and the deeper go first when they
+		# tie, so every subtree is cut off after the subtrees under it that go
+		edges.sort(key=lambda edge: edge[:3])
+		target = int(self.max_nodes * self.low_water)
+		for generation, total_visits, negative_depth, parent, index in edges:
+			if self.nodes <= target:
+				break
+			child = parent.children[index]
+			removed = child.size()
+			parent.children[index] = None
+			self.nodes -= removed
+			self.evictions += removed
+
+	def hit_rate(self):
+		lookups = self.hits + self.misses
+		return self.hits / lookups if lookups else 0.0
+
+	def resident_bytes(self, root):
+		"""Return roughly how many bytes the tree under root takes, with everything its Nodes hold."""
+		return deep_size(root)
+
+	def report(self, root):
+		return "{} / {} nodes (~{} KB), {:.1%} hits, {} evictions".format(
+			self.nodes, self.max_nodes, self.resident_bytes(root) // 1024, self.hit_rate(), self.evictions)
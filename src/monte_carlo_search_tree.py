@@ -2,26 +2,150 @@
 
 import datetime
 import itertools, sys
-import pickle 
+import multiprocessing
+from multiprocessing import resource_tracker
+import random
 from src.bot import Bot
-from copy import deepcopy
-from math import log, sqrt
 from random import choice
-from src.utils import decarded_state
 
+from src.evaluation import StaticEvaluator
 from src.game import Game
+from src.game_state import SimulationBoard
+from src.information_set import InformationSetNode, determinize
+from src.mcts_node import Node, TreeBudget
+from src.rave import move_key, move_keys
+from src.rollout_policy import RolloutPolicy
+from src.shared_tree import FIRST_CHILD, MOVES_KEY, UNEXPANDED, VISITS, WINS, SharedTree, moves_key
+from src.statcache import StatCache
+from src.widening import move_priors
+
+# each player's score for a playout won by the player, and for one that was drawn or unfinished
+WIN_SCORES = {0: (1.0, 0.0), 1: (0.0, 1.0)}
+NO_SCORES = (0.0, 0.0)
+
+# the lock a worker process shares with the others growing the same SharedTree, set by set_worker_lock
+worker_lock = None
+
+
+def set_worker_lock(lock):
+	"""Start a worker process with the lock its pool shares."""
+	global worker_lock
+	worker_lock = lock
+
+
+def search_in_worker(args):
+	"""
+		Run one search from the root in a worker process, with a bot made with settings, 
+
+		and return its root visits, wins, playouts and tree size.
+	"""
+	game_state, legal, seed, settings = args
+	random.seed(seed)
+	bot = MonteCarloSearchTreeBot(**settings)
+	root = bot.new_node(game_state, legal)
+	games = bot.run_search(root, game_state, StatCache())
+	return list(root.visits), list(root.wins), games, root.size()
+
+
+def search_shared_tree_in_worker(args):
+	"""
+		Grow the SharedTree called name from the root in a worker process, with a bot made with settings,
+
+		and return how many playouts it ran.
+	"""
+	game_state, name, max_nodes, seed, settings = args
+	random.seed(seed)
+	bot = MonteCarloSearchTreeBot(**settings)
+	tree = SharedTree.attach(name, worker_lock, max_nodes)
+	try:
+		return bot.run_search(tree, game_state, StatCache())
+	finally:
+		tree.close()
+
 
 class MonteCarloSearchTreeBot(Bot):
-	def __init__(self, hit_points=0, max_moves=300, simulation_time=2, C=1.4):
+	def __init__(self, hit_points=0, max_moves=300, simulation_time=2, C=1.4, workers=1, parallelism='root', max_nodes=1 << 18, reuse_tree=True, 
+		max_playouts=None, seed=None, fast_rollouts=True, rollout_weights=None,
+		rollout_horizon=None, evaluator_weights=None, rave_k=None, widening_k=None, widening_alpha=0.5,
+		information_sets=False, verbose=True, show_simulation_results=False):
 		"""
 			Adjust simulation_time and max_moves to taste.
 
 			For C, sqrt(2) would be the theoretically correct choice, 
 
 			but higher if we want more exploration and less focus on good moves.
+
+			With workers > 1, that many processes search, and parallelism picks how: 'root' for each to
+
+			grow its own tree from the root and then merge the root stats, 'tree' for all of them to grow
+
+			one SharedTree of up to max_nodes nodes. The trees of Nodes searched in this process and in root
+
+			parallel workers are kept to max_nodes by a TreeBudget, which cuts off their stalest, least visited subtrees.
+
+			With reuse_tree, a search in this process starts from the part of the last search's tree
+
+			for the state the game has reached since, if there is one.
+
+			With max_playouts, a search runs that many playouts, however long they take, instead of
+
+			running for simulation_time. With a seed, each search seeds random from it and the state,
+
+			and the moves at every state are sorted by repr, so the same state and seed search the same
+
+			way on any machine. A search is only fully repeatable with both, and without tree parallelism,
+
+			whose workers interleave however the host schedules them.
+
+			With fast_rollouts, rollouts pick their moves with a RolloutPolicy, weighing families of moves
+
+			by rollout_weights, rather than listing every legal move to pick one.
+
+			With a rollout_horizon, rollouts stop after that many moves, and a StaticEvaluator with
+
+			evaluator_weights scores them by each player's chance of winning.
+
+			With rave_k, not with tree parallelism, searches also keep RAVE stats, for
+
+			every move_key a player goes on to use in a playout, and blend them into each move's win rate,
+
+			until a move has had about rave_k visits.
+
+			With widening_k, more than 0 and not with tree parallelism, searches try only the widening_k moves
+
+			with the best move_prior at each Node at first, and about widening_k * visits ** widening_alpha later,
+
+			so they can search deeper below Nodes with many moves, like attack subsets and Fireball amounts.
+
+			With information_sets, not with tree parallelism, rave_k or widening_k, searches don't look at the
+
+			opponent's hand or the order of the decks: each playout deals them at random, and follows a tree of
+
+			InformationSetNodes, which share their stats between all the deals. These searches don't reuse trees.
+
+			With verbose, each search prints a spinner and its playouts per second, for watching a game.
+
+			With show_simulation_results, each search also prints the hits, evictions and size of each
+
+			player's legal moves cache, which only rollouts without fast_rollouts use, those of the tree
+
+			if it was searched in this process, and each move's stats.
 		"""
 		super(MonteCarloSearchTreeBot, self).__init__()
 
+		if workers > 1 and parallelism == 'tree' and rave_k is not None:
+			raise ValueError("rave_k only works with root parallelism, a shared tree keeps no RAVE stats")
+		if widening_k is not None and widening_k <= 0:
+			raise ValueError("widening_k should be more than 0, or None to try every move")
+		if workers > 1 and parallelism == 'tree' and widening_k is not None:
+			raise ValueError("widening_k only works with root parallelism, a shared tree tries every move")
+		if workers > 1 and parallelism == 'tree' and information_sets:
+			raise ValueError("information_sets only works with root parallelism, a shared tree sees the hidden cards")
+		if information_sets and rave_k is not None:
+			raise ValueError("rave_k doesn't work with information_sets, InformationSetNodes keep no RAVE stats")
+		if information_sets and widening_k is not None:
+			raise ValueError("widening_k doesn't work with information_sets, InformationSetNodes try every move")
+
 		# the amount of time to call run_simulation as much as possible 		
 		self.calculation_time = datetime.timedelta(seconds=simulation_time)
 		self.simulation_time = simulation_time
@@ -33,14 +157,55 @@ class MonteCarloSearchTreeBot(Bot):
 		# smaller causes the AI to prefer concentrating on known good moves
 		self.C = C
 
-		# enable to log simulation results
-		self.show_simulation_results = True
+		# whether to print the legal moves caches and each move's stats after each search
+		self.show_simulation_results = show_simulation_results
+
+		# the number of processes to search in, and their pool, started on the first search
+		self.workers = workers
+		self.parallelism = parallelism
+		self.max_nodes = max_nodes
+		self.pool = None
+
+		# keeps the trees of Nodes searched in this process to max_nodes
+		self.tree_budget = TreeBudget(max_nodes)
+		self.lock = None
+
+		# the tree of the last search in this process, and the state it was searched from
+		self.reuse_tree = reuse_tree
+		self.root = None
+		self.root_state = None
+
+		# a playout budget for each search instead of simulation_time, and the seed to search with
+		self.max_playouts = max_playouts
+		self.seed = seed
+
+		# how to pick the moves of rollouts, None to pick from all the legal moves
+		self.fast_rollouts = fast_rollouts
+		self.rollout_weights = rollout_weights
+		self.rollout_policy = RolloutPolicy(rollout_weights) if fast_rollouts else None
+
+		# how many moves a rollout makes before it is cut short and scored by evaluator, None to play it out
+		self.rollout_horizon = rollout_horizon
+		self.evaluator_weights = evaluator_weights
+		self.evaluator = StaticEvaluator(evaluator_weights)
+
+		# how many visits to a move its RAVE stats are worth, None to search without them
+		self.rave_k = rave_k
+
+		# how many moves a Node tries at first, and how fast that grows with its visits, None to try them all
+		self.widening_k = widening_k
+		self.widening_alpha = widening_alpha
+		self.widening = (widening_k, widening_alpha) if widening_k is not None else None
+
+		# whether to search without seeing what the player can't
+		self.information_sets = information_sets
+
+		# whether to print each search's progress
+		self.verbose = verbose
 
 	def play_move(self, game_state, statcache):
 		"""Play a move in game."""
-		first_moving = Game.player_with_priority(game_state) == 0
 		move = self.get_play(statcache)
-		old_gs = game_state
 		game_state = Game.apply_move(game_state, move)
 		statcache.past_states.append(game_state)
 		return move, game_state
@@ -49,12 +214,11 @@ class MonteCarloSearchTreeBot(Bot):
 		"""
 			Return the best play,
 
-			after simulating possible plays and updating plays and wins stats.
+			after simulating possible plays and building a search tree of their stats.
 		"""
 		game_state = statcache.past_states[-1]
-		pwp = Game.player_with_priority(game_state)
 
-		legal = Game.legal_plays(game_state)
+		legal = self.legal_plays(game_state)
 
 		# Bail out early if there is no real choice to be made.
 		if not legal:
@@ -62,133 +226,383 @@ class MonteCarloSearchTreeBot(Bot):
 		if len(legal) == 1:
 			return legal[0]
 
-		games = 0
+		if self.seed is not None:
+			outer_random_state = random.getstate()
+			random.seed("{}:{:016x}".format(self.seed, game_state.fingerprint))
 		begin = datetime.datetime.utcnow()
-		spinner = itertools.cycle(['-', '/', '|', '\\'])
-		sys.stdout.write("Thinking ")
-		while datetime.datetime.utcnow() - begin < self.calculation_time:
-			self.run_simulation(statcache)
-			sys.stdout.write(next(spinner))
-			sys.stdout.flush()
-			sys.stdout.write('\b')
-			games += 1
+		if self.workers > 1 and self.parallelism == 'tree':
+			root, games, nodes = self.run_tree_parallel_search(game_state, legal)
+		elif self.workers > 1:
+			root, games, nodes = self.run_root_parallel_search(game_state, legal)
+		else:
+			reuse_tree = self.reuse_tree and not self.information_sets
+			root = self.advance_root(statcache) if reuse_tree else None
+			if root is None:
+				root = self.new_node(game_state, legal)
+			reused = root.total_visits
+			if self.verbose:
+				sys.stdout.write("Thinking ")
+			games = self.run_search(root, game_state, statcache, show_spinner=self.verbose)
+			nodes = root.size()
+			if reuse_tree:
+				self.root, self.root_state = root, game_state
+			if reused and self.verbose:
+				print("REUSED {} playouts from the last search".format(reused))
+
+		seconds = (datetime.datetime.utcnow() - begin).total_seconds()
+		if self.seed is not None:
+			random.setstate(outer_random_state)
 
 		first_moving = Game.player_with_priority(game_state) == 0
-		if True or first_moving:
-			print("SIMULATED {} playouts/s ({} playouts)".format(games*1.0/self.simulation_time, games))
+		if self.verbose:
+			print("SIMULATED {:.1f} playouts/s ({} playouts in {:.2f}s, {} nodes)".format(
+				games / max(seconds, 1e-9), games, seconds, nodes))
 
 
 		CURSOR_UP_ONE = '\x1b[1A'
 		ERASE_LINE = '\x1b[2K'
-		if first_moving:
+		if first_moving and self.verbose:
 			print(ERASE_LINE + CURSOR_UP_ONE)
-		
-		moves_states = []
-		game_state = Game.set_print_moves(game_state, False)
-		for p in legal:
-			new_state = Game.apply_move(game_state, p)
-			new_state = decarded_state(new_state)
-			moves_states.append((p, tuple(new_state)))
-		game_state = Game.set_print_moves(game_state, True)
 
-		player = Game.acting_player(game_state)
+		if self.show_simulation_results:
+			print(statcache.report())
+			if self.workers == 1:
+				print("tree {}".format(self.tree_budget.report(root)))
+
+			# Display the stats for each possible play.
+			for index in sorted(range(len(root.moves)), key=root.win_rate, reverse=True):
+				print("{}: {:.2f}% ({:g} / {})".format(
+					root.moves[index], 100 * root.win_rate(index), root.wins[index], root.visits[index]))
 
 		# Pick the move with the highest percentage of wins.
-		percent_wins, move = max(
-			(statcache.bot_stats(pwp).wins.get((player, S), 0) * 1.0 /
-			 statcache.bot_stats(pwp).plays.get((player, S), 1),
-			 p)
-			for p, S in moves_states
+		return root.best_move()
+
+	def legal_plays(self, state):
+		"""Return Game.legal_plays(state), sorted by repr when searching with a seed."""
+		if self.seed is None:
+			return Game.legal_plays(state)
+		return sorted(Game.legal_plays(state), key=repr)
+
+	def new_node(self, state, moves):
+		"""Return a Node for moves in state, keyed for RAVE and ranked for widening if this bot uses them."""
+		if self.information_sets:
+			return InformationSetNode(Game.acting_player(state), moves)
+		keys = move_keys(state, moves) if self.rave_k is not None else None
+		priors = move_priors(state, moves) if self.widening is not None else None
+		return Node(Game.acting_player(state), moves, keys, priors)
+
+	def worker_settings(self, max_playouts):
+		"""Return the arguments to make a bot that searches like this one in a worker, with max_playouts."""
+		return dict(
+			max_moves=self.max_moves, simulation_time=self.simulation_time, C=self.C,
+			max_playouts=max_playouts, seed=self.seed,
+			fast_rollouts=self.fast_rollouts, rollout_weights=self.rollout_weights,
+			rollout_horizon=self.rollout_horizon, evaluator_weights=self.evaluator_weights,
+			rave_k=self.rave_k, widening_k=self.widening_k, widening_alpha=self.widening_alpha,
+			information_sets=self.information_sets, max_nodes=self.max_nodes
 		)
-		'''
-		if self.show_simulation_results:
-			# Display the stats for each possible play.
-			for x in sorted(
-				((100 * statcache.bot_stats(pwp).wins.get((player, S), 0) * 1.0 /
-					statcache.bot_stats(pwp).plays.get((player, S), 1),
-					statcache.bot_stats(pwp).wins.get((player, S), 0),
-					statcache.bot_stats(pwp).plays.get((player, S), 0), 
-					p)
-				 for p, S in moves_states),
-				reverse=True
-			):
-				print("{3}: {0:.2f}% ({1} / {2})".format(*x))
-		'''
-
-		return move
-
-	def run_simulation(self, statcache):
-		state = statcache.past_states[-1]
-		state = Game.set_print_moves(state, False)
-		pwp = Game.player_with_priority(state)
-		first_moving = Game.player_with_priority(state) == 0
-
-		# A bit of an optimization here, so we have a local
-		# variable lookup instead of an attribute access each loop.
-		plays, wins, legal_moves_cache = \
-			statcache.bot_stats(pwp).plays, \
-			statcache.bot_stats(pwp).wins,  \
-			statcache.bot_stats(pwp).legal_moves_cache
-
-		visited_states = set()
-		player = Game.acting_player(state)
-
-		expand = True
-		for t in range(1, self.max_moves + 1):
-			if state not in legal_moves_cache:
-				legal_moves_cache[state] = Game.legal_plays(state)		
-			legal = legal_moves_cache[state]			
-
-			moves_states = []
-			play_randomly = False
-			
-			for p in legal:
-				if (p[1], state) in plays:
-					new_state = Game.apply_move(state, p)
-					moves_states.append((p, new_state, new_state))
-				else:
-					play_randomly = True
-					break
 
-			if play_randomly:
-				move = choice(legal)
-				state = Game.apply_move(state, move)
-			elif all(plays.get((player, S)) for p, S in moves_states):
-				# If we have stats on all of the legal moves here, use them.
-				log_total = log(
-					sum(plays[(player, S)] for p, S in moves_states))
-				value, move, state = max(
-					((wins[(player, S)] / plays[(player, S)]) +
-					 self.C * sqrt(log_total / plays[(player, S)]), p, S)
-					for p, S, ended_game in moves_states
-				)
+	def worker_playouts(self):
+		"""Return each worker's share of max_playouts, or Nones if the search is timed."""
+		if self.max_playouts is None:
+			return [None] * self.workers
+		return [
+			self.max_playouts // self.workers + (worker < self.max_playouts % self.workers)
+			for worker in range(self.workers)
+		]
+
+	def advance_root(self, statcache):
+		"""
+			Return the Node under the last search's root for the latest state in statcache.past_states,
+
+			or None if the tree has none. Each state since the root's is matched to the child whose
+
+			move leads to a state with the same fingerprint. The rest of the tree is let go.
+		"""
+		node, root_state = self.root, self.root_state
+		self.root = self.root_state = None
+		past_states = statcache.past_states
+		indexes = [index for index, state in enumerate(past_states) if state is root_state]
+		if node is None or not indexes:
+			return None
+
+		board = SimulationBoard(root_state)
+		for state in past_states[indexes[-1] + 1:]:
+			fingerprint = state.fingerprint
+			for move, child in zip(node.moves, node.children):
+				if child is None:
+					continue
+				mark = board.mark()
+				Game.apply_move(board, move)
+				if board.fingerprint == fingerprint:
+					node = child
+					break
+				board.undo(mark)
 			else:
-				# Otherwise, just make an arbitrary decision.
-				move, state, ended_game = choice(moves_states)
+				return None
+		return node
 
-			# `player` here and below refers to the player
-			# who moved into that particular state.
-			state_clone = decarded_state(state)
-			# print("moving {}".format(move))
-			# print("moving {} to state {}".format(move, state_clone))
+	def run_search(self, root, game_state, statcache, show_spinner=False):
+		"""
+			Play out games from root for simulation_time, or max_playouts of them, and return how many were run.
+
+			root is a Node, an InformationSetNode to grow with run_information_set_simulation,
 
-			if expand and (player, state_clone) not in plays:
-				expand = False
+			or a SharedTree to grow with run_shared_simulation.
+		"""
+		if isinstance(root, SharedTree):
+			simulate = self.run_shared_simulation
+		elif isinstance(root, InformationSetNode):
+			simulate = self.run_information_set_simulation
+			self.tree_budget.start(root)
+		else:
+			simulate = self.run_simulation
+			self.tree_budget.start(root)
+		games = 0
+		begin = datetime.datetime.utcnow()
+		spinner = itertools.cycle(['-', '/', '|', '\\'])
+		while (
+			games < self.max_playouts if self.max_playouts is not None
+			else datetime.datetime.utcnow() - begin < self.calculation_time
+		):
+			simulate(root, game_state, statcache)
+			if show_spinner:
+				sys.stdout.write(next(spinner))
+				sys.stdout.flush()
+				sys.stdout.write('\b')
+			games += 1
+		return games
+
+	def start_pool(self):
+		"""Start the worker processes, and the lock they share, unless they are running already."""
+		if self.pool is None:
+			# share this process's resource tracker with the workers, so the SharedTree blocks they attach to
+			# are only tracked, and unlinked, once
+			resource_tracker.ensure_running()
+			self.lock = multiprocessing.Lock()
+			self.pool = multiprocessing.Pool(self.workers, initializer=set_worker_lock, initargs=(self.lock,))
+
+	def run_root_parallel_search(self, game_state, legal):
+		"""
+			Search from the root in each worker process, with its own random seed, and return 
 
-				plays[(player, state_clone)] = 0
-				wins[(player, state_clone)] = 0
+			a root Node with the workers' visits and wins for each move added up, the total playouts,
 
-			visited_states.add((player, state_clone))
-			player = Game.acting_player(state)
+			and the total nodes in the workers' trees.
+		"""
+		self.start_pool()
+		jobs = [
+			(game_state, legal, random.getrandbits(64), self.worker_settings(max_playouts))
+			for max_playouts in self.worker_playouts()
+		]
+		root = Node(Game.acting_player(game_state), legal)
+		games = 0
+		nodes = 0
+		for visits, wins, worker_games, worker_nodes in self.pool.map(search_in_worker, jobs):
+			for index in range(len(legal)):
+				root.visits[index] += visits[index]
+				root.wins[index] += wins[index]
+			games += worker_games
+			nodes += worker_nodes
+		root.total_visits = sum(root.visits)
+		return root, games, nodes
+
+	def run_tree_parallel_search(self, game_state, legal):
+		"""
+			Grow one SharedTree from the root in all the worker processes, and return a root Node
 
-			winner = Game.winner(state)
-			
-			if winner >= 0:
+			with the stats of the tree's root moves, the total playouts, and the size of the tree.
+		"""
+		self.start_pool()
+		legal = sorted(legal, key=repr)
+		tree = SharedTree.create(self.lock, self.max_nodes)
+		try:
+			tree.expand(0, moves_key(legal), len(legal))
+			jobs = [
+				(game_state, tree.name, self.max_nodes, random.getrandbits(64), self.worker_settings(max_playouts))
+				for max_playouts in self.worker_playouts()
+			]
+			games = sum(self.pool.map(search_shared_tree_in_worker, jobs))
+			root = Node(Game.acting_player(game_state), legal)
+			for index, child in enumerate(tree.children(0)):
+				root.visits[index] = tree.get(child, VISITS)
+				root.wins[index] = tree.get(child, WINS)
+			root.total_visits = sum(root.visits)
+			nodes = tree.size()
+		finally:
+			tree.close(unlink=True)
+		return root, games, nodes
+
+	def close(self):
+		"""Stop the worker processes, if any were started."""
+		if self.pool is not None:
+			self.pool.close()
+			self.pool.join()
+			self.pool = None
+
+	def run_simulation(self, root, state, statcache):
+		"""Play out one game from state, walking down the tree from root and adding a Node for the first new state."""
+		# make the playout's moves in place, rather than copying the state for every move
+		board = SimulationBoard(state)
+
+		# the player and move_key of each move of the playout, for RAVE
+		played = [] if self.rave_k is not None else None
+
+		# selection: follow the tree while the moves lead to states it has a Node for
+		path = []
+		node = root
+		winner = Game.winner(board)
+		while winner == -1:
+			index = node.select(self.C, self.rave_k, self.widening)
+			if played is not None:
+				played.append((node.player, node.keys[index]))
+			Game.apply_move(board, node.moves[index])
+			path.append((node, index))
+			winner = Game.winner(board)
+			child = node.children[index]
+			if child is None:
+				# expansion: add a Node for the state the playout just reached, making room for it if the tree is full
+				if winner == -1:
+					node.children[index] = self.tree_budget.add(root, path, self.new_node(board, self.legal_plays(board)))
 				break
+			self.tree_budget.visit(child)
+			node = child
+
+		# rollout: play randomly from there
+		scores = self.rollout(board, winner, len(path), statcache.bot_stats(Game.player_with_priority(state)), played)
+
+		# backpropagation
+		if played is None:
+			for node, index in path:
+				node.update(index, scores)
+			return
+		# each Node's RAVE stats count the keys of the moves its player made from it on
+		keys_played = (set(), set())
+		for player, key in played[len(path):]:
+			keys_played[player].add(key)
+		for depth in range(len(path) - 1, -1, -1):
+			node, index = path[depth]
+			keys_played[node.player].add(node.keys[index])
+			node.update(index, scores)
+			node.update_rave(keys_played[node.player], scores[node.player])
+
+	def run_information_set_simulation(self, root, state, statcache):
+		"""
+			Play out one game from a determinization of state for the player at root, walking down
 
-		for player, state in visited_states:
-			if (player, state) not in plays:
-				continue
-			plays[(player, state)] += 1
-			if player == winner:
-				wins[(player, state)] += 1
+			the tree from root and adding an InformationSetNode for the first new state, like run_simulation.
+		"""
+		board = SimulationBoard(determinize(state, root.player))
+
+		# selection, among the moves legal in this determinization
+		path = []
+		node = root
+		winner = Game.winner(board)
+		while winner == -1:
+			index = node.select(self.C, self.legal_plays(board))
+			Game.apply_move(board, node.moves[index])
+			path.append((node, index))
+			winner = Game.winner(board)
+			child = node.children[index]
+			if child is None:
+				# expansion
+				if winner == -1:
+					node.children[index] = self.tree_budget.add(root, path, InformationSetNode(Game.acting_player(board)))
+				break
+			self.tree_budget.visit(child)
+			node = child
+
+		# rollout
+		scores = self.rollout(board, winner, len(path), statcache.bot_stats(Game.player_with_priority(state)))
+
+		# backpropagation
+		for node, index in path:
+			node.update(index, scores)
+
+	def run_shared_simulation(self, tree, state, statcache):
+		"""
+			Play out one game from state, walking down tree from its root and expanding the first
+
+			unexpanded node, like run_simulation, with the moves at each node sorted by repr.
+		"""
+		board = SimulationBoard(state)
+
+		# selection
+		path = []
+		node = 0
+		winner = Game.winner(board)
+		while winner == -1:
+			moves, key = self.shared_moves(tree, node, board)
+			if tree.get(node, MOVES_KEY) != key:
+				# the node was expanded in a state with other moves, after a different shuffle, so its
+				# children aren't these moves, and the playout goes on from here
+				break
+			player = Game.acting_player(board)
+			index = tree.select(node, self.C)
+			Game.apply_move(board, moves[index])
+			node = tree.children(node)[index]
+			path.append((node, player))
+			winner = Game.winner(board)
+			if tree.get(node, FIRST_CHILD) == UNEXPANDED:
+				# expansion, unless the table is full, when the playout just goes on from here
+				if winner == -1:
+					moves, key = self.shared_moves(tree, node, board)
+					tree.expand(node, key, len(moves))
+				break
+
+		# rollout
+		scores = self.rollout(board, winner, len(path), statcache.bot_stats(Game.player_with_priority(state)))
+
+		# backpropagation
+		tree.update(path, scores)
+
+	def shared_moves(self, tree, node, board):
+		"""
+			Return the legal moves on board sorted by repr, and their moves_key, listed and sorted
+
+			only the first time this process reaches node of tree in the state board is in.
+		"""
+		listed = tree.listed_moves.get(node)
+		if listed is None or listed[0] != board.fingerprint:
+			moves = sorted(Game.legal_plays(board), key=repr)
+			listed = (board.fingerprint, moves, moves_key(moves))
+			tree.listed_moves[node] = listed
+		return listed[1], listed[2]
+
+	def rollout(self, board, winner, moves_made, stats, played=None):
+		"""
+			Play random moves on board until the game is over or it has had max_moves, and return 
+
+			each player's score, 1 for a win and 0 for a loss, draw or unfinished game. With a rollout_horizon,
+
+			stop after that many random moves, and score each player's chance of winning by the evaluator.
+
+			The moves come from the rollout_policy, or without one, from the legal moves of each state,
+
+			cached in the legal_moves_cache of stats. Given played, a list, each move's player and
+
+			move_key are added to it.
+		"""
+		policy = self.rollout_policy
+		ordered = self.seed is not None
+		legal_moves_cache = stats.legal_moves_cache
+		horizon = self.max_moves if self.rollout_horizon is None else moves_made + self.rollout_horizon
+		for t in range(moves_made, self.max_moves):
+			if winner != -1:
+				break
+			if t >= horizon:
+				return self.evaluator.win_probabilities(board)
+			if policy is not None:
+				move = policy.sample(board, ordered)
+			else:
+				state_key = stats.state_key(board)
+				moves = legal_moves_cache.get(state_key)
+				if moves is None:
+					moves = self.legal_plays(board)
+					legal_moves_cache.put(state_key, moves)
+				move = choice(moves)
+			if played is not None:
+				played.append((Game.acting_player(board), move_key(board, move)))
+			Game.apply_move(board, move)
+			winner = Game.winner(board)
+		return WIN_SCORES.get(winner, NO_SCORES)
@@ -0,0 +1,31 @@
+"""move_key names what a move does, so RAVE can share its stats between moves that do the same thing in different states."""
+
+from src.card import Card
+from src.game import Game
+
+
+def move_key(state, move):
+	"""
+		Return the key of move in state, alike for moves that do the same thing anywhere in a game.
+
+		Spells and abilities are keyed by the card, the mana paid and the kind and owner of the creature
+
+		they target, attacks by how many creatures attack, and blocks by the kind of the attacker and how many block it.
+	"""
+	move_type = move[0]
+	if move_type == 'announce_attackers':
+		return (move_type, len(move[1]))
+	if move_type == 'assign_blockers':
+		attacker = Game.creature_with_id(state, move[1][0])
+		return (move_type, Card.kind(attacker), len(move[1][1]))
+	if move_type.startswith('card') or move_type.startswith('ability') or move_type.startswith('land_ability'):
+		target = Game.creature_with_id(state, move[3]) if move[3] is not None else None
+		if target is None:
+			return (move_type, move[2])
+		return (move_type, move[2], Card.kind(target), Card.owner(target))
+	return (move_type,)
+
+
+def move_keys(state, moves):
+	"""Return the move_key of each of moves in state."""
+	return tuple(move_key(state, move) for move in moves)
@@ -0,0 +1,150 @@
+"""RolloutPolicy picks the moves for the random part of a playout, without listing every legal move."""
+
+from random import random, randrange
+
+from src.card import Card
+from src.game import Game
+
+# the families of moves a policy weighs against each other
+FAMILIES = ('cast', 'ability', 'attack', 'no_attack', 'block', 'finish_blocking', 'pass', 'resolve_combat')
+
+
+class RolloutPolicy(object):
+	"""
+		Picks a move for a rollout by picking a family of moves, then a move in the family.
+
+		Each legal move is picked with a chance in proportion to its family's weight, so with every
+
+		weight 1, the default, the moves are picked as uniformly as choice(Game.legal_plays(state)).
+
+		Attack and block subsets and spell amounts and targets are drawn directly instead of listed,
+
+		so picking a move costs about as much as looking over the board.
+	"""
+
+	def __init__(self, weights=None):
+		"""weights maps some of FAMILIES to how much more or less likely their moves are than the rest."""
+		self.weights = dict.fromkeys(FAMILIES, 1.0)
+		for family, weight in (weights or {}).items():
+			if family not in self.weights:
+				raise ValueError("{} isn't one of {}".format(family, ", ".join(FAMILIES)))
+			self.weights[family] = float(weight)
+
+	def sample(self, state, ordered=False):
+		"""
+			Return a legal move for state, following the same cases as Game.legal_plays.
+
+			If ordered, lists of moves are sorted by repr before picking from them, so the pick
+
+			doesn't depend on PYTHONHASHSEED.
+		"""
+		spell_on_stack = Game.get_current_spell_move(state)
+		stack = Game.get_stack(state)
+		pwp = Game.player_with_priority(state)
+		current_player = Game.current_turn_player(state)
+		phase = Game.get_phase(state)
+		if spell_on_stack:
+			if ordered:
+				moves = sorted(Game.card_actions(state, move=spell_on_stack), key=repr)
+				return moves[randrange(len(moves))]
+			card_state = Game.get_hand(state, pwp)[spell_on_stack[1]]
+			return Card.sample_move(card_state, state, Game)
+		elif len(stack) > 0 and stack[-1][5] == pwp:
+			return ('play_next_on_stack', pwp, 0)
+		elif len(stack) > 0 and stack[-1][5] != pwp and pwp == current_player:
+			return ('pass_priority_as_attacker', pwp, 0)
+		elif phase == "setup":
+			return ('initial_draw', pwp, 0)
+		elif phase == "draw":
+			return ('draw_card', pwp, 0)
+		elif phase == "attack_step" and pwp == current_player:
+			return self.sample_attack(state, pwp)
+		elif phase == "declare_blockers":
+			return self.sample_block(state, pwp)
+
+		abilities = Game.add_instant_creature_abilities(state, set())
+		abilities = Game.add_land_abilities(state, abilities)
+		if pwp != current_player:
+			return self.pick([
+				('ability', list(abilities)),
+				('pass', [('pass_priority_as_defender', pwp, 0)]),
+			], ordered)
+
+		families = [('cast', list(Game.add_cast_actions(state, set()))), ('ability', list(abilities))]
+		if phase == "precombat" and Game.can_announce_attackers(state):
+			families.append(('attack', [('declare_attack', pwp, 0)]))
+		elif phase == "combat_resolution":
+			families.append(('resolve_combat', [('resolve_combat', pwp, 0)]))
+			return self.pick(families, ordered)
+		families.append(('pass', [('pass_the_turn', pwp, 0)]))
+		return self.pick(families, ordered)
+
+	def pick(self, families, ordered):
+		"""Return a move from one of families, a list of (family, moves), weighing each move by its family."""
+		families = [(self.weights[family], moves) for family, moves in families if moves]
+		total = sum(weight * len(moves) for weight, moves in families)
+		if total == 0:
+			families = [(1.0, moves) for weight, moves in families]
+			total = sum(len(moves) for weight, moves in families)
+		r = random() * total
+		for weight, moves in families:
+			if r < weight * len(moves):
+				if ordered:
+					moves = sorted(moves, key=repr)
+				return moves[min(int(r / weight), len(moves) - 1)]
+			r -= weight * len(moves)
+		return families[-1][1][-1]
+
+	def chooses(self, family, weight_with, other_family, weight_against):
+		"""Return whether to pick family, with weight_with of its moves against weight_against of other_family's."""
+		with_weight = self.weights[family] * weight_with
+		total = with_weight + self.weights[other_family] * weight_against
+		if total == 0:
+			return random() * (weight_with + weight_against) < weight_with
+		return random() * total < with_weight
+
+	@staticmethod
+	def sample_counts(groups):
+		"""Return how many creatures to take from each of groups, uniformly among the counts that take any."""
+		while True:
+			counts = [randrange(len(group) + 1) for group in groups]
+			if any(counts):
+				return counts
+
+	def sample_attack(self, state, pwp):
+		"""Return no_attack, or an announce_attackers move with one of Game.attack_subsets."""
+		if len(Game.get_attackers(state)) > 0:
+			return ('no_attack', pwp, 0)
+		attackers = Game.attack_ready_creatures(state, pwp)
+		groups = Game.interchangeable_groups(attackers)
+		subsets = subset_count(groups)
+		if not self.chooses('attack', subsets, 'no_attack', 1):
+			return ('no_attack', pwp, 0)
+		return ('announce_attackers', Game.interchangeable_subset(attackers, groups, self.sample_counts(groups)), 0)
+
+	def sample_block(self, state, pwp):
+		"""Return finish_blocking, or an assign_blockers move with one of Game.block_assignments."""
+		attackers = []
+		for attacker_id, eligible in Game.eligible_blockers(state):
+			groups = Game.interchangeable_groups(eligible)
+			subsets = subset_count(groups)
+			if subsets:
+				attackers.append((attacker_id, eligible, groups, subsets))
+		blocks = sum(subsets for attacker_id, eligible, groups, subsets in attackers)
+		if not self.chooses('block', blocks, 'finish_blocking', 1):
+			return ('finish_blocking', pwp, 0)
+
+		r = randrange(blocks)
+		for attacker_id, eligible, groups, subsets in attackers:
+			if r < subsets:
+				break
+			r -= subsets
+		return ('assign_blockers', (attacker_id, Game.interchangeable_subset(eligible, groups, self.sample_counts(groups))), 0)
+
+
+def subset_count(groups):
+	"""Return how many non-empty subsets Game.interchangeable_subsets yields for groups."""
+	count = 1
+	for group in groups:
+		count *= len(group) + 1
+	return count - 1
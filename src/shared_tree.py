@@ -0,0 +1,172 @@
+"""SharedTree is a Monte Carlo search tree that several processes grow at once, kept in shared memory."""
+
+from hashlib import blake2b
+from math import log, sqrt
+from multiprocessing import shared_memory
+from random import choice
+
+# the columns of the node table, one row of int64s per node id
+VISITS, WINS, VIRTUAL, FIRST_CHILD, CHILD_COUNT, MOVES_KEY = range(6)
+COLUMNS = 6
+
+# the first int64 in the block is the next free node id, and the node table starts after it
+HEADER = 1
+
+UNEXPANDED = -1
+
+
+def moves_key(moves):
+	"""Return a 64-bit key of moves, a list sorted by repr, that is the same in every process."""
+	digest = blake2b(repr(moves).encode(), digest_size=8).digest()
+	return int.from_bytes(digest, 'little', signed=True)
+
+
+class SharedTree(object):
+	"""
+		A search tree whose statistics are rows of a shared-memory table, indexed by node id.
+
+		Node 0 is the root. A node's children are the rows from first_child, one for each of its
+
+		legal moves sorted by repr, so every process that reaches a node agrees on which child
+
+		is which move without the tree ever passing moves between processes. Each node also
+
+		keeps the moves_key of the moves it was expanded with, so a process whose playout reaches
+
+		it in a state with other moves, after a different shuffle, can tell its children don't fit.
+
+		visits and wins count the playouts through a node, and the wins of the player who made
+
+		the move into it, which are float64s in the int64 rows. virtual counts the playouts on their way through it right now, which
+
+		select scores as losses, to spread the processes across different branches.
+
+		Expanding a node and recording a playout take lock, which every process must share.
+	"""
+
+	def __init__(self, memory, lock, max_nodes):
+		self.memory = memory
+		self.lock = lock
+		self.max_nodes = max_nodes
+		self.table = memory.buf.cast('q')
+		# the same rows, to read and write the wins column as floats
+		self.floats = memory.buf.cast('d')
+		# this process's sorted moves for each node it reached, with the fingerprint of the state they're for
+		self.listed_moves = {}
+
+	@classmethod
+	def create(cls, lock, max_nodes=1 << 18):
+		"""Return a new tree, with only a root, in a new block of shared memory."""
+		memory = shared_memory.SharedMemory(create=True, size=8 * (HEADER + COLUMNS * max_nodes))
+		tree = cls(memory, lock, max_nodes)
+		tree.table[0] = 1
+		tree.clear_row(0)
+		return tree
+
+	@classmethod
+	def attach(cls, name, lock, max_nodes):
+		"""Return the tree another process created in the shared memory called name."""
+		return cls(shared_memory.SharedMemory(name=name), lock, max_nodes)
+
+	@property
+	def name(self):
+		"""The name other processes attach to the shared memory by."""
+		return self.memory.name
+
+	def close(self, unlink=False):
+		"""Let go of the shared memory, and free it if unlink, which only its creator should do."""
+		self.table.release()
+		self.floats.release()
+		self.memory.close()
+		if unlink:
+			self.memory.unlink()
+
+	def clear_row(self, node):
+		"""Zero node's statistics and mark it unexpanded."""
+		start = HEADER + COLUMNS * node
+		self.table[start:start + COLUMNS] = memoryview(bytes(8 * COLUMNS)).cast('q')
+		self.table[start + FIRST_CHILD] = UNEXPANDED
+
+	def get(self, node, column):
+		"""Return node's value in column."""
+		if column == WINS:
+			return self.floats[HEADER + COLUMNS * node + column]
+		return self.table[HEADER + COLUMNS * node + column]
+
+	def children(self, node):
+		"""Return the range of node's children's ids, empty if it is not expanded."""
+		first_child = self.get(node, FIRST_CHILD)
+		if first_child == UNEXPANDED:
+			return range(0)
+		return range(first_child, first_child + self.get(node, CHILD_COUNT))
+
+	def expand(self, node, moves_key, move_count):
+		"""
+			Give node a child for each of its move_count moves, whose moves_key is moves_key, unless
+
+			it has them already or the table is full.
+		"""
+		table = self.table
+		with self.lock:
+			if table[HEADER + COLUMNS * node + FIRST_CHILD] != UNEXPANDED:
+				return True
+			first_child = table[0]
+			if first_child + move_count > self.max_nodes:
+				return False
+			for child in range(first_child, first_child + move_count):
+				self.clear_row(child)
+			table[0] = first_child + move_count
+			table[HEADER + COLUMNS * node + CHILD_COUNT] = move_count
+			table[HEADER + COLUMNS * node + MOVES_KEY] = moves_key
+			table[HEADER + COLUMNS * node + FIRST_CHILD] = first_child
+		return True
+
+	def select(self, node, C):
+		"""
+			Return the index of the move to make next from an expanded node: a random one of
+
+			the moves no playout has made or is making, if any, else the best by UCT, counting
+
+			the virtual losses. Add a virtual loss to the chosen child.
+		"""
+		table = self.table
+		floats = self.floats
+		children = self.children(node)
+		tried = []
+		untried = []
+		for index, child in enumerate(children):
+			row = HEADER + COLUMNS * child
+			visits = table[row + VISITS] + table[row + VIRTUAL]
+			if visits == 0:
+				untried.append(index)
+			else:
+				tried.append((index, floats[row + WINS], visits))
+		if untried:
+			index = choice(untried)
+		else:
+			log_total = log(sum(visits for index, wins, visits in tried))
+			index = max(tried, key=lambda stats: stats[1] / stats[2] + C * sqrt(log_total / stats[2]))[0]
+		with self.lock:
+			table[HEADER + COLUMNS * children[index] + VIRTUAL] += 1
+		return index
+
+	def update(self, path, scores):
+		"""
+			Record a playout that went through path, a list of (node id, player who made the
+
+			move into it), and scored scores, each player's win or chance of one, and take back
+
+			its virtual losses.
+		"""
+		table = self.table
+		floats = self.floats
+		with self.lock:
+			for node, player in path:
+				row = HEADER + COLUMNS * node
+				table[row + VIRTUAL] -= 1
+				table[row + VISITS] += 1
+				floats[row + WINS] += scores[player]
+
+	def size(self):
+		"""Return the number of nodes in the tree."""
+		return self.table[0]
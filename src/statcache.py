@@ -1,18 +1,102 @@
+from collections import OrderedDict
+from src.utils import deep_size
+
+
 class StatCache(object):
-	def __init__(self):
+	def __init__(self, check_collisions=False, max_cached_states=100000):
+		"""Each bot's legal moves cache holds the moves of at most max_cached_states states."""
 		self.bot_to_stats = {}
 		self.past_states = []
 		self.bots = []
+		self.check_collisions = check_collisions
+		self.max_cached_states = max_cached_states
 
 	def bot_stats(self, bot_id):
 		if bot_id not in self.bot_to_stats:
-			self.bot_to_stats[bot_id] = BotStats()
+			self.bot_to_stats[bot_id] = BotStats(
+				check_collisions=self.check_collisions, max_cached_states=self.max_cached_states)
 		return self.bot_to_stats[bot_id]
 
+	def report(self):
+		"""Return a line about each bot's legal moves cache."""
+		return "\n".join(
+			"player {} {}".format(bot_id, stats.legal_moves_cache.report())
+			for bot_id, stats in sorted(self.bot_to_stats.items())
+		)
+
+
+class LRUCache(object):
+	"""
+		A cache of at most max_entries values, which evicts the least recently used one to make room
+
+		for a new one. It counts its hits, misses and evictions, to tune max_entries by.
+	"""
+
+	def __init__(self, max_entries):
+		self.max_entries = max_entries
+		self.entries = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def __len__(self):
+		return len(self.entries)
+
+	def get(self, key):
+		"""Return the value for key, or None if it is not cached."""
+		value = self.entries.get(key)
+		if value is None:
+			self.misses += 1
+			return None
+		self.hits += 1
+		self.entries.move_to_end(key)
+		return value
+
+	def put(self, key, value):
+		"""Cache value for key, evicting the least recently used entry if that makes too many."""
+		entries = self.entries
+		entries[key] = value
+		if len(entries) > self.max_entries:
+			entries.popitem(last=False)
+			self.evictions += 1
+
+	def hit_rate(self):
+		lookups = self.hits + self.misses
+		return self.hits / lookups if lookups else 0.0
+
+	def resident_bytes(self):
+		"""Return roughly how many bytes the entries take, with everything their keys and values hold."""
+		return deep_size(self.entries)
+
+	def report(self):
+		return "{} / {} entries (~{} KB), {:.1%} hits, {} evictions".format(
+			len(self), self.max_entries, self.resident_bytes() // 1024, self.hit_rate(), self.evictions)
+
+
+class FingerprintCollision(Exception):
+	"""Raised in collision-check mode when two different states share a fingerprint."""
+	pass
+
 
 class BotStats(object):
-	def __init__(self):
-		# statistics about previously simulated game states
-		self.wins = {}
-		self.plays = {}
-		self.legal_moves_cache = {}
+	def __init__(self, check_collisions=False, max_cached_states=100000):
+		# legal moves keyed by the fingerprint of the full state, for the most recently seen states
+		self.legal_moves_cache = LRUCache(max_cached_states)
+
+		# when checking for collisions, remember the state behind each of the most recently seen fingerprints,
+		# so a collision between two states seen far apart can go unnoticed, but the store can't outgrow the budget
+		self.check_collisions = check_collisions
+		self.fingerprinted_states = LRUCache(max_cached_states)
+
+	def state_key(self, state):
+		"""Return the key for state in legal_moves_cache."""
+		if self.check_collisions:
+			self.check_fingerprint(state.fingerprint, state)
+		return state.fingerprint
+
+	def check_fingerprint(self, fingerprint, state):
+		known_state = self.fingerprinted_states.get(fingerprint)
+		if known_state is None:
+			self.fingerprinted_states.put(fingerprint, state.freeze())
+		elif known_state.values() != state.values():
+			raise FingerprintCollision("{:016x} is the fingerprint of two states".format(fingerprint))
@@ -1,20 +1,38 @@
-def decarded_state(state_clone):
-	mutable_player = list(state_clone[4][0])
-	mutable_player[1] = ()
-	mutable_player[4] = ()
-
-	mutable_players = list(state_clone[4])
-	mutable_players[0] = tuple(mutable_player)
+import sys
 
-	mutable_player = list(state_clone[4][1])
-	mutable_player[1] = ()
-	mutable_player[4] = ()
 
-	mutable_players[1] = tuple(mutable_player)
+def decarded_state(state_clone):
+	state_clone = state_clone.freeze()
+	player_states = tuple(
+		player_state.replace(hand=(), deck=(), drawn=0) for player_state in state_clone.player_states
+	)
+	return state_clone.replace(player_states=player_states)
 
-	mutable_state = list(state_clone)
-	mutable_state[4] = tuple(mutable_players)
-	mutable_state[14] = True
-	return tuple(mutable_state)
 
+def deep_size(value):
+	"""
+		Return roughly how many bytes value takes, with everything it holds: the items of tuples,
 
+		lists, sets and dicts, and the slots of objects, each object counted once however often it is held.
+	"""
+	seen = set()
+	size = 0
+	values = [value]
+	while values:
+		value = values.pop()
+		if id(value) in seen:
+			continue
+		seen.add(id(value))
+		size += sys.getsizeof(value)
+		if isinstance(value, dict):
+			values.extend(value.keys())
+			values.extend(value.values())
+		elif isinstance(value, (tuple, list, set, frozenset)):
+			values.extend(value)
+		else:
+			for cls in type(value).__mro__:
+				slots = getattr(cls, '__slots__', ())
+				for slot in (slots,) if isinstance(slots, str) else slots:
+					if hasattr(value, slot):
+						values.append(getattr(value, slot))
+	return size
@@ -0,0 +1,61 @@
+"""move_prior guesses which moves are worth searching first, for progressive widening."""
+
+from src.card import Card, Creature
+from src.game import Game
+
+
+def move_prior(state, move):
+	"""
+		Return a guess at how good move is in state, in about points of damage, 0 for moves it can't tell apart.
+
+		Attacks are worth the power of the attackers, blocks their block_prior, and Fireballs at a player
+
+		the damage they deal. A Fireball that kills an opponent's creature is worth the creature's power
+
+		and toughness, less the damage beyond its toughness, and any other Fireball at a creature costs its damage.
+	"""
+	move_type = move[0]
+	if move_type == 'announce_attackers':
+		return sum(Creature.total_damage(Game.creature_with_id(state, creature_id)) for creature_id in move[1])
+	if move_type == 'assign_blockers':
+		attacker_id, blocker_ids = move[1]
+		return block_prior(Game.creature_with_id(state, attacker_id), [Game.creature_with_id(state, i) for i in blocker_ids])
+	if move_type == 'card-fireball':
+		return move[2][1]
+	if move_type == 'card-fireball-creature':
+		damage = move[2][1]
+		target = Game.creature_with_id(state, move[3])
+		toughness = Creature.total_hit_points(target)
+		if Card.owner(target) == move[5] or damage < toughness:
+			return -damage
+		return Creature.total_damage(target) + toughness - (damage - toughness)
+	return 0
+
+
+def creature_worth(creature_state):
+	"""Return the power and toughness of creature_state."""
+	return Creature.total_damage(creature_state) + Creature.total_hit_points(creature_state)
+
+
+def block_prior(attacker, blockers):
+	"""
+		Return the damage blockers keep from the defending player, plus the worth of attacker if they kill it,
+
+		less the worth of the blockers it kills, the weakest first.
+	"""
+	power = Creature.total_damage(attacker)
+	prior = power
+	if sum(Creature.total_damage(blocker) for blocker in blockers) >= Creature.total_hit_points(attacker):
+		prior += creature_worth(attacker)
+	for blocker in sorted(blockers, key=Creature.total_hit_points):
+		toughness = Creature.total_hit_points(blocker)
+		if toughness > power:
+			break
+		power -= toughness
+		prior -= creature_worth(blocker)
+	return prior
+
+
+def move_priors(state, moves):
+	"""Return the move_prior of each of moves in state."""
+	return [move_prior(state, move) for move in moves]
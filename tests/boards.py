@@ -0,0 +1,54 @@
+"""Build game states for the tests, recorded from seeded games or with chosen cards in play."""
+
+import random
+from src.card import Card, Creature, card_kind_ids
+from src.game import Game
+
+
+def new_game(current_turn=5):
+	"""Return a game between two random bots on current_turn, before anyone has drawn."""
+	state = Game.new_game_state()
+	for player in range(2):
+		state = Game.add_player(state, Game.new_player_state_object(hit_points=20, bot_type='random'))
+	return state.replace(current_turn=current_turn)
+
+
+def add_creature(state, name, owner, flying=False, strength_counters=0, enchantment_names=()):
+	"""
+		Return state with a new creature of kind name owned by owner, played on turn 0 with the
+
+		enchantments named in enchantment_names, and the creature's id.
+	"""
+	card_id = Game.get_new_card_id(state)
+	state = Game.increment_new_card_id(state)
+	creature = Creature.get_tuple(card_kind_ids[name], owner, card_id, 0, flying=flying)
+	creature = Creature.increment_strength_counters(creature, strength_counters)
+	enchantments = []
+	for enchantment_name in enchantment_names:
+		enchantments.append(Card.get_tuple(card_kind_ids[enchantment_name], owner, Game.get_new_card_id(state), 0))
+		state = Game.increment_new_card_id(state)
+	creature = creature[:-1] + (tuple(enchantments),)
+	return Game.add_creature(creature, state), card_id
+
+
+def add_to_hand(state, name, owner):
+	"""Return state with a new card of kind name just drawn into owner's hand."""
+	card_id = Game.get_new_card_id(state)
+	state = Game.increment_new_card_id(state)
+	return Game.add_card_to_hand(state, Game.drawn_card_state(card_kind_ids[name], owner, card_id))
+
+
+def add_land(state, name, owner):
+	"""Return state with a new untapped land of kind name owned by owner."""
+	card_id = Game.get_new_card_id(state)
+	state = Game.increment_new_card_id(state)
+	return Game.add_land(state, Card.get_tuple(card_kind_ids[name], owner, card_id, -1))
+
+
+def recorded_game(seed):
+	"""Return the states of a game between two random bots, seeded with seed, with moves picked from the legal ones sorted by repr."""
+	random.seed(seed)
+	states = [new_game(current_turn=0)]
+	while not Game.game_is_over(states[-1]):
+		states.append(Game.apply_move(states[-1], random.choice(sorted(Game.legal_plays(states[-1]), key=repr))))
+	return states
@@ -0,0 +1,71 @@
+"""Check that attacks are generated once per multiset of interchangeable attackers."""
+
+import itertools
+import unittest
+from collections import Counter
+from src.card import Card, Creature
+from src.game import Game
+from tests.boards import add_creature, new_game
+
+
+def board_with(creatures):
+	"""Return a game on turn 5 where player 0 has creatures, (kind name, enchantment names) pairs, played on turn 0."""
+	state = new_game()
+	for name, enchantment_names in creatures:
+		state, card_id = add_creature(state, name, 0, enchantment_names=enchantment_names)
+	return state
+
+
+def multiset(state, subset):
+	"""Return the interchangeable keys of the creatures in subset, counted."""
+	return Counter(Creature.interchangeable_key(state.card_with_id('creatures', card_id)) for card_id in subset)
+
+
+def all_multisets(state):
+	"""Return the multiset of every non-empty subset of the attack ready creatures, found by trying them all."""
+	ids = [Card.id(creature) for creature in Game.attack_ready_creatures(state, 0)]
+	multisets = []
+	for size in range(1, len(ids) + 1):
+		for subset in itertools.combinations(ids, size):
+			found = multiset(state, subset)
+			if found not in multisets:
+				multisets.append(found)
+	return multisets
+
+
+class AttackSubsetsTest(unittest.TestCase):
+
+	def assert_one_per_multiset(self, state):
+		"""Check the attack subsets are one subset for each multiset of interchangeable attackers."""
+		subsets = list(Game.attack_subsets(state))
+		multisets = [multiset(state, subset) for subset in subsets]
+		expected = all_multisets(state)
+		self.assertEqual(len(multisets), len(expected))
+		for found in expected:
+			self.assertIn(found, multisets)
+		return subsets
+
+	def test_eight_elephants(self):
+		"""Eight Elephant tokens attack as one subset per number of them, not 255."""
+		state = board_with([('ElephantToken', ())] * 8)
+		subsets = self.assert_one_per_multiset(state)
+		self.assertEqual(sorted(len(subset) for subset in subsets), list(range(1, 9)))
+
+	def test_enchanted_and_mixed(self):
+		"""Creatures of different kinds, or with different enchantments, aren't interchangeable."""
+		state = board_with(
+			[('ElephantToken', ())] * 3 + [('ElephantToken', ('Rancor',))] + [('NettleSentinel', ())] * 2)
+		subsets = self.assert_one_per_multiset(state)
+		self.assertEqual(len(subsets), 4 * 2 * 3 - 1)
+
+	def test_tapped_not_interchangeable(self):
+		"""A tapped creature isn't interchangeable with an untapped one of the same kind, one with another id is."""
+		elephant = board_with([('ElephantToken', ())]).creatures[0]
+		tapped = elephant[:3] + (True,) + elephant[4:]
+		self.assertNotEqual(Creature.interchangeable_key(elephant), Creature.interchangeable_key(tapped))
+		self.assertEqual(
+			Creature.interchangeable_key(elephant), Creature.interchangeable_key(elephant[:2] + (99,) + elephant[3:]))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,100 @@
+"""Check that block_assignments finds the same blocks as filtering every combination with block_is_legal did."""
+
+import itertools
+import unittest
+from collections import Counter
+from src.card import Card, Creature
+from src.game import Game
+from tests.boards import add_creature, new_game
+
+
+def filtered_blocks(state):
+	"""
+		Return the blocks the generator before block_assignments found: every attacker paired with every
+
+		combination of the player_with_priority's unassigned creatures, kept if each one can block it.
+	"""
+	pwp = Game.player_with_priority(state)
+	blockers = [
+		Card.id(c) for c in Game.get_creatures(state)
+		if Card.owner(c) == pwp and Card.id(c) not in Game.get_blockers(state)
+	]
+	combinations = []
+	for size in range(1, len(blockers) + 1):
+		combinations += itertools.combinations(blockers, size)
+	blocks = []
+	for attacker_id, blocker_ids in itertools.product(Game.get_attackers(state), combinations):
+		attacker = Game.creature_with_id(state, attacker_id)
+		if all(Creature.can_be_blocked_by(attacker, Game.creature_with_id(state, c)) for c in blocker_ids):
+			blocks.append((attacker_id, blocker_ids))
+	return blocks
+
+
+def merged(state, blocks):
+	"""Return the distinct blocks in blocks, counting blocks by interchangeable blockers as the same."""
+	merged_blocks = set()
+	for attacker_id, blocker_ids in blocks:
+		keys = Counter(Creature.interchangeable_key(Game.creature_with_id(state, c)) for c in blocker_ids)
+		merged_blocks.add((attacker_id, tuple(sorted(keys.items(), key=repr))))
+	return merged_blocks
+
+
+def blocking_state(attackers, blockers):
+	"""
+		Return a game where player 1 attacks with attackers and player 0, with priority, can block with blockers,
+
+		both lists of keyword arguments to add_creature.
+	"""
+	state = new_game()
+	attacker_ids = []
+	for creature in attackers:
+		state, card_id = add_creature(state, owner=1, **creature)
+		attacker_ids.append(card_id)
+	for creature in blockers:
+		state, card_id = add_creature(state, owner=0, **creature)
+	return state.replace(attackers=tuple(attacker_ids), phase='declare_blockers', player_with_priority=0)
+
+
+ELEPHANT = {'name': 'ElephantToken'}
+FLYING_ELEPHANT = {'name': 'ElephantToken', 'flying': True}
+NETTLE_SENTINEL = {'name': 'NettleSentinel'}
+ELDRAZI_SPAWN = {'name': 'EldraziSpawnToken'}
+
+
+class BlockAssignmentsTest(unittest.TestCase):
+
+	def assert_same_blocks(self, state):
+		"""Check block_assignments finds each block filtered_blocks does once, after merging interchangeable blockers."""
+		blocks = list(Game.block_assignments(state))
+		self.assertEqual(len(merged(state, blocks)), len(blocks))
+		self.assertEqual(merged(state, blocks), merged(state, filtered_blocks(state)))
+		return blocks
+
+	def test_flying_attacker(self):
+		"""Only flying creatures can block a flying attacker."""
+		state = blocking_state([FLYING_ELEPHANT], [FLYING_ELEPHANT] * 2 + [NETTLE_SENTINEL] * 2)
+		self.assertEqual(len(self.assert_same_blocks(state)), 2)
+
+	def test_skarrgan_pit_skulk(self):
+		"""Creatures with less power than Skarrgan Pit-Skulk can't block it."""
+		skulk = {'name': 'SkarrganPitSkulk', 'strength_counters': 2}
+		state = blocking_state([skulk], [ELEPHANT] * 2 + [NETTLE_SENTINEL] * 2 + [ELDRAZI_SPAWN])
+		self.assertEqual(len(self.assert_same_blocks(state)), 2)
+
+	def test_silhana_ledgewalker(self):
+		"""Silhana Ledgewalker can only be blocked by creatures with flying."""
+		state = blocking_state([{'name': 'SilhanaLedgewalker'}], [FLYING_ELEPHANT, ELEPHANT, ELEPHANT, NETTLE_SENTINEL])
+		self.assertEqual(len(self.assert_same_blocks(state)), 1)
+
+	def test_attackers_together(self):
+		"""With several attackers, and a blocker already assigned, each attacker gets its own blocks."""
+		state = blocking_state(
+			[FLYING_ELEPHANT, {'name': 'SkarrganPitSkulk', 'strength_counters': 1}, {'name': 'SilhanaLedgewalker'}, ELEPHANT],
+			[FLYING_ELEPHANT] * 2 + [ELEPHANT] * 2 + [NETTLE_SENTINEL, ELDRAZI_SPAWN])
+		self.assert_same_blocks(state)
+		assigned = Card.id(Game.get_player_creatures(state, 0)[0])
+		self.assert_same_blocks(state.replace(blockers=(assigned,)))
+
+
+if __name__ == "__main__":
+	unittest.main()
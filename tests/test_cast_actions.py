@@ -0,0 +1,115 @@
+"""Check cast move generation, and that rollout policies sample legal moves, uniformly by default."""
+
+import random
+import unittest
+from collections import Counter
+from math import sqrt
+from src.card import Card
+from src.game import Game
+from src.rollout_policy import RolloutPolicy
+from tests.boards import add_land, add_to_hand, new_game, recorded_game
+
+# the seeds of the recorded games whose positions are checked
+SEEDS = (0, 1, 2)
+
+# the z score the chi-squared statistic of a uniform sampler passes 999 times in 1000
+Z_999 = 3.09
+
+
+def listed_cast_actions(state):
+	"""
+		Return the cast actions as add_cast_actions listed them before trying one card of each kind: for
+
+		the first card of each name with possible moves, its one move, or the move to cast it if it has more.
+	"""
+	moves = set()
+	names_added = []
+	pwp = Game.player_with_priority(state)
+	hand = Game.get_hand(state, pwp)
+	for card_state in hand:
+		if Card.name(card_state) in names_added:
+			continue
+		if Game.get_phase(state) in ['attack_step', 'combat_resolution'] and Card.card_type(card_state) != 'instant':
+			continue
+		card_index = hand.index(card_state)
+		actions = Game.card_actions(state, move=('card-cast-{}'.format(Card.name(card_state)), card_index))
+		if len(actions) == 1:
+			moves.add(actions[0])
+		elif len(actions) > 1:
+			moves.add(('card-cast-{}'.format(Card.name(card_state)), card_index, (), None, None, pwp))
+		if actions:
+			names_added.append(Card.name(card_state))
+	return moves
+
+
+def fireball_state(mountains):
+	"""Return a precombat state whose acting player holds two Fireballs and has mountains Mountains."""
+	state = new_game()
+	player = Game.current_turn_player(state)
+	state = state.replace(phase='precombat', player_with_priority=player)
+	for copy in range(2):
+		state = add_to_hand(state, 'Fireball', player)
+	for mountain in range(mountains):
+		state = add_land(state, 'Mountain', player)
+	return state
+
+
+def chi_squared_limit(degrees):
+	"""Return the chi-squared statistic with degrees of freedom that a uniform sampler stays under 999 times in 1000."""
+	return degrees * (1 - 2 / (9 * degrees) + Z_999 * sqrt(2 / (9 * degrees))) ** 3
+
+
+class CastActionsTest(unittest.TestCase):
+
+	def test_recorded_positions(self):
+		"""add_cast_actions lists the same moves as before on every position of the recorded games."""
+		for seed in SEEDS:
+			for state in recorded_game(seed):
+				self.assertEqual(Game.add_cast_actions(state, set()), listed_cast_actions(state))
+
+	def test_fireball(self):
+		"""
+			A Fireball with no mana for any damage isn't listed, with one amount to cast it for it is listed
+
+			as that move, and with more, as the move to cast it, once for both copies.
+		"""
+		self.assertEqual(Game.add_cast_actions(fireball_state(1), set()), set())
+		one = Game.add_cast_actions(fireball_state(2), set())
+		self.assertEqual(one, listed_cast_actions(fireball_state(2)))
+		self.assertEqual([move[0] for move in one], ['card-fireball'])
+		many = Game.add_cast_actions(fireball_state(4), set())
+		self.assertEqual(many, listed_cast_actions(fireball_state(4)))
+		self.assertEqual([move[0] for move in many], ['card-cast-Fireball'])
+
+
+class RolloutPolicyTest(unittest.TestCase):
+
+	def test_samples_are_legal(self):
+		"""On every position of the recorded games, the samples, ordered or not, are legal moves."""
+		policy = RolloutPolicy({'cast': 3, 'pass': 0.5})
+		random.seed(0)
+		for seed in SEEDS:
+			for state in recorded_game(seed):
+				legal = Game.legal_plays(state)
+				for sample in range(5):
+					self.assertIn(policy.sample(state), legal)
+					self.assertIn(policy.sample(state, ordered=True), legal)
+
+	def test_uniform(self):
+		"""With the default weights, every legal move is sampled about as often, on positions with several."""
+		policy = RolloutPolicy()
+		states = [state for state in recorded_game(SEEDS[0]) if len(Game.legal_plays(state)) >= 4][:30]
+		random.seed(0)
+		state = fireball_state(4)
+		states.append(Game.apply_move(state, list(Game.add_cast_actions(state, set()))[0]))
+		for state in states:
+			legal = Game.legal_plays(state)
+			samples = 50 * len(legal)
+			counts = Counter(policy.sample(state, ordered=True) for sample in range(samples))
+			self.assertLessEqual(set(counts), set(legal))
+			statistic = sum((counts[move] - 50) ** 2 / 50 for move in legal)
+			self.assertLess(statistic, chi_squared_limit(len(legal) - 1))
+
+
+if __name__ == "__main__":
+	unittest.main()
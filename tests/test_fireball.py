@@ -0,0 +1,92 @@
+"""Check that Fireball costs mana and deals its damage to the player or creature it targets."""
+
+import unittest
+from src.card import Card, Creature, Fireball, card_kind_ids, kind_mana_costs
+from src.game import Game
+from tests.boards import add_creature, add_land, add_to_hand, new_game
+
+
+def fireball_state(mountains, creature_names=()):
+	"""
+		Return a precombat state whose acting player holds a Fireball and has mountains Mountains, and
+
+		whose opponent has a creature of each of creature_names, which Fireball can target.
+	"""
+	state = new_game()
+	player = Game.current_turn_player(state)
+	state = state.replace(phase='precombat', player_with_priority=player)
+	state = add_to_hand(state, 'Fireball', player)
+	for mountain in range(mountains):
+		state = add_land(state, 'Mountain', player)
+	for name in creature_names:
+		state, card_id = add_creature(state, name, 1 - player)
+		creature = Game.creature_with_id(state, card_id)
+		# targettable and temp_targettable
+		creature = creature[:5] + (True,) + creature[6:8] + (True,) + creature[9:]
+		state = Game.set_creature_with_id(state, creature, card_id)
+	return state
+
+
+def fireball(state, amount, target_creature_id=None):
+	"""Return state after the acting player's Fireball resolves for amount damage at target_creature_id, or the opponent."""
+	player = Game.player_with_priority(state)
+	return Fireball.play(Game.get_hand(state, player)[0], state, (('R',), amount), target_creature_id, Game)
+
+
+class FireballTest(unittest.TestCase):
+
+	def test_mana_cost(self):
+		"""Fireball costs a red mana and any amount of colorless more."""
+		self.assertEqual(kind_mana_costs[card_kind_ids['Fireball']], (('R',), None))
+
+	def test_player(self):
+		"""Fireball at the opponent takes its amount from their hit points, and counts as damage to them."""
+		state = fireball_state(4)
+		opponent = 1 - Game.player_with_priority(state)
+		after = fireball(state, 3)
+		self.assertEqual(Game.get_player_states(after)[opponent].hit_points, 17)
+		self.assertEqual(after.damage_to_players[opponent], 3)
+		self.assertEqual(len(Game.get_hand(after, Game.player_with_priority(state))), 0)
+
+	def test_lethal_to_creature(self):
+		"""Fireball at a creature with at most its amount of hit points kills it, and takes it out of the attack."""
+		state = fireball_state(4, ['ElephantToken', 'ElephantToken'])
+		elephant_id = Card.id(Game.get_creatures(state)[0])
+		state = state.replace(attackers=(elephant_id,))
+		after = fireball(state, 3, elephant_id)
+		self.assertIsNone(Game.creature_with_id(after, elephant_id))
+		self.assertEqual(len(Game.get_creatures(after)), 1)
+		self.assertEqual(Game.get_attackers(after), ())
+		self.assertTrue(after.creature_died_this_turn)
+
+	def test_not_lethal_to_creature(self):
+		"""Fireball at a creature with more hit points than its amount lowers them."""
+		state = fireball_state(4, ['ElephantToken'])
+		elephant_id = Card.id(Game.get_creatures(state)[0])
+		after = fireball(state, 2, elephant_id)
+		self.assertEqual(Creature.total_hit_points(Game.creature_with_id(after, elephant_id)), 1)
+		self.assertFalse(after.creature_died_this_turn)
+
+	def test_targets(self):
+		"""Fireball's moves include each amount at the opponent and at each targettable creature, as legal moves do."""
+		state = fireball_state(4, ['ElephantToken'])
+		moves = Card.possible_moves(Game.get_hand(state, Game.player_with_priority(state))[0], state, Game)
+		self.assertEqual(sorted(move[0] for move in moves), ['card-fireball'] * 3 + ['card-fireball-creature'] * 3)
+		self.assertEqual(set(Game.card_actions(state, move=('card-cast-Fireball', 0))), set(moves))
+
+	def test_colorless_temp_mana(self):
+		"""Fireball counts Eldrazi Spawn's int colorless mana in its pool toward its amount, and still needs red."""
+		state = fireball_state(0)
+		player = Game.player_with_priority(state)
+		card_state = Game.get_hand(state, player)[0]
+		red = Game.add_temp_mana(state, player, (1, 'R'))
+		moves = Card.possible_moves(card_state, red, Game)
+		self.assertEqual(moves, [('card-fireball', 0, (('R',), 1), None, None, player)])
+		self.assertEqual(Fireball.sample_move(card_state, red, Game), moves[0])
+		colorless = Game.add_temp_mana(state, player, (1, 1))
+		self.assertEqual(Card.possible_moves(card_state, colorless, Game), [])
+		self.assertIsNone(Fireball.sample_move(card_state, colorless, Game))
+
+
+if __name__ == "__main__":
+	unittest.main()
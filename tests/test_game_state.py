@@ -0,0 +1,47 @@
+"""Check that fingerprints tell states apart and are the same in every process."""
+
+import os
+import subprocess
+import sys
+import unittest
+from src.game import Game
+from src.game_state import PlayerState
+
+# prints the fingerprint of a state some seeded random moves into a game
+FINGERPRINT_SCRIPT = """
+import random
+from src.game import Game
+random.seed(3)
+state = Game.new_game_state()
+for player in range(2):
+	state = Game.add_player(state, Game.new_player_state_object(hit_points=20, bot_type='random'))
+for move in range(60):
+	state = Game.apply_move(state, random.choice(sorted(Game.legal_plays(state), key=repr)))
+print(state.fingerprint)
+"""
+
+
+class FingerprintTest(unittest.TestCase):
+
+	def test_hash_collisions(self):
+		"""Values Python hashes alike, like -1 and -2, give different fingerprints."""
+		self.assertEqual(hash(-1), hash(-2))
+		self.assertNotEqual(
+			PlayerState(-1, (), (), 'random', 'stompy').fingerprint,
+			PlayerState(-2, (), (), 'random', 'stompy').fingerprint)
+		state = Game.new_game_state()
+		self.assertNotEqual(state.replace(current_turn=-1).fingerprint, state.replace(current_turn=-2).fingerprint)
+
+	def test_same_in_every_process(self):
+		"""A state's fingerprint doesn't change with PYTHONHASHSEED."""
+		root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+		fingerprints = set()
+		for hash_seed in ('1', '2'):
+			environment = dict(os.environ, PYTHONHASHSEED=hash_seed)
+			fingerprints.add(subprocess.check_output(
+				[sys.executable, '-c', FINGERPRINT_SCRIPT], cwd=root, env=environment))
+		self.assertEqual(len(fingerprints), 1)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,39 @@
+"""Check that MonteCarloSearchTreeBot rejects settings it can't search with, and searches with the ones it can."""
+
+import unittest
+from src.mcts_node import Node
+from src.monte_carlo_search_tree import MonteCarloSearchTreeBot
+
+
+class SearchSettingsTest(unittest.TestCase):
+
+	def test_widening_tries_a_move_first(self):
+		"""A Node with nothing tried yet tries a move, however small the widening is."""
+		node = Node(0, ['a', 'b', 'c'], priors=[0, 2, 1])
+		self.assertEqual(node.select(1.4, widening=(0.1, 0.5)), 1)
+		node.update(1, (1.0, 0.0))
+		self.assertEqual(node.select(1.4, widening=(0.1, 0.5)), 1)
+
+	def test_widening_k_more_than_0(self):
+		"""widening_k of 0 or less is rejected."""
+		for widening_k in (0, -1):
+			with self.assertRaises(ValueError):
+				MonteCarloSearchTreeBot(widening_k=widening_k)
+
+	def test_not_with_information_sets(self):
+		"""Settings InformationSetNodes ignore are rejected with information_sets."""
+		for settings in ({'rave_k': 50}, {'widening_k': 2}):
+			MonteCarloSearchTreeBot(**settings)
+			with self.assertRaises(ValueError):
+				MonteCarloSearchTreeBot(information_sets=True, **settings)
+
+	def test_root_parallel_only(self):
+		"""Settings a shared tree ignores are rejected with tree parallelism, but not with root parallelism."""
+		for settings in ({'rave_k': 50}, {'widening_k': 2}, {'information_sets': True}):
+			MonteCarloSearchTreeBot(workers=2, parallelism='root', **settings)
+			with self.assertRaises(ValueError):
+				MonteCarloSearchTreeBot(workers=2, parallelism='tree', **settings)
+
+
+if __name__ == "__main__":
+	unittest.main()
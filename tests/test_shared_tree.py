@@ -0,0 +1,57 @@
+"""Check that tree-parallel playouts only follow a SharedTree's children for the moves they were made for."""
+
+import multiprocessing
+import random
+import unittest
+from src.game import Game
+from src.monte_carlo_search_tree import MonteCarloSearchTreeBot
+from src.shared_tree import CHILD_COUNT, FIRST_CHILD, MOVES_KEY, UNEXPANDED, VIRTUAL, VISITS, SharedTree, moves_key
+from src.statcache import StatCache
+from tests.boards import new_game
+
+
+class SharedTreeTest(unittest.TestCase):
+
+	def grow(self, state, playouts):
+		"""Return a SharedTree grown from state by playouts shared playouts in this process."""
+		legal = sorted(Game.legal_plays(state), key=repr)
+		tree = SharedTree.create(multiprocessing.Lock(), 1 << 14)
+		self.addCleanup(tree.close, True)
+		tree.expand(0, moves_key(legal), len(legal))
+		bot = MonteCarloSearchTreeBot(verbose=False)
+		statcache = StatCache()
+		for playout in range(playouts):
+			bot.run_shared_simulation(tree, state, statcache)
+		return tree
+
+	def test_shuffled_decks(self):
+		"""
+			From the start of a game, where each playout shuffles the decks its own way and so reaches
+
+			the same node with other moves, every playout is recorded and takes back its virtual loss.
+		"""
+		random.seed(0)
+		tree = self.grow(new_game(current_turn=0), 200)
+		self.assertEqual(sum(tree.get(child, VISITS) for child in tree.children(0)), 200)
+		self.assertEqual([tree.get(node, VIRTUAL) for node in range(tree.size())], [0] * tree.size())
+
+	def test_moves_key(self):
+		"""Each expanded node keeps how many moves it was expanded with, and their key."""
+		random.seed(0)
+		state = new_game(current_turn=0)
+		for move in range(60):
+			state = Game.apply_move(state, random.choice(sorted(Game.legal_plays(state), key=repr)))
+		tree = self.grow(state, 50)
+		moves = sorted(Game.legal_plays(state), key=repr)
+		self.assertEqual(tree.get(0, CHILD_COUNT), len(moves))
+		self.assertEqual(tree.get(0, MOVES_KEY), moves_key(moves))
+		expanded = [node for node in range(tree.size()) if tree.get(node, FIRST_CHILD) != UNEXPANDED]
+		self.assertGreater(len(expanded), 1)
+		for node in expanded:
+			fingerprint, listed, key = tree.listed_moves[node]
+			self.assertEqual(tree.get(node, CHILD_COUNT), len(listed))
+			self.assertEqual(tree.get(node, MOVES_KEY), key)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,74 @@
+"""Check that SimulationBoard plays recorded games to the same states as the immutable GameState path."""
+
+import random
+import unittest
+from src.card import Card
+from src.game import Game
+from src.game_state import GameState, SimulationBoard
+
+# the seeds of the recorded games, each played with random moves from the legal ones sorted by repr
+SEEDS = (0, 1, 2)
+
+
+def new_game(seed):
+	"""Return a new game for two random bots, with random seeded with seed."""
+	random.seed(seed)
+	state = Game.new_game_state()
+	for player in range(2):
+		state = Game.add_player(state, Game.new_player_state_object(hit_points=20, bot_type='random'))
+	return state
+
+
+class SimulationBoardTest(unittest.TestCase):
+
+	def assert_same(self, board, state):
+		"""Check board has state's values, and fingerprints and zone caches matching ones rebuilt from scratch."""
+		self.assertEqual(board.values(), state.values())
+		fresh = GameState(*board.values())
+		self.assertEqual(board.fingerprint, fresh.fingerprint)
+		self.assertEqual(state.fingerprint, fresh.fingerprint)
+		for zone in ('creatures', 'lands'):
+			self.assertEqual(
+				board.zone_index(zone), {Card.id(card): position for position, card in enumerate(getattr(fresh, zone))})
+			self.assertEqual(board.zone_by_owner(zone), fresh.zone_by_owner(zone))
+			self.assertEqual(state.zone_by_owner(zone), fresh.zone_by_owner(zone))
+
+	def test_recorded_games(self):
+		"""Each move leaves the board like the state, and undo(0) takes it back to the start."""
+		for seed in SEEDS:
+			state = new_game(seed)
+			start = state
+			board = SimulationBoard(state)
+			while not Game.game_is_over(state):
+				move = random.choice(sorted(Game.legal_plays(state), key=repr))
+				# both paths make the same random draws, such as shuffling a deck
+				random_state = random.getstate()
+				state = Game.apply_move(state, move)
+				random.setstate(random_state)
+				Game.apply_move(board, move)
+				self.assert_same(board, state)
+			board.undo(0)
+			self.assert_same(board, start)
+
+	def test_undo_to_mark(self):
+		"""
+			undo(mark) takes the board back to the state it had at mark, even when the zone caches were
+
+			empty at mark and were filled from changed zones before the undo.
+		"""
+		for seed in SEEDS:
+			state = new_game(seed)
+			for made in range(60):
+				# a board with no zone caches built yet
+				board = SimulationBoard(GameState(*state.values()))
+				mark = board.mark()
+				for ahead in range(10):
+					if Game.game_is_over(board):
+						break
+					Game.apply_move(board, random.choice(sorted(Game.legal_plays(board), key=repr)))
+				board.undo(mark)
+				self.assert_same(board, state)
+				state = Game.apply_move(state, random.choice(sorted(Game.legal_plays(state), key=repr)))
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,30 @@
+"""Check the budgets of the stores in a bot's stats."""
+
+import unittest
+from src.game import Game
+from src.statcache import BotStats, FingerprintCollision
+
+
+class CollisionCheckTest(unittest.TestCase):
+
+	def test_bounded(self):
+		"""The collision-check store keeps the states behind at most max_cached_states fingerprints."""
+		stats = BotStats(check_collisions=True, max_cached_states=3)
+		state = Game.new_game_state()
+		for turn in range(10):
+			stats.state_key(state.replace(current_turn=turn))
+		self.assertEqual(len(stats.fingerprinted_states), 3)
+		self.assertEqual(stats.fingerprinted_states.evictions, 7)
+
+	def test_collision(self):
+		"""Two different states given the same fingerprint raise FingerprintCollision."""
+		stats = BotStats(check_collisions=True)
+		state = Game.new_game_state()
+		stats.check_fingerprint(1, state)
+		stats.check_fingerprint(1, state)
+		with self.assertRaises(FingerprintCollision):
+			stats.check_fingerprint(1, state.replace(current_turn=5))
+
+
+if __name__ == "__main__":
+	unittest.main()
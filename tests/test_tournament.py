@@ -0,0 +1,37 @@
+"""Check that a tournament game is the same for the same seed, whatever PYTHONHASHSEED is."""
+
+import os
+import subprocess
+import sys
+import unittest
+
+# prints the results of seeded games between random bots, and between a random bot and a seeded mcst bot
+GAMES_SCRIPT = """
+import tournament
+specs = [
+	[('random', {}), ('random', {})],
+	[('random', {}), ('mcst', {'max_playouts': 5, 'rollout_horizon': 5})],
+]
+for seed in range(3):
+	for bots in specs:
+		result = tournament.play_game((seed, seed, bots, ['stompy', 'stompy'], 20, 100))
+		del result['think_time']
+		print(sorted(result.items()))
+"""
+
+
+class SeededGamesTest(unittest.TestCase):
+
+	def test_same_in_every_process(self):
+		"""A seeded game's winner, turns and moves don't change with PYTHONHASHSEED."""
+		root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+		results = set()
+		for hash_seed in ('1', '2'):
+			environment = dict(os.environ, PYTHONHASHSEED=hash_seed)
+			results.add(subprocess.check_output(
+				[sys.executable, '-c', GAMES_SCRIPT], cwd=root, env=environment))
+		self.assertEqual(len(results), 1)
+
+
+if __name__ == "__main__":
+	unittest.main()
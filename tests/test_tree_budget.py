@@ -0,0 +1,72 @@
+"""Check that TreeBudget keeps search trees to max_nodes, cutting off stale and little visited subtrees first."""
+
+import random
+import sys
+import unittest
+from src.game import Game
+from src.mcts_node import Node, TreeBudget
+from src.monte_carlo_search_tree import MonteCarloSearchTreeBot
+from src.statcache import LRUCache, StatCache
+from tests.boards import new_game
+
+
+def chain(length, generation, visits):
+	"""Return the top of a chain of length Nodes, each with one move and the given generation and visits."""
+	top = None
+	for link in range(length):
+		node = Node(0, ['move'])
+		node.generation = generation
+		node.total_visits = visits
+		node.children[0] = top
+		top = node
+	return top
+
+
+class TreeBudgetTest(unittest.TestCase):
+
+	def test_search_stays_in_budget(self):
+		"""A search with more playouts than max_nodes keeps its tree to max_nodes, and counts what it cut off."""
+		random.seed(3)
+		state = new_game(current_turn=0)
+		for move in range(60):
+			state = Game.apply_move(state, random.choice(sorted(Game.legal_plays(state), key=repr)))
+		bot = MonteCarloSearchTreeBot(
+			max_playouts=200, max_nodes=40, seed=1, verbose=False, rollout_horizon=10)
+		statcache = StatCache()
+		statcache.past_states.append(state)
+		bot.get_play(statcache)
+		budget = bot.tree_budget
+		self.assertEqual(bot.root.size(), budget.nodes)
+		self.assertLessEqual(budget.nodes, 40)
+		self.assertGreater(budget.evictions, 0)
+		self.assertGreater(budget.misses, 40)
+		self.assertTrue(0 < budget.hit_rate() < 1)
+		self.assertIn("/ 40 nodes", budget.report(bot.root))
+
+	def test_stale_and_little_visited_first(self):
+		"""Subtrees from older searches go first, then the least visited, but never those a playout is on."""
+		root = Node(0, ['old', 'rare', 'busy', 'walked'])
+		root.children = [chain(3, 1, 50), chain(3, 2, 1), chain(3, 2, 50), chain(1, 2, 1)]
+		budget = TreeBudget(max_nodes=11, low_water=0.5)
+		budget.start(root)
+		self.assertEqual(budget.nodes, 11)
+		budget.generation = 2
+		walked = root.children[3]
+		budget.add(root, [(root, 3), (walked, 0)], Node(0, []))
+		self.assertEqual([child is None for child in root.children], [True, True, False, False])
+		self.assertEqual(budget.evictions, 6)
+		self.assertEqual(budget.nodes, root.size() + 1)
+
+	def test_deep_size(self):
+		"""resident_bytes counts what the entries hold, not just the entries."""
+		cache = LRUCache(10)
+		moves = [('card-cast', index, (('G',), None), None, 0, 0) for index in range(20)]
+		cache.put(1, moves)
+		shallow = sys.getsizeof(cache.entries) + sys.getsizeof(1) + sys.getsizeof(moves)
+		self.assertGreater(cache.resident_bytes(), shallow + sum(sys.getsizeof(move) for move in moves))
+		root = chain(5, 0, 0)
+		self.assertGreater(TreeBudget(10).resident_bytes(root), 5 * sys.getsizeof(root))
+
+
+if __name__ == "__main__":
+	unittest.main()
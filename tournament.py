@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+
+"""Play many games between two bots, in parallel and without printing, and report how often each wins.
+
+Each bot is given by a spec: random, or mcst followed by the MonteCarloSearchTreeBot settings to use,
+
+such as mcst:max_playouts=200,rave_k=50. The bots take turns going first. Game i is seeded with
+
+--seed + i, for shuffling the decks and for the mcst bots' searches, unless a spec sets its own seed.
+
+Each game's results include the hit rate and evictions of each bot's legal moves cache, for tuning
+
+--cache_size for mcst bots with fast_rollouts=False, the only ones that use it, and of each mcst bot's
+
+search trees, for tuning its max_nodes setting.
+
+Usage: python tournament.py random mcst:max_playouts=200 --games 100 --results results.jsonl
+"""
+
+
+import argparse
+import ast
+import json
+import multiprocessing
+import random
+import time
+from math import sqrt
+from src.bot import Bot
+from src.decks import DEFAULT_DECK, deck_names
+from src.game import Game
+from src.monte_carlo_search_tree import MonteCarloSearchTreeBot
+from src.statcache import StatCache
+
+BOT_CLASSES = {
+	'random': Bot,
+	'mcst': MonteCarloSearchTreeBot,
+}
+
+# the z score of a 95% confidence interval
+Z_95 = 1.96
+
+
+def parse_spec(spec):
+	"""
+		Return the bot name and settings in spec, a bot name, then optionally a colon and comma
+
+		separated name=value settings, whose values are Python literals, or strings if they aren't.
+	"""
+	name, _, settings_text = spec.partition(':')
+	if name not in BOT_CLASSES:
+		raise argparse.ArgumentTypeError("{} isn't one of {}".format(name, ", ".join(sorted(BOT_CLASSES))))
+	settings = {}
+	for setting in filter(None, settings_text.split(',')):
+		key, equals, value = setting.partition('=')
+		if not equals:
+			raise argparse.ArgumentTypeError("{} should be name=value".format(setting))
+		try:
+			settings[key] = ast.literal_eval(value)
+		except (ValueError, SyntaxError):
+			settings[key] = value
+	if name == 'random' and settings:
+		raise argparse.ArgumentTypeError("the random bot has no settings")
+	if settings.get('workers', 1) != 1:
+		raise argparse.ArgumentTypeError("each game is played in one process, so use --processes instead of workers")
+	if name == 'mcst':
+		try:
+			MonteCarloSearchTreeBot(**settings)
+		except (TypeError, ValueError) as error:
+			raise argparse.ArgumentTypeError("{}: {}".format(spec, error))
+	return name, settings
+
+
+def create_parser():
+	"""Create the argparse parser."""
+	parser = argparse.ArgumentParser(description="Play many games between two bots and report their win rates.")
+	parser.add_argument(
+		"bots",
+		nargs=2,
+		type=parse_spec,
+		help="the 2 bots, each random or mcst[:setting=value,...], e.g. mcst:max_playouts=200,rave_k=50"
+	)
+	parser.add_argument(
+		"--games",
+		default=100,
+		type=int,
+		help="the number of games to play - defaults 100"
+	)
+	parser.add_argument(
+		"--seed",
+		default=0,
+		type=int,
+		help="the seed of the first game, each next game's is one more - defaults 0"
+	)
+	parser.add_argument(
+		"--processes",
+		default=multiprocessing.cpu_count(),
+		type=int,
+		help="the number of games to play at once - defaults the number of CPUs"
+	)
+	parser.add_argument(
+		"--decks",
+		default=[DEFAULT_DECK, DEFAULT_DECK],
+		nargs=2,
+		choices=deck_names(),
+		help="the decklist each of the 2 bots plays - defaults {0} {0}".format(DEFAULT_DECK)
+	)
+	parser.add_argument(
+		"--starting_hit_points",
+		default=20,
+		type=int,
+		help="the amount of hp each player starts with"
+	)
+	parser.add_argument(
+		"--cache_size",
+		default=100000,
+		type=int,
+		help="the most states whose legal moves each bot caches, which only mcst bots with fast_rollouts=False use - defaults 100000"
+	)
+	parser.add_argument(
+		"--results",
+		default=None,
+		help="the file to write a JSON line to for each game as it finishes"
+	)
+	return parser
+
+
+def make_bot(spec, seed):
+	"""Return a bot for spec that doesn't print, seeded with seed unless spec sets a seed."""
+	name, settings = spec
+	if name == 'mcst':
+		settings = dict(settings, verbose=False)
+		settings.setdefault('seed', seed)
+	return BOT_CLASSES[name](**settings)
+
+
+def play_game(args):
+	"""
+		Play game number game between the bots for specs, the first of them going first in even games,
+
+		and return a dict of the results, with the winner as an index into specs, or None for a draw.
+	"""
+	game, seed, specs, decks, starting_hit_points, cache_size = args
+	random.seed(seed)
+	seats = [0, 1] if game % 2 == 0 else [1, 0]
+
+	game_state = Game.new_game_state()
+	statcache = StatCache(max_cached_states=cache_size)
+	statcache.past_states.append(game_state)
+	for bot_index in seats:
+		statcache.bots.append(make_bot(specs[bot_index], seed))
+		player_state = Game.new_player_state_object(
+			hit_points=starting_hit_points, bot_type=specs[bot_index][0], deck=decks[bot_index])
+		game_state = Game.add_player(game_state, player_state)
+
+	moves = [0, 0]
+	think_time = [0.0, 0.0]
+	try:
+		while not Game.game_is_over(game_state):
+			player = Game.player_with_priority(game_state)
+			begin = time.perf_counter()
+			move, game_state = statcache.bots[player].play_move(game_state, statcache)
+			think_time[seats[player]] += time.perf_counter() - begin
+			moves[seats[player]] += 1
+	finally:
+		for bot in statcache.bots:
+			if isinstance(bot, MonteCarloSearchTreeBot):
+				bot.close()
+
+	winner_seat = Game.winner(game_state)
+	caches = [statcache.bot_stats(seats.index(bot_index)).legal_moves_cache for bot_index in range(2)]
+	bots = [statcache.bots[seats.index(bot_index)] for bot_index in range(2)]
+	budgets = [bot.tree_budget if isinstance(bot, MonteCarloSearchTreeBot) else None for bot in bots]
+	return {
+		'game': game,
+		'seed': seed,
+		'first': seats[0],
+		'winner': seats[winner_seat] if winner_seat >= 0 else None,
+		'turns': Game.get_current_turn(game_state),
+		'hit_points': [Game.get_player_states(game_state)[seats.index(bot_index)].hit_points for bot_index in range(2)],
+		'moves': moves,
+		'think_time': think_time,
+		'cache_hit_rate': [cache.hit_rate() for cache in caches],
+		'cache_evictions': [cache.evictions for cache in caches],
+		'tree_hit_rate': [budget.hit_rate() if budget is not None else None for budget in budgets],
+		'tree_evictions': [budget.evictions if budget is not None else None for budget in budgets],
+	}
+
+
+def wilson_interval(wins, games, z=Z_95):
+	"""Return the Wilson score interval for the win rate of wins out of games."""
+	if not games:
+		return 0.0, 1.0
+	rate = wins / games
+	centre = rate + z * z / (2 * games)
+	spread = z * sqrt(rate * (1 - rate) / games + z * z / (4 * games * games))
+	denominator = 1 + z * z / games
+	return (centre - spread) / denominator, (centre + spread) / denominator
+
+
+def report(specs, results):
+	"""Return lines about how often each bot won, with 95% confidence intervals, and how long the games took."""
+	games = len(results)
+	lines = ["{} games, {} drawn, {:.1f} turns on average".format(
+		games, sum(result['winner'] is None for result in results),
+		sum(result['turns'] for result in results) / max(games, 1))]
+	for bot_index, (name, settings) in enumerate(specs):
+		wins = sum(result['winner'] == bot_index for result in results)
+		first_wins = sum(result['winner'] == bot_index == result['first'] for result in results)
+		low, high = wilson_interval(wins, games)
+		moves = sum(result['moves'][bot_index] for result in results)
+		think_time = sum(result['think_time'][bot_index] for result in results)
+		lines.append("bot {} {}{}: won {} ({:.1%}, 95% CI {:.1%} - {:.1%}), {} going first, {:.1f} ms per move".format(
+			bot_index + 1, name, settings or '', wins, wins / max(games, 1), low, high, first_wins,
+			1000 * think_time / max(moves, 1)))
+	return lines
+
+
+def main():
+	"""Play the games, writing each one's results as it finishes, and print the win rates."""
+	args = create_parser().parse_args()
+	jobs = [
+		(game, args.seed + game, args.bots, args.decks, args.starting_hit_points, args.cache_size)
+		for game in range(args.games)
+	]
+	results = []
+	results_file = open(args.results, 'w') if args.results else None
+	pool = multiprocessing.Pool(args.processes)
+	try:
+		for result in pool.imap_unordered(play_game, jobs):
+			results.append(result)
+			if results_file:
+				results_file.write(json.dumps(result) + "\n")
+				results_file.flush()
+	except KeyboardInterrupt:
+		print("Stopped after {} games".format(len(results)))
+	finally:
+		pool.terminate()
+		pool.join()
+		if results_file:
+			results_file.close()
+	print("\n".join(report(args.bots, results)))
+
+
+if __name__ == "__main__":
+	main()